@@ -1,47 +1,238 @@
 #!/usr/bin/env python3
-import argparse, uuid
+"""
+Rename files to UPPERCASE name + lowercase extension (BULBASAUR.png).
+
+Every folder is listed once and the whole plan is worked out in memory
+before anything is renamed: files whose new names would clash with each
+other or with another entry (compared case-insensitively, as on Windows and
+macOS) are skipped and reported. The plan is then carried out on a thread
+pool, each file in two steps through a .tmpcase name so case-only changes
+also apply on case-insensitive file systems.
+
+Before the first rename the plan is written to a journal in the folder
+(.rename_case.journal.json); it is removed once every rename is done. If a
+run is interrupted, the next one finds the journal and either finishes it
+(--resume) or puts every file back under its old name (--rollback); the
+state of each file is read from the folder listings, so no .tmpcase file is
+left behind either way.
+
+Usage:
+  python rename_case.py [path] [-r] [-n] [-j N] [--resume | --rollback]
+"""
+import argparse, json, os, sys, uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+JOURNAL = ".rename_case.journal.json"
+TMP_SUFFIX = ".tmpcase"
+BATCH = 64  # renames per thread pool task: one future per file costs more than a local rename
+
+# one planned rename: folder, old name, temp name, new name
+Step = Tuple[str, str, str, str]
+
+# ---------- planning ----------
+
+def listings(root: Path, recurse: bool) -> Dict[str, Tuple[List[str], List[str]]]:
+    """folder -> (file names, other entry names), listing each folder exactly once."""
+    out, todo = {}, [str(root)]
+    while todo:
+        d = todo.pop()
+        files, others = [], []
+        with os.scandir(d) as it:
+            for e in it:
+                if e.is_file():
+                    files.append(e.name)
+                else:
+                    others.append(e.name)
+                    if recurse and e.is_dir(follow_symlinks=False):
+                        todo.append(e.path)
+        out[d] = (sorted(files), others)
+    return out
+
+def split_name(name: str) -> Tuple[str, str]:
+    """(stem, suffix) as PurePath splits them: ".hidden" and "name." have no suffix."""
+    i = name.rfind(".")
+    return (name[:i], name[i:]) if 0 < i < len(name) - 1 else (name, "")
+
+def target_name(name: str) -> str:
+    stem, ext = split_name(name)
+    return f"{stem.upper()}{ext.lower()}"
+
+def plan(found: Dict[str, Tuple[List[str], List[str]]]) -> Tuple[List[Step], List[Tuple[str, List[str]]]]:
+    """
+    The renames to do, and the clashes left alone: (folder, names) for every
+    group of entries that would end up with the same name, ignoring case.
+    """
+    steps: List[Step] = []
+    clashes: List[Tuple[str, List[str]]] = []
+    for d, (files, others) in found.items():
+        groups: Dict[str, List[str]] = {}
+        renamed: Dict[str, str] = {}  # file -> new name, for files whose name changes
+        for name in others:
+            groups.setdefault(name.casefold(), []).append(name)
+        for name in files:
+            if name.startswith(JOURNAL):
+                continue
+            if name.endswith(TMP_SUFFIX):
+                print(f"SKIP (temp file of an older run): {os.path.join(d, name)}")
+                continue
+            new = target_name(name)
+            if new != name:
+                renamed[name] = new
+            groups.setdefault(new.casefold(), []).append(name)
+        for names in groups.values():
+            if not any(n in renamed for n in names):
+                continue
+            if len(names) > 1:
+                clashes.append((d, sorted(names)))
+            else:
+                name = names[0]
+                steps.append((d, name, f"{split_name(name)[0]}.{uuid.uuid4().hex}{TMP_SUFFIX}", renamed[name]))
+    return steps, clashes
+
+# ---------- journal ----------
 
-def iter_files(root: Path, recurse: bool):
-    if recurse:
-        yield from (p for p in root.rglob("*") if p.is_file())
-    else:
-        yield from (p for p in root.iterdir() if p.is_file())
+def write_journal(path: Path, steps: List[Step]) -> None:
+    """The plan, with folders relative to the journal's, replaced atomically."""
+    rel = [(os.path.relpath(d, path.parent), *rest) for d, *rest in steps]
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": 1, "steps": rel}), encoding="utf-8")
+    os.replace(tmp, path)
+
+def read_journal(path: Path) -> Optional[List[Step]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    return [(os.path.normpath(path.parent / d), *rest) for d, *rest in data["steps"]]
+
+def recovery(steps: List[Step], rollback: bool) -> List[Tuple[str, List[str]]]:
+    """
+    What is left of a journalled run, from one listing per folder: (folder, names
+    to pass through in order) per file still to move, forwards or back.
+    """
+    names: Dict[str, Set[str]] = {}
+    for d in {s[0] for s in steps}:
+        try:
+            names[d] = set(os.listdir(d))
+        except FileNotFoundError:
+            names[d] = set()
+    out = []
+    for d, old, tmp, new in steps:
+        here = names[d]
+        if tmp in here:                       # stopped between the two renames
+            out.append((d, [tmp, old if rollback else new]))
+        elif rollback and new in here and old not in here:
+            out.append((d, [new, tmp, old]))
+        elif not rollback and old in here and new not in here:
+            out.append((d, [old, tmp, new]))
+    return out
+
+# ---------- renaming ----------
+
+@lru_cache(maxsize=None)
+def _rel(d: str, root: Path) -> str:
+    return os.path.relpath(d, root)
+
+def shown(d: str, root: Path, name: str) -> str:
+    """name, prefixed with its folder relative to root unless that is root itself."""
+    rel = _rel(d, root)
+    return name if rel == "." else f"{rel}/{name}"
+
+def move(d: str, chain: List[str]) -> None:
+    """Rename d/chain[0] -> d/chain[1] -> ... in turn."""
+    for a, b in zip(chain, chain[1:]):
+        os.rename(os.path.join(d, a), os.path.join(d, b))
+
+def move_batch(batch: List[Tuple[str, List[str]]]) -> List[Optional[OSError]]:
+    """move() each entry; the error per entry, or None."""
+    errors: List[Optional[OSError]] = []
+    for d, chain in batch:
+        try:
+            move(d, chain)
+            errors.append(None)
+        except OSError as e:
+            errors.append(e)
+    return errors
+
+def run(moves: List[Tuple[str, List[str]]], root: Path, workers: Optional[int]) -> int:
+    """Do the renames on a thread pool, BATCH files per task, printing each; returns how many failed."""
+    failed = 0
+    batches = [moves[i:i + BATCH] for i in range(0, len(moves), BATCH)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(move_batch, b): b for b in batches}
+        try:
+            for f in as_completed(futures):
+                for (d, chain), error in zip(futures[f], f.result()):
+                    label = f"{shown(d, root, chain[0])} -> {chain[-1]}"
+                    if error is None:
+                        print(f"Renamed: {label}")
+                    else:
+                        failed += 1
+                        print(f"FAILED: {label} ({error})", file=sys.stderr)
+        except KeyboardInterrupt:  # stop queued renames; the journal lets the next run finish or undo
+            pool.shutdown(cancel_futures=True)
+            raise
+    return failed
 
 def main():
     ap = argparse.ArgumentParser(description="Rename files to UPPERCASE name + lowercase extension.")
     ap.add_argument("path", nargs="?", default=".", help="Folder to process (default: current)")
     ap.add_argument("-r", "--recurse", action="store_true", help="Recurse into subfolders")
     ap.add_argument("-n", "--dry-run", action="store_true", help="Show what would change")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="Threads doing the renames (default: Python's ThreadPoolExecutor default)")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--resume", action="store_true", help="Finish the run an interrupted one left in the journal")
+    mode.add_argument("--rollback", action="store_true", help="Undo the run an interrupted one left in the journal")
     args = ap.parse_args()
 
     root = Path(args.path)
     if not root.exists():
         raise SystemExit(f"Path not found: {root}")
+    journal = root / JOURNAL
+    pending = read_journal(journal)
 
-    changed = 0
-    for p in iter_files(root, args.recurse):
-        stem = p.stem                      # part before last dot
-        ext  = p.suffix                    # ".PNG", ".jpg", or "" if none
-        target = p.with_name(f"{stem.upper()}{ext.lower()}")
+    if pending is not None or args.resume or args.rollback:
+        if pending is None:
+            raise SystemExit(f"No journal to {'roll back' if args.rollback else 'resume'} in {root}")
+        if not (args.resume or args.rollback):
+            raise SystemExit(f"An interrupted run left {journal}; rerun with --resume or --rollback")
+        moves = recovery(pending, args.rollback)
+        verb = "rolled back" if args.rollback else "resumed"
+        if args.dry_run:
+            for d, chain in moves:
+                print(f"Would rename: {shown(d, root, chain[0])} -> {chain[-1]}")
+            print(f"Done. {len(moves)} file(s) would be {verb}.")
+            return
+        failed = run(moves, root, args.workers)
+        if failed:
+            raise SystemExit(f"{failed} rename(s) failed; the journal is kept, fix them and rerun")
+        journal.unlink()
+        print(f"Done. {len(moves)} file(s) {verb}.")
+        return
 
-        if target.name == p.name:
-            continue
-        if target.exists():
-            print(f"SKIP (exists): {p.name} -> {target.name}")
-            continue
+    steps, clashes = plan(listings(root, args.recurse))
+    for d, names in clashes:
+        print(f"SKIP (same name ignoring case): {', '.join(shown(d, root, n) for n in names)}")
 
-        if args.dry_run:
-            print(f"Would rename: {p.name} -> {target.name}")
-        else:
-            # Two-step rename so Windows applies case-only changes
-            tmp = p.with_name(f"{stem}.{uuid.uuid4().hex}.tmpcase")
-            p.rename(tmp)
-            tmp.rename(target)
-            print(f"Renamed: {p.name} -> {target.name}")
-        changed += 1
-
-    print(f"Done. {changed} file(s) {'would be ' if args.dry_run else ''}renamed.")
+    if args.dry_run:
+        for d, old, _tmp, new in steps:
+            print(f"Would rename: {shown(d, root, old)} -> {new}")
+        print(f"Done. {len(steps)} file(s) would be renamed.")
+        return
+    if not steps:
+        print("Done. 0 file(s) renamed.")
+        return
+
+    write_journal(journal, steps)
+    failed = run([(d, [old, tmp, new]) for d, old, tmp, new in steps], root, args.workers)
+    if failed:
+        raise SystemExit(f"{failed} rename(s) failed; the journal is kept: rerun with --resume or --rollback")
+    journal.unlink()
+    print(f"Done. {len(steps)} file(s) renamed.")
 
 if __name__ == "__main__":
     main()
@@ -1,67 +1,61 @@
 #!/usr/bin/env python3
-import json
-import re
+import argparse
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Union
 
-BLOCK_HEADER_RE = re.compile(r'^\s*\[(?P<id>[A-Za-z0-9_]+)\]\s*$')
-KV_RE = re.compile(r'^\s*(?P<k>[A-Za-z][A-Za-z0-9 _-]*)\s*=\s*(?P<v>.*)\s*$')
+import timings
+from outputs import FORMATS, PROFILES, write_entries
+from pbs import read_sections
 
-def parse_abilities_text(text: str) -> List[Dict[str, str]]:
-    """Parse abilities.txt blocks into a list of {internal_id, name, description} dicts."""
-    abilities = []
-    current = None
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 1
 
-    for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
-            continue
+def parse_abilities_text(text: Union[str, Path]) -> List[Dict[str, str]]:
+    """Parse abilities.txt blocks (text, or a Path to stream) into a list of {internal_id, name, description} dicts."""
+    abilities = []
 
-        m = BLOCK_HEADER_RE.match(line)
-        if m:
-            if current and current.get("internal_id"):
-                current.setdefault("name", "")
-                current.setdefault("description", "")
-                abilities.append(current)
-            current = {"internal_id": m.group("id")}
+    for header, _idx, raw, _line in read_sections(text, errors="replace"):
+        if not header:
             continue
-
-        if current is not None:
-            mkv = KV_RE.match(line)
-            if mkv:
-                key = mkv.group("k").strip().lower().replace(" ", "_").replace("-", "_")
-                val = mkv.group("v").strip()
-                if key == "name":
-                    current["name"] = val
-                elif key == "description":
-                    current["description"] = val
-                else:
-                    current[key] = val  # keep any extra fields just in case
-
-    if current and current.get("internal_id"):
+        current = {"internal_id": header}
+        for k, val in raw.items():
+            key = k.lower().replace(" ", "_").replace("-", "_")
+            current[key] = val  # name, description + any extra fields just in case
         current.setdefault("name", "")
         current.setdefault("description", "")
         abilities.append(current)
 
     return abilities
 
-def main(argv: list) -> int:
-    if len(argv) < 3:
-        print("Usage: python abilities_to_json.py <abilities.txt> <abilities.json>", file=sys.stderr)
-        return 2
-
-    src = Path(argv[1])
-    dst = Path(argv[2])
+def convert(src: Path, dest: Path, profile: str = "debug", fmt: str = "json") -> int:
+    """Convert abilities.txt to abilities.json (keyed by internal id). Returns the ability count."""
+    with timings.phase("normalize"):
+        abilities = parse_abilities_text(Path(src))
 
-    text = src.read_text(encoding="utf-8", errors="replace")
-    abilities = parse_abilities_text(text)
+        # turn list into a dict keyed by internal_id
+        by_id = {a["internal_id"]: {"name": a.get("name",""), "description": a.get("description","")} for a in abilities}
+    timings.count("abilities", len(by_id))
 
-    # turn list into a dict keyed by internal_id
-    by_id = {a["internal_id"]: {"name": a.get("name",""), "description": a.get("description","")} for a in abilities}
+    write_entries(dest, by_id.items(), keyed=True, profile=profile, fmt=fmt)
+    return len(by_id)
 
-    dst.write_text(json.dumps(by_id, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Wrote {len(by_id)} abilities → {dst}")
+def main(argv: list) -> int:
+    ap = argparse.ArgumentParser(description="Convert PBS abilities.txt -> abilities.json (keyed by internal id).")
+    ap.add_argument("src", help="Path to abilities.txt")
+    ap.add_argument("dst", help="Path to abilities.json")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified")
+    ap.add_argument("--format", choices=FORMATS, default="json",
+                    help="json (default); ndjson: one entry per line, as [key, value]")
+    timings.add_arguments(ap)
+    args = ap.parse_args(argv[1:])
+
+    src = Path(args.src)
+    dst = Path(args.dst)
+
+    n = timings.run(args, convert, src, dst, profile=args.profile, fmt=args.format)
+    print(f"Wrote {n} abilities → {dst}")
     return 0
 
 if __name__ == "__main__":
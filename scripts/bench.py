@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the converters' parse entry points on the bundled games and on
+replicated (10x, 100x, ...) copies of their PBS files.
+
+Every benchmark is timed best-of --repeat on its own, then run once more under
+tracemalloc for the peak Python heap, and reported as wall time, input
+lines/sec and peak bytes. Replicas rename every section (and InternalName) per
+copy, "[BULBASAUR]" -> "[BULBASAUR_R1]", "[022]" -> "[1022]", so they parse
+to N times the entries instead of overwriting the first copy.
+
+Usage:
+  python scripts/bench.py [--games ss2,decay] [--scales 1,10,100] [--only merge_forms]
+                          [--out bench_results.json] [--baseline bench_baseline.json]
+                          [--threshold 0.25] [--update-baseline]
+
+With --baseline, exits 1 when any benchmark is more than --threshold slower
+(or its peak memory that much bigger) than the stored result; --update-baseline
+writes this run as the new baseline instead.
+"""
+import argparse, json, platform, re, sys, tempfile, time, tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import abilities_to_json, encounters_to_json, items_to_json
+import moves_to_json, pokemon_to_json, types_to_json
+from outputs import write_json
+
+STAT_ORDER = pokemon_to_json.parse_stat_order("hp,atk,def,spe,spa,spd")
+
+# ---------- replicated inputs ----------
+
+REPLICA_HEADER_RE = re.compile(r"^(\s*)\[([^\],]*)((?:,[^\]]*)?)\](.*)$", re.S)
+INTERNAL_NAME_RE = re.compile(r"^(\s*InternalName\s*=\s*)(\S+)(.*)$", re.S)
+
+def replica_line(line: str, k: int) -> str:
+    """The line as it appears in copy k (0 = untouched)."""
+    if k == 0:
+        return line
+    m = REPLICA_HEADER_RE.match(line)
+    if m:
+        name = m.group(2).strip()
+        if name.isdigit():
+            name = str(int(name) + k * 10 ** len(name))
+        elif name:
+            name = f"{name}_R{k}"
+        return f"{m.group(1)}[{name}{m.group(3)}]{m.group(4)}"
+    m = INTERNAL_NAME_RE.match(line)
+    if m:
+        return f"{m.group(1)}{m.group(2)}_R{k}{m.group(3)}"
+    return line
+
+def replicate(src: Path, dest: Path, times: int) -> None:
+    """Write src's text `times` times into dest, with renamed sections per copy."""
+    text = src.read_text(encoding="utf-8-sig", errors="replace")
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    with dest.open("w", encoding="utf-8", newline="") as f:
+        for k in range(times):
+            f.writelines(replica_line(line, k) for line in lines)
+
+def game_inputs(game_dir: Path) -> List[Path]:
+    return sorted(p for p in game_dir.glob("*.txt"))
+
+def scaled_game(game_dir: Path, times: int, tmp: Path) -> Path:
+    """game_dir itself for times == 1, else a replicated copy of its PBS files under tmp."""
+    if times == 1:
+        return game_dir
+    out = tmp / f"{game_dir.name}x{times}"
+    out.mkdir(parents=True, exist_ok=True)
+    for p in game_inputs(game_dir):
+        replicate(p, out / p.name, times)
+    return out
+
+def count_lines(paths: List[Path]) -> int:
+    n = 0
+    for p in paths:
+        with p.open("rb") as f:
+            n += sum(1 for _ in f)
+    return n
+
+# ---------- benchmarks ----------
+
+# name -> (input files, setup(game_dir) -> args, timed function)
+Bench = Tuple[Callable[[Path], List[Path]], Callable[[Path], tuple], Callable[..., Any]]
+
+def _files(*names: str) -> Callable[[Path], List[Path]]:
+    return lambda d: [d / n for n in names if (d / n).exists()]
+
+def _merge_setup(d: Path) -> tuple:
+    base = pokemon_to_json.parse_pokemon_pbs(d / "pokemon.txt", STAT_ORDER)
+    forms_path = d / "pokemon_forms.txt"
+    forms = pokemon_to_json.parse_forms_pbs(forms_path, STAT_ORDER) if forms_path.exists() else []
+    return base, forms, True
+
+def _move_files(d: Path) -> List[Path]:
+    try: return moves_to_json.find_move_files(d)
+    except FileNotFoundError: return []
+
+BENCHES: Dict[str, Bench] = {
+    "parse_pokemon_pbs": (_files("pokemon.txt"), lambda d: (d / "pokemon.txt", STAT_ORDER),
+                          pokemon_to_json.parse_pokemon_pbs),
+    "parse_forms_pbs": (_files("pokemon_forms.txt"), lambda d: (d / "pokemon_forms.txt", STAT_ORDER),
+                        pokemon_to_json.parse_forms_pbs),
+    "merge_forms": (_files("pokemon.txt", "pokemon_forms.txt"), _merge_setup, pokemon_to_json.merge_forms),
+    "parse_move_files": (_move_files, lambda d: (_move_files(d),), moves_to_json.parse_move_files),
+    "parse_items_pbs": (_files("items.txt"), lambda d: (d / "items.txt",), items_to_json.parse_items_pbs),
+    "parse_file": (_files("encounters.txt"), lambda d: (d / "encounters.txt",), encounters_to_json.parse_file),
+    "parse_types_txt": (_files("types.txt"), lambda d: (d / "types.txt",), types_to_json.parse_types_txt),
+    "parse_abilities_text": (_files("abilities.txt"), lambda d: (d / "abilities.txt",),
+                             abilities_to_json.parse_abilities_text),
+}
+
+def run_bench(name: str, game_dir: Path, repeat: int) -> Optional[Dict[str, Any]]:
+    """Best-of-repeat wall time plus tracemalloc peak for one benchmark; None if its inputs are missing."""
+    files_of, setup, fn = BENCHES[name]
+    files = files_of(game_dir)
+    if not files:
+        return None
+    args = setup(game_dir)
+
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _cur, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    lines = count_lines(files)
+    return {"lines": lines, "seconds": best, "linesPerSec": lines / best if best else 0.0, "peakBytes": peak}
+
+# ---------- baseline ----------
+
+def result_key(r: Dict[str, Any]) -> str:
+    return f"{r['game']}/x{r['scale']}/{r['bench']}"
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float,
+            min_seconds: float) -> List[str]:
+    """Human-readable regressions of results against a stored run (same game/scale/bench only)."""
+    old = {result_key(r): r for r in baseline.get("results", [])}
+    out = []
+    for r in results:
+        b = old.get(result_key(r))
+        if not b:
+            continue
+        # sub-millisecond runs are mostly noise: compare against a floor
+        if max(r["seconds"], min_seconds) > max(b["seconds"], min_seconds) * (1 + threshold):
+            out.append(f"{result_key(r)}: {b['seconds'] * 1000:.1f} ms -> {r['seconds'] * 1000:.1f} ms")
+        if r["peakBytes"] > b["peakBytes"] * (1 + threshold):
+            out.append(f"{result_key(r)}: peak {b['peakBytes']:,} B -> {r['peakBytes']:,} B")
+    return out
+
+# ---------- main ----------
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the PBS parsers on real and replicated inputs.")
+    ap.add_argument("--data-dir", default="public/data", help="Folder with one sub-folder per game")
+    ap.add_argument("--games", default="vanguard,decay,ss2", help="Comma-separated game folders")
+    ap.add_argument("--scales", default="1,10,100", help="Comma-separated replication factors (default: 1,10,100)")
+    ap.add_argument("--only", default=None, help=f"Comma-separated benchmarks (default: all of {','.join(BENCHES)})")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark, best one kept (default: 3)")
+    ap.add_argument("--out", default="bench_results.json", help="Results file (default: bench_results.json)")
+    ap.add_argument("--baseline", default=None, help="Stored results to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="Allowed slowdown / memory growth vs the baseline (default: 0.25 = 25%%)")
+    ap.add_argument("--min-seconds", type=float, default=0.005,
+                    help="Times below this count as this much when comparing (default: 0.005)")
+    ap.add_argument("--update-baseline", action="store_true", help="Write this run to --baseline instead of comparing")
+    args = ap.parse_args()
+
+    data_dir = Path(args.data_dir)
+    games = [g.strip() for g in args.games.split(",") if g.strip()]
+    missing = [g for g in games if not (data_dir / g).is_dir()]
+    if missing:
+        print(f"ERROR: no data folder for: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(2)
+    names = list(BENCHES)
+    if args.only:
+        names = [n.strip() for n in args.only.split(",") if n.strip()]
+        unknown = [n for n in names if n not in BENCHES]
+        if unknown:
+            print(f"ERROR: unknown benchmark(s): {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+    try:
+        scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    except ValueError:
+        scales = []
+    if not scales or min(scales) < 1:
+        print(f"ERROR: bad --scales: {args.scales}", file=sys.stderr)
+        sys.exit(2)
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'game':<10}{'scale':>6}  {'benchmark':<22}{'lines':>11}{'time':>11}{'lines/s':>13}{'peak MB':>10}")
+    with tempfile.TemporaryDirectory(prefix="pbsdex-bench-") as tmp:
+        for g in games:
+            for scale in scales:
+                game_dir = scaled_game(data_dir / g, scale, Path(tmp))
+                for name in names:
+                    r = run_bench(name, game_dir, args.repeat)
+                    if r is None:
+                        continue
+                    r = {"game": g, "scale": scale, "bench": name, **r}
+                    results.append(r)
+                    print(f"{g:<10}{'x' + str(scale):>6}  {name:<22}{r['lines']:>11,}{r['seconds'] * 1000:>9.1f}ms"
+                          f"{r['linesPerSec']:>13,.0f}{r['peakBytes'] / 2**20:>10.1f}")
+
+    run = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    write_json(Path(args.out), run, trailing_newline=True)
+    print(f"Wrote {len(results)} result(s) to {args.out}")
+
+    if args.baseline:
+        base_path = Path(args.baseline)
+        if args.update_baseline:
+            write_json(base_path, run, trailing_newline=True)
+            print(f"Updated baseline {base_path}")
+            return
+        try:
+            baseline = json.loads(base_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            print(f"ERROR: baseline not found: {base_path} (create it with --update-baseline)", file=sys.stderr)
+            sys.exit(2)
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} vs {base_path}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} vs {base_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build every game's JSON data from its PBS files in a single process.
+
+Reads the game list from public/data/games.json and runs each
+(game, converter) pair as one job on a process pool; the icon atlas, which
+every game shares, is one more job writing to public/images. Converters are
+imported as libraries, so a full rebuild costs one interpreter per worker
+instead of one per file, and every output is written atomically.
+
+A content-hashed manifest (.pbsdex-cache) remembers the inputs, options and
+converter version behind every output; jobs whose inputs are unchanged are
+skipped. Use --force to rebuild everything or --no-cache to ignore it.
+
+Afterwards every data file of the built games gets a content-hashed copy
+listed in the game's manifest.json (see manifest.py), then .gz (and, with
+the brotli module installed, .br) siblings for the static host; see
+compress.py.
+
+Usage:
+  python scripts/build_data.py [--data-dir public/data] [--games ss2,decay]
+                               [--only pokemon,moves] [-j N] [--force]
+"""
+import argparse, hashlib, json, os, sys, time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import abilities_to_json, compress, encounters_to_json, icons_to_atlas, items_to_json, manifest
+import moves_to_json, pokemon_to_json, search_to_json, sprites_to_json, types_to_json
+from outputs import PROFILES, write_json
+
+CONVERTERS = {
+    "pokemon": pokemon_to_json,
+    "abilities": abilities_to_json,
+    "types": types_to_json,
+    "moves": moves_to_json,
+    "items": items_to_json,
+    "encounters": encounters_to_json,
+    "search": search_to_json,
+    "sprites": sprites_to_json,
+    "atlas": icons_to_atlas,
+}
+
+# Converters that read another converter's output for the same game
+AFTER = {
+    "types": ("pokemon",),
+    "search": ("pokemon", "moves", "abilities", "types", "encounters"),
+    "sprites": ("pokemon",),
+}
+
+# Converters built once for all games, from public/images, not per game
+SHARED = ("atlas",)
+SHARED_GAME = "(shared)"  # the "game" of their jobs
+
+# ---------- planning ----------
+
+def load_games(data_dir: Path) -> List[str]:
+    """Game ids from games.json, in listed order."""
+    games = json.loads((data_dir / "games.json").read_text(encoding="utf-8"))
+    return [g["id"] for g in games if g.get("id")]
+
+def job_inputs(name: str, game_dir: Path) -> List[Path]:
+    """Every PBS file a converter reads for one game (what the cache hashes)."""
+    d = game_dir
+    if name == "pokemon":
+        return [p for p in (d / "pokemon.txt", d / "pokemon_forms.txt", d / "types.txt") if p.exists()]
+    if name == "moves":
+        try: return moves_to_json.find_move_files(d)
+        except FileNotFoundError: return []
+    if name == "types":
+        # the matrix's combo rows come from this game's generated pokemon.json
+        # (listed even before it exists: it is hashed once the pokemon job has run)
+        return [d / "types.txt", d / "pokemon.json"]
+    if name == "search":
+        # built from the other converters' JSON, not from PBS files
+        return [d / f"{n}.json" for n in AFTER["search"]]
+    if name == "sprites":
+        # a folder is hashed as its listing (see file_hash), not its 100 MB of images
+        images = images_dir(d)
+        return [d / "pokemon.json"] + ([images / v for v in sprites_to_json.variant_dirs(images)]
+                                       if images.is_dir() else [])
+    return [d / f"{name}.txt"]
+
+def images_dir(game_dir: Path) -> Path:
+    """public/data/<game> -> public/images/<game>"""
+    return game_dir.parent.parent / "images" / game_dir.name
+
+def icons_dir(data_dir: Path) -> Path:
+    """public/data -> public/images (the types/ and categories/ icons every game shares)"""
+    return data_dir.parent / "images"
+
+def plan_jobs(game_dir: Path, names: List[str], opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One job dict per converter: which module to call, with which kwargs, reading/writing what."""
+    d = game_dir
+    common = {"profile": opts["profile"]}
+    options = {n: dict(common) for n in names}
+    if "pokemon" in options:
+        options["pokemon"].update(stat_order=opts["stat_order"], include_cosmetics=opts["include_cosmetics"],
+                                  forms_mode=opts["forms_mode"], shard_size=opts["shard_size"],
+                                  refs=opts["refs"])
+    paths = {
+        "pokemon":    {"src": d / "pokemon.txt", "dest": d / "pokemon.json", "forms": d / "pokemon_forms.txt",
+                       "types": d / "types.txt"},
+        "abilities":  {"src": d / "abilities.txt",  "dest": d / "abilities.json"},
+        "types":      {"src": d / "types.txt",      "dest": d / "types.json", "pokemon": d / "pokemon.json"},
+        "moves":      {"src": d,                    "dest": d / "moves.json"},
+        "items":      {"src": d / "items.txt",      "dest": d / "items.json"},
+        "encounters": {"src": d / "encounters.txt", "dest": d / "encounters.json"},
+        "search":     {"src": d,                    "dest": d / "search.json"},
+        "sprites":    {"src": images_dir(d),        "dest": d / "sprites.json", "pokemon": d / "pokemon.json"},
+    }
+    jobs = []
+    for n in names:
+        if n in SHARED:
+            continue  # see plan_shared_jobs
+        if n == "sprites" and not images_dir(d).is_dir():
+            continue  # no images for this game (or not the usual layout): keep probing on the client
+        dest = paths[n]["dest"]
+        outputs = [dest]
+        if n == "pokemon":
+            outputs.append(pokemon_to_json.reverse_path(dest))
+            outputs.append(pokemon_to_json.evolutions_path(dest))
+            outputs.extend(pokemon_to_json.stats_paths(dest))
+        if n == "pokemon" and opts["refs"] == "interned":
+            outputs.append(pokemon_to_json.strings_path(dest))
+        if n == "pokemon" and opts["shard_size"] > 0:
+            outputs.extend(pokemon_to_json.shard_paths(dest)[:2])
+        if n == "types":
+            outputs.append(types_to_json.matrix_path(dest))
+        jobs.append({
+            "game": d.name, "converter": n,
+            "kwargs": {**paths[n], **options[n]},
+            "options": options[n],
+            "inputs": job_inputs(n, d),
+            "outputs": outputs,
+            "after": AFTER.get(n, ()),
+        })
+    return jobs
+
+def plan_shared_jobs(data_dir: Path, names: List[str], opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The SHARED jobs, as plan_jobs would plan them: the icon atlas, once, into public/images."""
+    icons = icons_dir(data_dir)
+    if "atlas" not in names or not any((icons / f).is_dir() for f in icons_to_atlas.FAMILIES):
+        return []  # no icon folders: the client requests each icon as before
+    options = {"profile": opts["profile"]}
+    dest = icons / "icons.atlas.json"
+    return [{
+        "game": SHARED_GAME, "converter": "atlas",
+        "kwargs": {"src": icons, "dest": dest, **options},
+        "options": options,
+        # the icons are few and small: hash the files themselves
+        "inputs": [icons / f / n for f in icons_to_atlas.FAMILIES for n in icons_to_atlas.icon_files(icons / f)],
+        "outputs": [dest] + [icons_to_atlas.atlas_path(dest, f) for f in icons_to_atlas.FAMILIES],
+        "after": (),
+    }]
+
+# ---------- cache ----------
+
+def file_hash(path: Path) -> Optional[str]:
+    """sha256 of a file's contents; a folder hashes its listing (names, sizes, mtimes)."""
+    try:
+        if Path(path).is_dir():
+            h = hashlib.sha256()
+            for e in sorted(os.scandir(path), key=lambda e: e.name):
+                st = e.stat()
+                h.update(f"{e.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+            return h.hexdigest()
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def job_key(job: Dict[str, Any]) -> str:
+    return f"{job['game']}/{job['converter']}"
+
+def job_fingerprint(job: Dict[str, Any]) -> Dict[str, Any]:
+    """What an output depends on: converter version, options and input contents."""
+    return {
+        "version": CONVERTERS[job["converter"]].CONVERTER_VERSION,
+        "options": job["options"],
+        "inputs": {p.as_posix(): file_hash(p) for p in job["inputs"]},
+    }
+
+def load_cache(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data.get("jobs", {}) if isinstance(data, dict) else {}
+
+def is_fresh(entry: Optional[Dict[str, Any]], fingerprint: Dict[str, Any]) -> bool:
+    """A cached entry is reusable if its fingerprint matches and its outputs are untouched."""
+    if not entry:
+        return False
+    if any(entry.get(k) != v for k, v in fingerprint.items()):
+        return False
+    outputs = entry.get("outputs") or {}
+    return bool(outputs) and all(file_hash(Path(p)) == h for p, h in outputs.items())
+
+# ---------- execution ----------
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one converter in the current process; returns the job annotated with count + timing."""
+    t0 = time.perf_counter()
+    count = CONVERTERS[job["converter"]].convert(**job["kwargs"])
+    return {**job, "count": count, "seconds": time.perf_counter() - t0}
+
+def run_jobs(jobs: List[Dict[str, Any]], workers: int,
+             lookup: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None
+             ) -> List[Dict[str, Any]]:
+    """
+    Run jobs (in a pool when workers > 1); failures are captured, never raised.
+
+    A job starts only once the same-game converters named in job["after"] have
+    finished (those that are part of this run). lookup(job) is called at that
+    point and may return a finished result (e.g. from the build cache) instead.
+    """
+    planned = {job_key(j) for j in jobs}
+    done: Dict[str, Dict[str, Any]] = {}
+    waiting = list(jobs)
+    running: Dict[Any, Dict[str, Any]] = {}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def run_inline(job):
+        try: return run_job(job)
+        except Exception as e: return {**job, "error": f"{type(e).__name__}: {e}"}
+
+    try:
+        while waiting or running:
+            started = False
+            for job in list(waiting):
+                deps = [k for k in (f"{job['game']}/{a}" for a in job.get("after", ())) if k in planned]
+                if any(k not in done for k in deps):
+                    continue
+                waiting.remove(job)
+                started = True
+                failed = [k for k in deps if "error" in done[k]]
+                if failed:
+                    result = {**job, "error": f"skipped, {', '.join(failed)} failed"}
+                else:
+                    result = lookup(job) if lookup else None
+                if result is None and pool:
+                    running[pool.submit(run_job, job)] = job
+                    continue
+                done[job_key(job)] = result or run_inline(job)
+
+            if running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    job = running.pop(fut)
+                    try: done[job_key(job)] = fut.result()
+                    except Exception as e: done[job_key(job)] = {**job, "error": f"{type(e).__name__}: {e}"}
+            elif waiting and not started:
+                # nothing running and nothing could start: a dependency cycle
+                for job in waiting:
+                    done[job_key(job)] = {**job, "error": "dependency cycle"}
+                waiting = []
+    finally:
+        if pool: pool.shutdown()
+
+    # report in plan order, not completion order
+    return [done[job_key(j)] for j in jobs]
+
+def print_summary(results: List[Dict[str, Any]], elapsed: float, workers: int) -> None:
+    print(f"{'game':<12}{'converter':<12}{'entries':>8}{'time':>9}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['game']:<12}{r['converter']:<12}  FAILED  {r['error']}")
+        elif r.get("cached"):
+            print(f"{r['game']:<12}{r['converter']:<12}{r['count']:>8}   cached")
+        else:
+            print(f"{r['game']:<12}{r['converter']:<12}{r['count']:>8}{r['seconds']:>8.2f}s")
+    failed = sum(1 for r in results if "error" in r)
+    cached = sum(1 for r in results if r.get("cached"))
+    games = len({r["game"] for r in results} - {SHARED_GAME})
+    print(f"Built {len(results) - failed - cached}/{len(results)} file(s) for {games} game(s) "
+          f"in {elapsed:.2f}s ({workers} worker(s)), {cached} unchanged")
+
+# ---------- main ----------
+
+def add_options(ap: argparse.ArgumentParser) -> None:
+    """The converter options shared with watch_data.py."""
+    ap.add_argument("--stat-order", default="hp,atk,def,spe,spa,spd",
+                    help="Order of BaseStats in pokemon.txt (default: hp,atk,def,spe,spa,spd)")
+    ap.add_argument("--include-cosmetics", action="store_true",
+                    help="Include cosmetic forms like Unown and Cosplay Pikachu (default: excluded).")
+    ap.add_argument("--forms-mode", choices=("full", "delta"), default="full",
+                    help="full: forms are complete copies (default); delta: forms hold only their overrides")
+    ap.add_argument("--shard-size", type=int, default=0,
+                    help="Also write pokemon.index.json + per-species shards, N species per shard (default: off)")
+    ap.add_argument("--refs", choices=pokemon_to_json.REFS, default="names",
+                    help="names: pokemon.json refers to moves/abilities/types/items by name (default); "
+                         "interned: by index into pokemon.strings.json")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty, every field kept, as the committed data (default); "
+                         "web: minified JSON for the deployed site")
+
+def build_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """plan_jobs options from add_options' arguments (raises ValueError on a bad --stat-order)."""
+    pokemon_to_json.parse_stat_order(args.stat_order)
+    return {"stat_order": args.stat_order, "include_cosmetics": args.include_cosmetics,
+            "profile": args.profile, "forms_mode": args.forms_mode, "shard_size": args.shard_size,
+            "refs": args.refs}
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert every game's PBS files to JSON in one parallel build.")
+    ap.add_argument("--data-dir", default="public/data",
+                    help="Folder holding games.json and one sub-folder per game (default: public/data)")
+    ap.add_argument("--games", default=None,
+                    help="Comma-separated game ids to build (default: every game in games.json)")
+    ap.add_argument("--only", default=None,
+                    help=f"Comma-separated converters to run (default: all of {','.join(CONVERTERS)})")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes (default: CPU count; 1 runs everything inline)")
+    add_options(ap)
+    ap.add_argument("--cache", default=".pbsdex-cache",
+                    help="Build cache manifest (default: .pbsdex-cache)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Neither read nor write the build cache")
+    ap.add_argument("--force", action="store_true",
+                    help="Rebuild every job, then refresh the build cache")
+    ap.add_argument("--no-manifest", action="store_true",
+                    help="Skip the content-hashed copies and manifest.json of each game")
+    ap.add_argument("--no-compress", action="store_true",
+                    help="Skip writing .gz/.br siblings of the data files")
+    args = ap.parse_args()
+
+    data_dir = Path(args.data_dir)
+    if not (data_dir / "games.json").exists():
+        print(f"ERROR: games.json not found in {data_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    games = load_games(data_dir)
+    if args.games:
+        wanted = [g.strip() for g in args.games.split(",") if g.strip()]
+        unknown = [g for g in wanted if g not in games]
+        if unknown:
+            print(f"ERROR: unknown game id(s): {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+        games = [g for g in games if g in wanted]
+
+    names = list(CONVERTERS)
+    if args.only:
+        names = [n.strip() for n in args.only.split(",") if n.strip()]
+        unknown = [n for n in names if n not in CONVERTERS]
+        if unknown:
+            print(f"ERROR: unknown converter(s): {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+
+    opts = build_options(args)  # fails fast on a bad --stat-order
+
+    jobs: List[Dict[str, Any]] = []
+    for g in games:
+        game_dir = data_dir / g
+        if not game_dir.is_dir():
+            print(f"WARN: no data folder for game '{g}' ({game_dir}), skipping", file=sys.stderr)
+            continue
+        jobs.extend(plan_jobs(game_dir, names, opts))
+    jobs.extend(plan_shared_jobs(data_dir, names, opts))
+
+    t0 = time.perf_counter()
+    cache_path = Path(args.cache)
+    cache = {} if args.no_cache else load_cache(cache_path)
+
+    def lookup(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # fingerprint only once the job's dependencies have been (re)written
+        if args.no_cache:
+            return None
+        job["fingerprint"] = job_fingerprint(job)
+        entry = cache.get(job_key(job))
+        if not args.force and is_fresh(entry, job["fingerprint"]):
+            return {**job, "count": entry.get("count", 0), "cached": True}
+        return None
+
+    workers = max(1, min(args.jobs, len(jobs)))
+    results = run_jobs(jobs, workers, lookup)
+
+    if not args.no_cache:
+        for r in results:
+            if r.get("cached"):
+                continue
+            if "error" in r:
+                cache.pop(job_key(r), None)
+                continue
+            cache[job_key(r)] = {
+                **r["fingerprint"],
+                "count": r["count"],
+                "outputs": {p.as_posix(): file_hash(p) for p in r["outputs"]},
+            }
+        write_json(cache_path, {"jobs": cache}, trailing_newline=True)
+
+    print_summary(results, time.perf_counter() - t0, workers)
+    folders = [data_dir / g for g in games if any(j["game"] == g for j in jobs)]
+
+    if not args.no_manifest:
+        t1 = time.perf_counter()
+        for f in folders:
+            manifest.publish(f, args.profile)
+        print(f"Wrote {len(folders)} manifest(s) in {time.perf_counter() - t1:.2f}s")
+
+    if not args.no_compress:
+        t1 = time.perf_counter()
+        compress.remove_orphans(folders)
+        files = [p for f in folders for p in compress.artifacts(f)]
+        files += [p for j in jobs if j["game"] == SHARED_GAME for p in j["outputs"]
+                  if p.suffix in (".json", ".bin") and p.exists()]
+        report = compress.compress_all(files, max(1, min(args.jobs, len(files))), force=args.force)
+        print()
+        compress.print_report(report, root=data_dir)
+        print(f"Compressed {sum(1 for r in report if r['written'])}/{len(report)} file(s) "
+              f"in {time.perf_counter() - t1:.2f}s")
+
+    if any("error" in r for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write precompressed siblings for the generated data files, so a static host
+can serve them as-is instead of compressing ~15 MB on every request:
+
+  pokemon.json -> pokemon.json.gz  (gzip level 9, mtime 0: same input, same bytes)
+               -> pokemon.json.br  (brotli quality 11, only if the brotli module is installed)
+
+In a folder with a manifest.json (see manifest.py) only the manifest and
+the content-hashed copies are compressed: the client fetches nothing else
+there, so the logical files would just double the work and the upload.
+
+A sibling is rewritten only when it is missing or older than its source, and
+siblings whose source is gone or no longer compressed (or stale .br files
+when brotli is unavailable) are removed so the host never serves an outdated
+variant. Files are compressed in parallel on a process pool.
+
+Usage:
+  python scripts/compress.py public/data/ss2 [public/data/decay/pokemon.json ...]
+                             [-j N] [--force]
+"""
+import argparse, gzip, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from manifest import HASHED_RE, MANIFEST
+from outputs import write_bytes_atomic
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+ARTIFACT_GLOBS = ("*.json", "*.bin")
+SUFFIXES = (".gz", ".br")
+
+def artifacts(folder: Path) -> List[Path]:
+    """
+    Every data file under folder (shard sub-folders included), sorted; only
+    manifest.json and the hashed copies if the folder has a manifest.
+    """
+    folder = Path(folder)
+    found = {p for g in ARTIFACT_GLOBS for p in folder.rglob(g) if p.is_file()}
+    if (folder / MANIFEST).exists():
+        found = {p for p in found if p == folder / MANIFEST or HASHED_RE.search(p.name)}
+    return sorted(found)
+
+def _fresh(src: Path, sibling: Path) -> bool:
+    try:
+        return sibling.stat().st_mtime_ns >= src.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def compress_file(path: Path, force: bool = False) -> Dict[str, Any]:
+    """Refresh path's .gz (and .br) siblings; returns {"path", "raw", "gz", "br", "written"}."""
+    path = Path(path)
+    gz_path, br_path = (path.with_name(path.name + s) for s in SUFFIXES)
+    data: Optional[bytes] = None
+    written = []
+
+    if force or not _fresh(path, gz_path):
+        data = path.read_bytes()
+        write_bytes_atomic(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(gz_path.suffix)
+    if brotli is not None:
+        if force or not _fresh(path, br_path):
+            data = path.read_bytes() if data is None else data
+            write_bytes_atomic(br_path, brotli.compress(data, quality=11))
+            written.append(br_path.suffix)
+    elif br_path.exists() and not _fresh(path, br_path):
+        br_path.unlink()  # can't refresh it here, and a stale variant must not be served
+
+    return {
+        "path": path,
+        "raw": path.stat().st_size,
+        "gz": gz_path.stat().st_size,
+        "br": br_path.stat().st_size if br_path.exists() else None,
+        "written": written,
+    }
+
+def remove_orphans(folders: Iterable[Path]) -> List[Path]:
+    """
+    Delete .gz/.br files whose source no longer exists (e.g. shards of an
+    earlier split) or is no longer one of the folder's artifacts().
+    """
+    removed = []
+    for folder in folders:
+        keep = set(artifacts(folder))
+        for s in SUFFIXES:
+            for p in Path(folder).rglob(f"*{s}"):
+                if p.with_suffix("") not in keep:
+                    p.unlink()
+                    removed.append(p)
+    return removed
+
+def compress_all(paths: List[Path], workers: int = 1, force: bool = False) -> List[Dict[str, Any]]:
+    """compress_file over paths (biggest first on a pool when workers > 1), results in input order."""
+    if workers <= 1 or len(paths) <= 1:
+        return [compress_file(p, force) for p in paths]
+    order = sorted(range(len(paths)), key=lambda i: -paths[i].stat().st_size)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {i: pool.submit(compress_file, paths[i], force) for i in order}
+        for i, fut in futures.items():
+            results[i] = fut.result()
+    return results  # type: ignore[return-value]
+
+def print_report(results: List[Dict[str, Any]], root: Optional[Path] = None) -> None:
+    def pct(n, raw):
+        return f"{n / raw:>6.1%}" if raw and n is not None else "     -"
+    print(f"{'file':<44}{'raw':>12}{'gzip':>12}{'':>7}{'brotli':>12}{'':>7}")
+    tot = {"raw": 0, "gz": 0, "br": 0}
+    for r in results:
+        p = r["path"]
+        name = p.relative_to(root).as_posix() if root and p.is_relative_to(root) else p.as_posix()
+        br = f"{r['br']:>12,}" if r["br"] is not None else f"{'-':>12}"
+        note = "" if r["written"] else "  unchanged"
+        print(f"{name:<44}{r['raw']:>12,}{r['gz']:>12,}{pct(r['gz'], r['raw']):>7}{br}{pct(r['br'], r['raw']):>7}{note}")
+        tot["raw"] += r["raw"]; tot["gz"] += r["gz"]; tot["br"] += r["br"] or 0
+    have_br = any(r["br"] is not None for r in results)
+    br = f"{tot['br']:>12,}{pct(tot['br'], tot['raw']):>7}" if have_br else f"{'-':>12}{'-':>7}"
+    print(f"{'TOTAL':<44}{tot['raw']:>12,}{tot['gz']:>12,}{pct(tot['gz'], tot['raw']):>7}{br}")
+    if brotli is None:
+        print("(brotli module not installed: no .br files written)")
+
+def main():
+    ap = argparse.ArgumentParser(description="Write .gz/.br siblings for generated JSON data files.")
+    ap.add_argument("paths", nargs="+", help="Data files, or folders to scan for *.json / *.bin")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="Recompress even when siblings are up to date")
+    args = ap.parse_args()
+
+    files: List[Path] = []
+    folders: List[Path] = []
+    for raw in args.paths:
+        p = Path(raw)
+        if p.is_dir():
+            folders.append(p)
+            files.extend(artifacts(p))
+        elif p.is_file():
+            files.append(p)
+        else:
+            print(f"ERROR: not found: {p}", file=sys.stderr)
+            sys.exit(1)
+
+    t0 = time.perf_counter()
+    remove_orphans(folders)
+    results = compress_all(files, args.jobs, args.force)
+    print_report(results)
+    print(f"Compressed {sum(1 for r in results if r['written'])}/{len(results)} file(s) "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import argparse, json, re, sys
+import argparse, re, sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import timings
+from model import EncounterTable
+from outputs import FORMATS, PROFILES, write_entries
+from pbs import lines, parse_header
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 2
 
-HEADER_RE = re.compile(r"^\s*\[(\d+)\]\s*(?:#\s*(.+))?$")
 # Standard block header with a rate, e.g. "Water,4" or "LandMorning,10"
 BLOCK_RE  = re.compile(r"^\s*([A-Za-z][A-Za-z0-9 _-]*?)\s*,\s*(-?\d+)\s*$")
 # Name-only block header (ss2 style), e.g. "OldRod", "GoodRod", "SuperRod", "RockSmash"
@@ -15,76 +22,86 @@ ROW_RE_4 = re.compile(r"^\s*(\d+)\s*,\s*([A-Za-z0-9_]+)\s*,\s*(-?\d+)\s*,\s*(-?\
 # Row with single level (ss2 style)
 ROW_RE_3 = re.compile(r"^\s*(\d+)\s*,\s*([A-Za-z0-9_]+)\s*,\s*(-?\d+)\s*$")
 
-def parse_file(path: Path) -> Dict[str, Any]:
-    out: Dict[str, Any] = {}
-
-    cur_id: Optional[str] = None
-    cur_name: Optional[str] = None
-    cur_type: Optional[str] = None
-
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#") and not line.startswith("["):
-                # blank or comment (but keep headers like "[003] # Forested Cavern")
-                continue
-
-            m = HEADER_RE.match(line)
-            if m:
-                # flush previous section if needed
-                cur_id = m.group(1)
-                cur_name = (m.group(2) or "").strip() or None
-                out[cur_id] = {
-                    "id": cur_id,
-                    "name": cur_name or "",
-                    "encounters": {}  # type -> [[chance, mon, min, max], ...]
-                }
-                cur_type = None
-                continue
-
-            m = BLOCK_RE.match(line)
-            if m and cur_id:
-                enc_type = m.group(1).strip()
-                # rate = int(m.group(2))  # available if you ever want to store it
-                out[cur_id]["encounters"].setdefault(enc_type, [])
-                cur_type = enc_type
-                continue
-
-            # Support name-only block headers (no rate)
-            m = BLOCK_NAME_ONLY_RE.match(line)
-            if m and cur_id and m.group(1).strip().lower() not in {"",}:
-                enc_type = m.group(1).strip()
-                out[cur_id]["encounters"].setdefault(enc_type, [])
-                cur_type = enc_type
-                continue
-
-            # 4-field row: chance, species, min, max
-            m = ROW_RE_4.match(line)
-            if m and cur_id and cur_type:
-                chance = int(m.group(1))
-                mon    = m.group(2)
-                lo     = int(m.group(3))
-                hi     = int(m.group(4))
-                out[cur_id]["encounters"][cur_type].append([chance, mon, lo, hi])
+def parse_file(path: Path) -> Dict[str, EncounterTable]:
+    """
+    One pass over the lines, each classified by its first character before any
+    regex runs: "[" starts a location, a digit is a slot row (its comma count
+    picks ROW_RE_4 or ROW_RE_3), a letter an encounter-type block (BLOCK_RE if
+    it has a comma) and anything else is skipped. The regexes' character sets
+    make these classes disjoint, so this accepts exactly what trying every
+    regex in turn would. A header whose id is not a number ends the current
+    location; the blocks and rows under it are dropped, with a warning.
+    """
+    out: Dict[str, EncounterTable] = {}
+    table: Optional[EncounterTable] = None  # current numeric location
+    rows: Optional[List[Tuple[int, str, int, int]]] = None  # current encounter type's slots
+
+    for lineno, raw in enumerate(lines(path), 1):
+        line = raw.strip()
+        if not line:
+            continue
+        c = line[0]
+
+        if c.isdecimal():
+            if rows is None:
                 continue
-
-            # 3-field row (ss2): chance, species, level (min=max)
-            m = ROW_RE_3.match(line)
-            if m and cur_id and cur_type:
-                chance = int(m.group(1))
-                mon    = m.group(2)
-                lvl    = int(m.group(3))
-                out[cur_id]["encounters"][cur_type].append([chance, mon, lvl, lvl])
+            commas = line.count(",")
+            if commas == 3:    # chance, species, min, max
+                m = ROW_RE_4.match(line)
+                if m:
+                    rows.append((int(m.group(1)), m.group(2), int(m.group(3)), int(m.group(4))))
+            elif commas == 2:  # ss2: chance, species, level (min = max)
+                m = ROW_RE_3.match(line)
+                if m:
+                    lvl = int(m.group(3))
+                    rows.append((int(m.group(1)), m.group(2), lvl, lvl))
+
+        elif c == "[":
+            # headers like "[003] # Forested Cavern" carry the location name as a comment
+            header, _idx, comment = parse_header(line)
+            rows = None
+            if header and header.isdigit():
+                table = out[header] = EncounterTable(id=header, name=(comment or "").strip(), encounters={}, rates={})
+            else:
+                table = None
+                print(f"WARN: {path}:{lineno}: location id {header!r} is not a number, "
+                      f"skipping its encounters", file=sys.stderr)
+
+        elif c.isascii() and c.isalpha():
+            if table is None:
                 continue
+            if "," in line:  # "Water,4" / "LandMorning,10"
+                m = BLOCK_RE.match(line)
+                if m:
+                    table.rates[m.group(1)] = int(m.group(2))
+            else:            # name-only (ss2): "OldRod", "RockSmash"
+                m = BLOCK_NAME_ONLY_RE.match(line)
+            if m:
+                rows = table.encounters.setdefault(m.group(1), [])
 
-            # Non-matching lines are ignored gracefully
+        # "#" comments, "key = value" lines and anything else are ignored
 
     return out
 
+def convert(src: Path, dest: Path, profile: str = "debug", fmt: str = "json") -> int:
+    """Convert encounters.txt to encounters.json. Returns the location count."""
+    with timings.phase("normalize"):
+        tables = parse_file(Path(src))
+    timings.count("locations", len(tables))
+    timings.count("slots", sum(len(rows) for t in tables.values() for rows in t.encounters.values()))
+    entries = ((k, t.to_json()) for k, t in tables.items())
+    write_entries(dest, timings.wrap(entries, "normalize"), keyed=True, profile=profile, fmt=fmt)
+    return len(tables)
+
 def main():
     ap = argparse.ArgumentParser(description="Convert PBS encounters.txt -> encounters.json (keyed by numeric id).")
     ap.add_argument("src", help="Path to encounters.txt")
     ap.add_argument("dest", help="Path to encounters.json")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified")
+    ap.add_argument("--format", choices=FORMATS, default="json",
+                    help="json (default); ndjson: one entry per line, as [key, value]")
+    timings.add_arguments(ap)
     args = ap.parse_args()
 
     src = Path(args.src)
@@ -93,10 +110,8 @@ def main():
         print(f"ERROR: file not found: {src}", file=sys.stderr)
         sys.exit(1)
 
-    data = parse_file(src)
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Wrote {len(data)} locations to {dest}")
+    n = timings.run(args, convert, src, dest, profile=args.profile, fmt=args.format)
+    print(f"Wrote {n} locations to {dest}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importable, lazily parsed game data for Python tools.
+
+    import sys; sys.path.insert(0, "scripts")
+    from game import load_game
+
+    ss2 = load_game("public/data/ss2")
+    ss2.types["FIRE"].weaknesses          # parses types.txt only
+    ss2.species["BULBASAUR"].abilities    # now pokemon.txt as well
+
+Each collection is parsed from its PBS file the first time it is touched,
+with the same parsers (and records, see model.py) the converters use, and is
+then kept on the Game. Collections are plain dicts indexed by internal name
+(encounters by location id). A file that doesn't exist raises
+FileNotFoundError when its collection is touched; a missing
+pokemon_forms.txt just means no forms.
+
+Usage (summary of a game folder):
+  python scripts/game.py public/data/ss2 [--only types,moves]
+"""
+import argparse, sys
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import abilities_to_json, encounters_to_json, items_to_json
+import moves_to_json, pokemon_to_json, types_to_json
+from model import EncounterTable, Form, Item, Move, Species, TypeInfo
+
+COLLECTIONS = ("species", "forms", "moves", "items", "abilities", "types", "encounters")
+
+class Game:
+    """One game folder's PBS data; see the module docstring."""
+
+    def __init__(self, folder: Union[str, Path], stat_order: str = "hp,atk,def,spe,spa,spd"):
+        self.folder = Path(folder)
+        self.stat_order = pokemon_to_json.parse_stat_order(stat_order)
+
+    def __repr__(self) -> str:
+        return f"<Game {self.folder} loaded={','.join(self.loaded) or '-'}>"
+
+    @property
+    def loaded(self) -> List[str]:
+        """Collections parsed so far."""
+        parsed = set(self.__dict__)
+        if "_form_list" in parsed:
+            parsed.add("forms")
+        return [c for c in COLLECTIONS if c in parsed]
+
+    @cached_property
+    def species(self) -> Dict[str, Species]:
+        return pokemon_to_json.parse_pokemon_pbs(self.folder / "pokemon.txt", self.stat_order)
+
+    @cached_property
+    def forms(self) -> Dict[str, Form]:
+        """pokemon_forms.txt sections by form internal name (BASE_INDEX, as in pokemon.json)."""
+        return {pokemon_to_json.form_internal_name(
+                    f.base_internal, f.form_index, f.overrides.get("formName") or f"Form {f.form_index}"): f
+                for f in self._form_list}
+
+    @cached_property
+    def _form_list(self) -> List[Form]:
+        return pokemon_to_json.parse_forms_pbs(self.folder / "pokemon_forms.txt", self.stat_order)
+
+    @cached_property
+    def moves(self) -> Dict[str, Move]:
+        """Every *moves*.txt of the game, merged as the moves converter does."""
+        return moves_to_json.parse_move_files(moves_to_json.find_move_files(self.folder))
+
+    @cached_property
+    def items(self) -> Dict[str, Item]:
+        return items_to_json.parse_items_pbs(self.folder / "items.txt")
+
+    @cached_property
+    def abilities(self) -> Dict[str, Dict[str, str]]:
+        """internal id -> {"internal_id", "name", "description", ...any other keys}."""
+        return {a["internal_id"]: a for a in abilities_to_json.parse_abilities_text(self.folder / "abilities.txt")}
+
+    @cached_property
+    def types(self) -> Dict[str, TypeInfo]:
+        return types_to_json.parse_types_txt(self.folder / "types.txt")
+
+    @cached_property
+    def encounters(self) -> Dict[str, EncounterTable]:
+        return encounters_to_json.parse_file(self.folder / "encounters.txt")
+
+    def entries(self, include_cosmetics: bool = True, delta: bool = False) -> List[Dict[str, Any]]:
+        """pokemon.json's entries (species, then forms), built from species and forms."""
+        return pokemon_to_json.merge_forms(self.species, self._form_list, include_cosmetics, delta=delta)
+
+def load_game(folder: Union[str, Path], stat_order: str = "hp,atk,def,spe,spa,spd") -> Game:
+    """A Game for a folder of PBS files; nothing is read until a collection is touched."""
+    folder = Path(folder)
+    if not folder.is_dir():
+        raise FileNotFoundError(f"game folder not found: {folder}")
+    return Game(folder, stat_order)
+
+# ---------- main ----------
+
+def main():
+    ap = argparse.ArgumentParser(description="Load a game folder through the Python API and print its collection sizes.")
+    ap.add_argument("game_dir", help="Folder with the game's PBS files")
+    ap.add_argument("--only", default=None, help=f"Comma-separated collections (default: all of {','.join(COLLECTIONS)})")
+    args = ap.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] if args.only else list(COLLECTIONS)
+    unknown = [n for n in names if n not in COLLECTIONS]
+    if unknown:
+        print(f"ERROR: unknown collection(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
+    try:
+        game = load_game(args.game_dir)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    for n in names:
+        try:
+            print(f"{n:<12}{len(getattr(game, n)):>7}")
+        except FileNotFoundError as e:
+            print(f"{n:<12}{'-':>7}  ({e})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pack the type and move-category icons into one PNG atlas per family, plus
+icons.atlas.json with every icon's rectangle, so the client draws them as
+CSS backgrounds of one image instead of requesting each icon. The icons are
+shared by every game, so there is a single atlas, written next to them.
+
+Usage:
+  python scripts/icons_to_atlas.py <images dir> [<output icons.atlas.json>] [--profile web]
+
+Reads <images dir>/types/*.png and <images dir>/categories/*.png (decoded
+with pngcodec, no Pillow) and writes types.atlas.png and
+categories.atlas.png next to the JSON. The JSON shape is:
+{
+  "version": 1,
+  "types": {
+    "image": "types.atlas.png", "width": 574, "height": 22,
+    "icons": {"BUG": [0, 0, 22, 22], "COSMIC": [24, 0, 22, 22], ...}
+  },
+  "categories": {
+    "image": "categories.atlas.png", "width": 172, "height": 28,
+    "icons": {"PHYSICAL": [0, 0, 56, 28], ...}
+  }
+}
+Each icon is [x, y, width, height] in atlas pixels; image is relative to the
+JSON. Both families hold every icon in their folder, keyed by upper-cased
+name (the client looks types up by their upper-cased id), sorted; a type
+without an icon is simply missing and the client falls back to the plain
+image. Icons sit side by side in one row, 2 transparent pixels apart, so a
+scaled-up icon never bleeds into its neighbour.
+"""
+import argparse, os, sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from outputs import PROFILES, write_json
+from pngcodec import Image, read_png, write_png
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 2
+
+FAMILIES = ("types", "categories")
+EXTS = ("png", "PNG")
+GUTTER = 2
+
+def atlas_path(dest: Path, family: str) -> Path:
+    """icons.atlas.json -> types.atlas.png / categories.atlas.png next to it"""
+    return Path(dest).with_name(f"{family}.atlas.png")
+
+def icon_files(folder: Path) -> List[str]:
+    """The PNG file names directly in an icon folder (none if it is missing)."""
+    try:
+        return sorted(e.name for e in os.scandir(folder) if e.is_file() and e.name.rsplit(".", 1)[-1] in EXTS)
+    except FileNotFoundError:
+        return []
+
+# ---------- choosing icons ----------
+
+def family_icons(folder: Path) -> List[Tuple[str, Path]]:
+    """(ICON ID, icon file) for every icon in the folder, by name."""
+    out: Dict[str, Path] = {}
+    for name in icon_files(folder):
+        out.setdefault(name.rsplit(".", 1)[0].upper(), folder / name)
+    return sorted(out.items())
+
+# ---------- packing ----------
+
+def pack(icons: List[Tuple[str, Image]]) -> Tuple[Image, Dict[str, List[int]]]:
+    """One row of icons, GUTTER pixels apart and top-aligned; returns the atlas and key -> [x, y, w, h]."""
+    width = sum(img.width for _, img in icons) + GUTTER * max(0, len(icons) - 1)
+    atlas = Image(max(1, width), max([img.height for _, img in icons], default=1))
+    rects, x = {}, 0
+    for key, img in icons:
+        atlas.paste(img, x, 0)
+        rects[key] = [x, 0, img.width, img.height]
+        x += img.width + GUTTER
+    return atlas, rects
+
+def build_family(family: str, icons: List[Tuple[str, Path]], dest: Path) -> Optional[Dict[str, Any]]:
+    """Write one family's atlas PNG; returns its JSON entry (None, and no file, without icons)."""
+    png = atlas_path(dest, family)
+    if not icons:
+        png.unlink(missing_ok=True)
+        return None
+    atlas, rects = pack([(key, read_png(path)) for key, path in icons])
+    write_png(png, atlas)
+    return {"image": png.name, "width": atlas.width, "height": atlas.height, "icons": rects}
+
+# ---------- main ----------
+
+def convert(src: Path, dest: Path, profile: str = "debug") -> int:
+    """Write the atlases and icons.atlas.json for an images folder (src); returns the icon count."""
+    src = Path(src)
+    if not any((src / f).is_dir() for f in FAMILIES):
+        raise FileNotFoundError(f"no {' or '.join(FAMILIES)} icon folder in {src}")
+    chosen = {f: family_icons(src / f) for f in FAMILIES}
+    data: Dict[str, Any] = {"version": 1}
+    for family in FAMILIES:
+        entry = build_family(family, chosen[family], Path(dest))
+        if entry:
+            data[family] = entry
+    write_json(Path(dest), data, trailing_newline=True, profile=profile)
+    return sum(len(v) for v in chosen.values())
+
+def main():
+    ap = argparse.ArgumentParser(description="Pack the type and category icons into PNG atlases with a coordinate map.")
+    ap.add_argument("images", help="Folder holding types/ and categories/, e.g. public/images")
+    ap.add_argument("output", nargs="?", default=None,
+                    help="Output path (default: icons.atlas.json in the images folder)")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified")
+    args = ap.parse_args()
+
+    dest = Path(args.output) if args.output else Path(args.images) / "icons.atlas.json"
+    try:
+        n = convert(Path(args.images), dest, profile=args.profile)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Packed {n} icons into {dest} and its atlases")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import argparse, json, re, sys
+import argparse, re, sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Optional
+
+import timings
+from model import Item
+from outputs import FORMATS, PROFILES, drop_defaults, write_entries
+from pbs import SECTION, tokenize
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 3
+
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+SLUG_TRIM_RE = re.compile(r"(^-+|-+$)")
 
 def slug(s: str) -> str:
-    return re.sub(r"(^-+|-+$)","", re.sub(r"[^a-z0-9]+","-", str(s).lower()))
+    return SLUG_TRIM_RE.sub("", SLUG_RE.sub("-", str(s).lower()))
 
 def parse_bool(v: str) -> Optional[bool]:
     t = (v or "").strip().lower()
@@ -22,54 +33,68 @@ def parse_int(v: str):
 def to_list_csv(v: str):
     return [x.strip() for x in (v or "").split(",") if x.strip()]
 
-def parse_items_pbs(path: Path) -> Dict[str, Dict[str, Any]]:
-    items: Dict[str, Dict[str, Any]] = {}
+def parse_items_pbs(path: Path) -> Dict[str, Item]:
+    items: Dict[str, Item] = {}
     cur_id: Optional[str] = None
-    cur: Dict[str, Any] = {}
-
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#"): continue
-
-            # New section: [INTERNAL_ID]
-            if line.startswith("[") and line.endswith("]"):
-                # flush previous
-                if cur_id:
-                    items[cur_id] = cur
-                cur_id = line[1:-1].strip()
-                cur = {"internalName": cur_id, "id": slug(cur_id)}
-                continue
-
-            if "=" in line and cur_id:
-                k, v = [p.strip() for p in line.split("=", 1)]
-                lk = k.lower()
-
-                if lk == "name":            cur["name"] = v
-                elif lk == "nameplural":    cur["namePlural"] = v
-                elif lk == "description":   cur["description"] = v
-                elif lk == "pocket":        cur["pocket"] = parse_int(v)
-                elif lk == "price":         cur["price"] = parse_int(v)
-                elif lk == "sellprice":     cur["sellPrice"] = parse_int(v)
-                elif lk == "fielduse":      cur["fieldUse"] = v
-                elif lk == "consumable":
-                    b = parse_bool(v)
-                    if b is not None: cur["consumable"] = b
-                elif lk == "flags":
-                    cur["flags"] = to_list_csv(v)
-                else:
-                    # keep any other keys around; don’t lose info
-                    cur.setdefault("extra", {})[k] = v
+    cur = Item()
+
+    for header, _idx, k, v, _line in tokenize(path):
+        # New section: [INTERNAL_ID]
+        if k == SECTION:
+            # flush previous
+            if cur_id:
+                items[cur_id] = cur
+            cur_id = header
+            cur = Item(internal_name=cur_id, id=slug(cur_id)) if cur_id else Item()
+            continue
+
+        if k and cur_id:
+            lk = k.lower()
+
+            if lk == "name":            cur.name = v
+            elif lk == "nameplural":    cur.name_plural = v
+            elif lk == "description":   cur.description = v
+            elif lk == "pocket":        cur.pocket = parse_int(v)
+            elif lk == "price":         cur.price = parse_int(v)
+            elif lk == "sellprice":     cur.sell_price = parse_int(v)
+            elif lk == "fielduse":      cur.field_use = v
+            elif lk == "consumable":
+                b = parse_bool(v)
+                if b is not None: cur.consumable = b
+            elif lk == "flags":
+                cur.flags = to_list_csv(v)
+            else:
+                # keep any other keys around; don’t lose info
+                # (extra stays unset, and out of the JSON, until a section has one)
+                extra = getattr(cur, "extra", None)
+                if extra is None:
+                    extra = cur.extra = {}
+                extra[k] = v
 
     if cur_id:
         items[cur_id] = cur
 
     return items
 
+def convert(src: Path, dest: Path, profile: str = "debug", fmt: str = "json") -> int:
+    """Convert items.txt to items.json. Returns the item count."""
+    with timings.phase("normalize"):
+        items = parse_items_pbs(Path(src))
+    timings.count("items", len(items))
+    clean = drop_defaults if profile == "web" else lambda d: d
+    entries = ((k, clean(it.to_json())) for k, it in items.items())
+    write_entries(dest, timings.wrap(entries, "normalize"), keyed=True, profile=profile, fmt=fmt)
+    return len(items)
+
 def main():
     ap = argparse.ArgumentParser(description="Convert PBS items.txt → items.json (keyed by internal id).")
     ap.add_argument("src", help="Path to items.txt")
     ap.add_argument("dest", help="Path to items.json")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified, default fields dropped")
+    ap.add_argument("--format", choices=FORMATS, default="json",
+                    help="json (default); ndjson: one entry per line, as [key, value]")
+    timings.add_arguments(ap)
     args = ap.parse_args()
 
     src = Path(args.src)
@@ -78,10 +103,8 @@ def main():
         print(f"ERROR: file not found: {src}", file=sys.stderr)
         sys.exit(1)
 
-    data = parse_items_pbs(src)
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Wrote {len(data)} items to {dest}")
+    n = timings.run(args, convert, src, dest, profile=args.profile, fmt=args.format)
+    print(f"Wrote {n} items to {dest}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Give a game's generated data files content-hashed names and list them in
+the game's manifest.json, so the site only has to revalidate the manifest
+and can serve every other data file as immutable:
+
+  moves.json -> moves.3f9a1c04.json  (the first 8 hex digits of its sha256)
+
+The JSON shape is:
+{
+  "version": 1,
+  "files": {
+    "moves.json": {"file": "moves.3f9a1c04.json", "bytes": 48213},
+    "pokemon.stats.bin": {"file": "pokemon.stats.5be07d12.bin", "bytes": 20460},
+    ...
+  }
+}
+
+Keys are the logical names the client asks for, relative to the game folder
+(shards keep their sub-folder). The logical files stay where they are for
+the dev server, watch_data.py and clients without a manifest; the hashed
+copies are written beside them, only when missing (same name, same bytes),
+and copies the new manifest no longer lists are removed. Covers *.json and
+*.bin, not manifest.json itself.
+
+Usage:
+  python scripts/manifest.py public/data/ss2 [public/data/decay ...] [--profile debug]
+"""
+import argparse, hashlib, re, sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from outputs import PROFILES, write_bytes_atomic, write_json
+
+MANIFEST = "manifest.json"
+ARTIFACT_GLOBS = ("*.json", "*.bin")
+HASH_LEN = 8
+HASHED_RE = re.compile(r"\.[0-9a-f]{%d}\.[^.]+$" % HASH_LEN)
+
+def hashed_name(path: Path, digest: str) -> Path:
+    """moves.json + digest -> moves.<first HASH_LEN hex digits>.json"""
+    return path.with_name(f"{path.stem}.{digest[:HASH_LEN]}{path.suffix}")
+
+def _files(folder: Path, hashed: bool) -> List[Path]:
+    found = {p for g in ARTIFACT_GLOBS for p in Path(folder).rglob(g) if p.is_file()}
+    return sorted(p for p in found if p.name != MANIFEST and bool(HASHED_RE.search(p.name)) == hashed)
+
+def logical_files(folder: Path) -> List[Path]:
+    """The data files of a game folder under their own names, sorted."""
+    return _files(folder, hashed=False)
+
+def hashed_files(folder: Path) -> List[Path]:
+    """The content-hashed copies in a game folder, sorted."""
+    return _files(folder, hashed=True)
+
+def publish(folder: Path, profile: str = "web") -> Dict[str, Dict[str, Any]]:
+    """Write the hashed copies and manifest.json of a game folder; returns the manifest's files."""
+    folder = Path(folder)
+    files: Dict[str, Dict[str, Any]] = {}
+    for p in logical_files(folder):
+        data = p.read_bytes()
+        target = hashed_name(p, hashlib.sha256(data).hexdigest())
+        if not target.exists():
+            write_bytes_atomic(target, data)
+        files[p.relative_to(folder).as_posix()] = {
+            "file": target.relative_to(folder).as_posix(), "bytes": len(data)}
+    keep = {folder / f["file"] for f in files.values()}
+    for p in hashed_files(folder):
+        if p not in keep:
+            p.unlink()
+    write_json(folder / MANIFEST, {"version": 1, "files": files}, trailing_newline=True, profile=profile)
+    return files
+
+def main():
+    ap = argparse.ArgumentParser(description="Write content-hashed copies of a game's data files and its manifest.json.")
+    ap.add_argument("folders", nargs="+", help="Game data folders, e.g. public/data/ss2")
+    ap.add_argument("--profile", choices=PROFILES, default="web",
+                    help="web: minified manifest (default); debug: pretty")
+    args = ap.parse_args()
+
+    for raw in args.folders:
+        folder = Path(raw)
+        if not folder.is_dir():
+            print(f"ERROR: not a folder: {folder}", file=sys.stderr)
+            sys.exit(1)
+        files = publish(folder, args.profile)
+        total = sum(f["bytes"] for f in files.values())
+        print(f"Wrote {folder / MANIFEST} ({len(files)} file(s), {total:,} bytes)")
+
+if __name__ == "__main__":
+    main()
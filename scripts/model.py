@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Typed in-memory records for parsed PBS data.
+
+The parsers in the *_to_json converters build these instead of nested dicts:
+every record keeps its fields in __slots__ (no per-object __dict__) and
+nested values in compact form (learnsets and evolutions as tuples), which
+keeps peak memory down when large games, or several games, are processed in
+one process. to_json() is the only place a record turns into today's JSON
+shape, field by field and in output order.
+
+A field that was never assigned is left out of to_json() (items only carry
+the keys their section had); a field set to None is written as null.
+"""
+from typing import Any, Dict, Tuple
+
+def _slots(fields: Tuple[Tuple[str, str], ...]) -> Tuple[str, ...]:
+    return tuple(attr for attr, _key in fields)
+
+class Record:
+    """Base class: FIELDS lists (attribute, JSON key) pairs in output order."""
+    __slots__ = ()
+    FIELDS: Tuple[Tuple[str, str], ...] = ()
+
+    def __init__(self, **fields: Any):
+        for attr, value in fields.items():
+            setattr(self, attr, value)
+
+    def to_json(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for attr, key in self.FIELDS:
+            try:
+                out[key] = getattr(self, attr)
+            except AttributeError:  # never assigned
+                pass
+        return out
+
+    def __repr__(self) -> str:
+        name = getattr(self, "internal_name", None) or getattr(self, "internal_id", None) or getattr(self, "id", "?")
+        return f"<{type(self).__name__} {name}>"
+
+# ---------- pokemon ----------
+
+BATTLER_KEYS = ("playerX", "playerY", "enemyX", "enemyY", "shadowX", "shadowSize")
+
+class Species(Record):
+    """One pokemon.txt section. moves are (level, move), evolutions (to, method, param), battler a 6-tuple."""
+    FIELDS = (
+        ("id", "id"), ("internal_name", "internalName"), ("name", "name"), ("types", "types"),
+        ("stats", "stats"), ("effort_points", "effortPoints"), ("gender_rate", "genderRate"),
+        ("growth_rate", "growthRate"), ("base_exp", "baseEXP"), ("catch_rate", "catchRate"),
+        ("happiness", "happiness"), ("abilities", "abilities"), ("hidden_ability", "hiddenAbility"),
+        ("moves", "moves"), ("tutor_moves", "tutorMoves"), ("egg_moves", "eggMoves"),
+        ("machine_moves", "machineMoves"), ("compatibility", "compatibility"),
+        ("steps_to_hatch", "stepsToHatch"), ("height", "height"), ("weight", "weight"),
+        ("color", "color"), ("shape", "shape"), ("habitat", "habitat"), ("kind", "kind"),
+        ("pokedex", "pokedex"), ("generation", "generation"), ("evolutions", "evolutions"),
+        ("wild_items", "wildItems"), ("battler", "battler"), ("raw", "raw"), ("num", "num"),
+    )
+    __slots__ = _slots(FIELDS)
+
+    def to_json(self) -> Dict[str, Any]:
+        out = super().to_json()
+        if not out.get("hiddenAbility"):
+            out.pop("hiddenAbility", None)
+        out["moves"] = [{"level": level, "move": move} for level, move in self.moves]
+        out["evolutions"] = [{"to": to, "method": method, "param": param} for to, method, param in self.evolutions]
+        out["battler"] = dict(zip(BATTLER_KEYS, self.battler))
+        return out
+
+class Form(Record):
+    """One pokemon_forms.txt section: the base species, form index and its (JSON-shaped) overrides."""
+    FIELDS = (("base_internal", "baseInternal"), ("form_index", "formIndex"),
+              ("overrides", "overrides"), ("raw", "raw"))
+    __slots__ = _slots(FIELDS)
+
+# ---------- moves / items / types ----------
+
+# to_json() flag booleans: JSON key -> move flag (compared case-insensitively)
+MOVE_FLAGS = (
+    ("makesContact", "contact"), ("sound", "sound"), ("punching", "punching"), ("biting", "biting"),
+    ("beam", "beam"), ("dance", "dance"), ("recoilMove", "recoil"), ("cannotMetronome", "cannotmetronome"),
+    ("twice", "twice"), ("tramplesMinimize", "tramplesminimize"),
+)
+
+class Move(Record):
+    FIELDS = (
+        ("internal_id", "internalId"), ("name", "name"), ("type", "type"), ("category", "category"),
+        ("power", "power"), ("accuracy", "accuracy"), ("pp", "pp"), ("target", "target"),
+        ("function_code", "functionCode"), ("flags", "flags"), ("effect_chance", "effectChance"),
+        ("priority", "priority"), ("description", "description"), ("z_move_power", "zMovePower"),
+        ("z_move_effect", "zMoveEffect"), ("recoil", "recoil"), ("healing", "healing"),
+        ("critical_rate", "criticalRate"), ("raw", "raw"),
+    )
+    __slots__ = _slots(FIELDS)
+
+    def to_json(self) -> Dict[str, Any]:
+        out = super().to_json()
+        flags = {f.strip().lower() for f in self.flags}
+        for key, flag in MOVE_FLAGS:
+            out[key] = flag in flags
+        return out
+
+class Item(Record):
+    """An items.txt section; only the keys present in the section are set (unknown ones go to extra)."""
+    FIELDS = (
+        ("internal_name", "internalName"), ("id", "id"), ("name", "name"), ("name_plural", "namePlural"),
+        ("pocket", "pocket"), ("price", "price"), ("sell_price", "sellPrice"), ("field_use", "fieldUse"),
+        ("consumable", "consumable"), ("flags", "flags"), ("extra", "extra"), ("description", "description"),
+    )
+    __slots__ = _slots(FIELDS)
+
+class TypeInfo(Record):
+    FIELDS = (
+        ("name", "name"), ("internal_id", "internalId"), ("weaknesses", "weaknesses"),
+        ("resistances", "resistances"), ("immunities", "immunities"),
+        ("is_special_type", "isSpecialType"), ("is_pseudo_type", "isPseudoType"), ("index", "index"),
+    )
+    __slots__ = _slots(FIELDS)
+
+# ---------- encounters ----------
+
+class EncounterTable(Record):
+    """
+    One encounters.txt location: encounter type -> [(chance, species, min level,
+    max level), ...], plus each type's rate where its block gave one.
+    to_json() appends each slot's share of its type's total chance (0..1).
+    """
+    FIELDS = (("id", "id"), ("name", "name"), ("encounters", "encounters"), ("rates", "rates"))
+    __slots__ = _slots(FIELDS)
+
+    def to_json(self) -> Dict[str, Any]:
+        encounters = {}
+        for t, rows in self.encounters.items():
+            total = sum(row[0] for row in rows)
+            encounters[t] = [[*row, round(row[0] / total, 6) if total else 0] for row in rows]
+        return {"id": self.id, "name": self.name, "encounters": encounters, "rates": self.rates}
+
+def to_json_map(records: Dict[str, Record]) -> Dict[str, Dict[str, Any]]:
+    """{key: record.to_json()} for a parsed id -> record mapping."""
+    return {k: r.to_json() for k, r in records.items()}
@@ -2,40 +2,32 @@
 # scripts/moves_to_json.py
 # -*- coding: utf-8 -*-
 
-import re, json
 from pathlib import Path
-from typing import Dict, Any, Iterable
+from typing import Dict, Iterable, List
 
+import timings
+from model import Move
+from outputs import FORMATS, PROFILES, drop_defaults, write_entries
+from pbs import read_sections
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 2
+
+# raw key -> Move attribute
 CANON = {
     "Name":"name", "Type":"type", "Category":"category",
     "Power":"power", "BasePower":"power",
     "Accuracy":"accuracy", "TotalPP":"pp", "PP":"pp",
-    "Target":"target", "FunctionCode":"functionCode",
-    "Flags":"flags", "EffectChance":"effectChance",
+    "Target":"target", "FunctionCode":"function_code",
+    "Flags":"flags", "EffectChance":"effect_chance",
     "Priority":"priority", "Description":"description",
-    "ZMovePower":"zMovePower", "ZMoveEffect":"zMoveEffect",
-    "Recoil":"recoil", "Healing":"healing", "CriticalRate":"criticalRate",
+    "ZMovePower":"z_move_power", "ZMoveEffect":"z_move_effect",
+    "Recoil":"recoil", "Healing":"healing", "CriticalRate":"critical_rate",
 }
-INT_FIELDS   = {"power","accuracy","pp","effectChance","priority","zMovePower","criticalRate"}
+INT_FIELDS   = {"power","accuracy","pp","effect_chance","priority","z_move_power","critical_rate"}
 FLOAT_FIELDS = {"healing"}
 LIST_FIELDS  = {"flags"}
 
-def clean(line: str) -> str:
-    if "#" in line:
-        if line.lstrip().startswith("#"):
-            return ""
-        line = line.split("#", 1)[0]
-    return line.strip()
-
-def parse_section_header(line: str):
-    m = re.match(r"\s*\[([A-Z0-9_]+)\]\s*$", line, flags=re.I)
-    return m.group(1) if m else None
-
-def parse_kv(line: str):
-    if "=" not in line: return None, None
-    k, v = line.split("=", 1)
-    return k.strip(), v.strip()
-
 def to_int(x):
     try: return int(str(x).strip())
     except: return None
@@ -48,92 +40,88 @@ def to_list_csv(x):
     if x is None: return []
     return [s.strip() for s in str(x).split(",") if s.strip()]
 
-def raw_to_obj(internal_id: str, raw: Dict[str, str]) -> Dict[str, Any]:
-    norm: Dict[str, Any] = {
-        "internalId": internal_id,
-        "name": raw.get("Name"),
-        "type": raw.get("Type"),
-        "category": raw.get("Category"),
-        "power": None, "accuracy": None, "pp": None,
-        "target": raw.get("Target"),
-        "functionCode": raw.get("FunctionCode"),
-        "flags": to_list_csv(raw.get("Flags")),
-        "effectChance": None,
-        "priority": None,
-        "description": raw.get("Description"),
-        "zMovePower": None,
-        "zMoveEffect": raw.get("ZMoveEffect"),
-        "recoil": raw.get("Recoil"),
-        "healing": None,
-        "criticalRate": None,
-        "raw": dict(raw),
-    }
-
-    for src_key, dst_key in CANON.items():
+def raw_to_obj(internal_id: str, raw: Dict[str, str]) -> Move:
+    norm = Move(
+        internal_id=internal_id,
+        name=raw.get("Name"),
+        type=raw.get("Type"),
+        category=raw.get("Category"),
+        power=None, accuracy=None, pp=None,
+        target=raw.get("Target"),
+        function_code=raw.get("FunctionCode"),
+        flags=to_list_csv(raw.get("Flags")),
+        effect_chance=None,
+        priority=None,
+        description=raw.get("Description"),
+        z_move_power=None,
+        z_move_effect=raw.get("ZMoveEffect"),
+        recoil=raw.get("Recoil"),
+        healing=None,
+        critical_rate=None,
+        raw=dict(raw),
+    )
+
+    for src_key, attr in CANON.items():
         if src_key in raw:
             val = raw[src_key]
-            if dst_key in LIST_FIELDS:
-                norm[dst_key] = to_list_csv(val)
-            elif dst_key in INT_FIELDS:
+            if attr in LIST_FIELDS:
+                setattr(norm, attr, to_list_csv(val))
+            elif attr in INT_FIELDS:
                 iv = to_int(val)
-                if iv is not None: norm[dst_key] = iv
-            elif dst_key in FLOAT_FIELDS:
+                if iv is not None: setattr(norm, attr, iv)
+            elif attr in FLOAT_FIELDS:
                 fv = to_float(val)
-                if fv is not None: norm[dst_key] = fv
+                if fv is not None: setattr(norm, attr, fv)
             else:
-                norm[dst_key] = val
-
-    def has_flag(flag_name: str) -> bool:
-        return any(f.strip().lower() == flag_name.lower() for f in norm.get("flags", []))
-
-    norm["makesContact"]   = has_flag("Contact")
-    norm["sound"]          = has_flag("Sound")
-    norm["punching"]       = has_flag("Punching")
-    norm["biting"]         = has_flag("Biting")
-    norm["beam"]           = has_flag("Beam")
-    norm["dance"]          = has_flag("Dance")
-    norm["recoilMove"]     = has_flag("Recoil")
-    norm["cannotMetronome"]= has_flag("CannotMetronome")
-    norm["twice"]          = has_flag("Twice")
-    norm["tramplesMinimize"]=has_flag("TramplesMinimize")
+                setattr(norm, attr, val)
 
+    # makesContact, sound, ... are derived from flags in Move.to_json
     return norm
 
-def parse_moves_txt(path: Path) -> Dict[str, Any]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    out: Dict[str, Any] = {}
-    cur_id = None
-    cur_raw: Dict[str, str] = {}
-
-    for raw_line in text.splitlines():
-        line = clean(raw_line)
-        if not line:
-            continue
-        sec = parse_section_header(line)
-        if sec:
-            if cur_id is not None:
-                out[cur_id] = raw_to_obj(cur_id, cur_raw)
-            cur_id = sec
-            cur_raw = {}
-            continue
-        k, v = parse_kv(line)
-        if k is None:
-            continue
-        cur_raw[k] = v
-
-    if cur_id is not None:
-        out[cur_id] = raw_to_obj(cur_id, cur_raw)
-
+def parse_moves_txt(path: Path) -> Dict[str, Move]:
+    out: Dict[str, Move] = {}
+    for cur_id, _idx, cur_raw, _line in read_sections(path, strip_comments=True):
+        if cur_id:
+            out[cur_id] = raw_to_obj(cur_id, cur_raw)
     return out
 
 
-def parse_move_files(paths: Iterable[Path]) -> Dict[str, Any]:
+def parse_move_files(paths: Iterable[Path]) -> Dict[str, Move]:
     """Parse multiple moves.txt-style files and merge them into one mapping."""
-    data: Dict[str, Any] = {}
+    data: Dict[str, Move] = {}
     for p in paths:
         data.update(parse_moves_txt(p))
     return data
 
+def find_move_files(src_path: Path) -> List[Path]:
+    """Resolve a moves.txt path or a game directory to every *moves*.txt file it covers."""
+    src_path = Path(src_path)
+    if src_path.is_dir():
+        candidates = sorted(src_path.glob("*moves*.txt"))
+    elif src_path.is_file():
+        candidates = sorted(src_path.parent.glob("*moves*.txt"))
+        if src_path not in candidates:
+            candidates.insert(0, src_path)
+    else:
+        raise FileNotFoundError(f"Input not found: {src_path}")
+
+    if not candidates:
+        raise FileNotFoundError(f"No moves*.txt files found in {src_path}")
+    return candidates
+
+def convert(src: Path, dest: Path, profile: str = "debug", fmt: str = "json") -> int:
+    """Convert every *moves*.txt under src to a single moves.json. Returns the move count."""
+    files = find_move_files(src)
+    with timings.phase("normalize"):
+        moves = parse_move_files(files)
+    timings.count("files", len(files))
+    timings.count("moves", len(moves))
+    # false flag booleans, null numbers and empty flag lists
+    clean = drop_defaults if profile == "web" else lambda d: d
+    entries = ((k, clean(m.to_json())) for k, m in moves.items())
+    write_entries(dest, timings.wrap(entries, "normalize"), keyed=True, profile=profile, fmt=fmt)
+    return len(moves)
+
 def main():
     import argparse
     ap = argparse.ArgumentParser(
@@ -144,27 +132,23 @@ def main():
         help="Path to a moves.txt file or a directory containing any *moves*.txt files",
     )
     ap.add_argument("dest", help="Path to output moves.json")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified, default fields dropped")
+    ap.add_argument("--format", choices=FORMATS, default="json",
+                    help="json (default); ndjson: one entry per line, as [key, value]")
+    timings.add_arguments(ap)
     args = ap.parse_args()
 
     src_path = Path(args.src)
     dest = Path(args.dest)
 
-    if src_path.is_dir():
-        candidates = sorted(src_path.glob("*moves*.txt"))
-    elif src_path.is_file():
-        candidates = sorted(src_path.parent.glob("*moves*.txt"))
-        if src_path not in candidates:
-            candidates.insert(0, src_path)
-    else:
-        raise SystemExit(f"Input not found: {src_path}")
-
-    if not candidates:
-        raise SystemExit(f"No moves*.txt files found in {src_path}")
+    try:
+        candidates = find_move_files(src_path)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
 
-    data = parse_move_files(candidates)
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Wrote {len(data)} moves from {len(candidates)} file(s) to {dest}")
+    n = timings.run(args, convert, src_path, dest, profile=args.profile, fmt=args.format)
+    print(f"Wrote {n} moves from {len(candidates)} file(s) to {dest}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared output helpers for the PBS -> JSON converters.
+
+Every writer goes through write_text_atomic so a crashed or interrupted build
+never leaves a half-written JSON file where Vite (or the browser) can see it.
+
+Output profiles:
+  debug  pretty-printed (indent=2), every field kept -- the historical format
+  web    minified with compact separators; converters also drop fields whose
+         value is a default (None, False, empty list/dict) via drop_defaults.
+         Key order is the same insertion order as debug, so output is stable.
+
+Large outputs are streamed with write_entries: one entry is serialized and
+written at a time, byte-for-byte what write_json gives for the whole list or
+mapping, so the complete JSON string never exists in memory. Its "ndjson"
+format writes one compact entry per line instead (a keyed mapping as
+[key, value] lines), which a streaming reader can parse incrementally.
+"""
+import json, os, tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple, Union
+
+from timings import phase
+
+PROFILES = ("debug", "web")
+FORMATS = ("json", "ndjson")
+
+# mkstemp creates files as 0600; give outputs the usual umask-derived mode.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+def write_bytes_atomic(dest: Path, data: bytes) -> None:
+    """Write data to dest via a temp file in the same directory + os.replace."""
+    with phase("write"):
+        _write_bytes_atomic(Path(dest), data)
+
+def _write_bytes_atomic(dest: Path, data: bytes) -> None:
+    with open_atomic(dest) as f:
+        f.write(data)
+
+@contextmanager
+def open_atomic(dest: Path) -> Iterator[IO[bytes]]:
+    """Binary file that becomes dest only when the with-block succeeds (temp file + os.replace)."""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{dest.name}.", suffix=".tmp", dir=dest.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, dest)
+    except BaseException:
+        try: os.unlink(tmp)
+        except FileNotFoundError: pass
+        raise
+
+def write_text_atomic(dest: Path, text: str) -> None:
+    """UTF-8 text version of write_bytes_atomic."""
+    write_bytes_atomic(dest, text.encode("utf-8"))
+
+def is_default(v: Any) -> bool:
+    return v is None or v is False or (isinstance(v, (list, dict)) and not v)
+
+def drop_defaults(d: Dict[str, Any], keep: Iterable[str] = ()) -> Dict[str, Any]:
+    """Copy of d without None / False / empty list or dict values, order kept; keys in keep always stay."""
+    keep = set(keep)
+    return {k: v for k, v in d.items() if k in keep or not is_default(v)}
+
+def dumps(data: Any, profile: str = "debug") -> str:
+    with phase("dumps"):
+        if profile == "web":
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+def write_json(dest: Path, data: Any, trailing_newline: bool = False, profile: str = "debug") -> None:
+    """Serialize data as UTF-8 JSON for the given profile and write it atomically."""
+    if profile not in PROFILES:
+        raise ValueError(f"unknown output profile: {profile}")
+    text = dumps(data, profile)
+    write_text_atomic(dest, text + "\n" if trailing_newline and profile == "debug" else text)
+
+# ---------- streaming ----------
+
+Entries = Union[Iterable[Any], Iterable[Tuple[str, Any]]]
+
+def iter_json(items: Entries, keyed: bool = False, profile: str = "debug") -> Iterator[str]:
+    """
+    Chunks of the JSON text dumps() gives for list(items) (or dict(items) when
+    keyed, items being (key, value) pairs), one entry per chunk.
+    """
+    pretty = profile != "web"
+    sep, colon = (",\n  ", ": ") if pretty else (",", ":")
+    opener, closer = "{}" if keyed else "[]"
+    first = True
+    for item in items:
+        if keyed:
+            key, value = item
+            text = json.dumps(key, ensure_ascii=False) + colon + dumps(value, profile)
+        else:
+            text = dumps(item, profile)
+        if pretty:
+            text = text.replace("\n", "\n  ")  # strings never hold a raw newline: it is escaped
+        yield (opener + ("\n  " if pretty else "") if first else sep) + text
+        first = False
+    yield opener + closer if first else ("\n" if pretty else "") + closer
+
+def iter_ndjson(items: Entries, keyed: bool = False) -> Iterator[str]:
+    """One compact JSON line per entry ([key, value] when keyed)."""
+    for item in items:
+        yield dumps(list(item) if keyed else item, "web") + "\n"
+
+def write_entries(dest: Path, items: Entries, keyed: bool = False, trailing_newline: bool = False,
+                  profile: str = "debug", fmt: str = "json") -> None:
+    """
+    Stream a list (or, keyed, a mapping given as (key, value) pairs) to dest
+    atomically, serializing one entry at a time. fmt "json" writes exactly
+    what write_json would; "ndjson" one entry per line.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"unknown output profile: {profile}")
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown output format: {fmt}")
+    chunks = iter_ndjson(items, keyed) if fmt == "ndjson" else iter_json(items, keyed, profile)
+    with open_atomic(dest) as f:
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            with phase("write"):
+                f.write(data)
+        if fmt == "json" and trailing_newline and profile == "debug":
+            f.write(b"\n")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared streaming tokenizer for PBS text files.
+
+Every converter sits on top of tokenize(), which reads a file lazily (one line
+at a time, never the whole text) and yields events:
+
+  (header, index, key, value, lineno)
+
+  * section start:  key == SECTION, value = trailing "# comment" text or None
+  * key = value:    key/value stripped strings
+  * any other line: key is None, value = the stripped line (encounter rows)
+
+For "[NAME]", "[NAME,3]" and "[3]" headers, header is the text before the
+comma ("NAME", "NAME", "3") and index the integer after it; a purely numeric
+header is also its own index. Blank lines, "#" comment lines, a leading BOM and
+anything before the first section are skipped.
+
+Run directly to measure tokenizer throughput:
+  python scripts/pbs.py public/data/*/*.txt
+"""
+import io, re, sys, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import timings
+
+SECTION = "["
+
+HEADER_RE = re.compile(r"\[\s*([^\],]*?)\s*(?:,\s*(\d+)\s*)?\]\s*(?:#\s*(.*?))?$")
+
+Event = Tuple[Optional[str], Optional[int], Optional[str], Optional[str], int]
+Source = Union[Path, str, Iterable[str]]
+
+def lines(source: Source, errors: str = "ignore") -> Iterator[str]:
+    """Raw lines of a PBS file (Path), its text (str) or an iterable of lines, minus a leading BOM."""
+    if isinstance(source, Path) and timings.current() is not None:
+        # timed runs read the whole file up front so "read" and "tokenize" are separate
+        with timings.phase("read"):
+            text = source.read_text(encoding="utf-8-sig", errors=errors)
+        yield from io.StringIO(text)
+    elif isinstance(source, Path):
+        with source.open("r", encoding="utf-8-sig", errors=errors) as f:
+            yield from f
+    elif isinstance(source, str):
+        yield from io.StringIO(source[1:] if source.startswith("\ufeff") else source)
+    else:
+        it = iter(source)
+        first = next(it, None)
+        if first is not None:
+            yield first[1:] if first.startswith("\ufeff") else first
+            yield from it
+
+def parse_header(line: str) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """"[NAME,3] # note" -> ("NAME", 3, "note"); unparseable headers give (None, None, None)."""
+    m = HEADER_RE.match(line)
+    if not m:
+        return None, None, None
+    header = m.group(1)
+    index = int(m.group(2)) if m.group(2) else (int(header) if header.isdigit() else None)
+    return header, index, m.group(3) or None
+
+def tokenize(source: Source, strip_comments: bool = False, errors: str = "ignore") -> Iterator[Event]:
+    """
+    Lazily tokenize a PBS file (Path), its text (str) or any iterable of lines.
+    strip_comments also drops trailing "# ..." from every line (moves.txt style).
+    """
+    return timings.wrap(_tokenize(source, strip_comments, errors), "tokenize")
+
+def _tokenize(source: Source, strip_comments: bool, errors: str) -> Iterator[Event]:
+    header: Optional[str] = None
+    index: Optional[int] = None
+    in_section = False
+
+    for lineno, raw in enumerate(lines(source, errors), 1):
+        line = raw.strip()
+        if not line or line[0] == "#":
+            continue
+        if strip_comments and "#" in line:
+            line = line.split("#", 1)[0].rstrip()
+            if not line:
+                continue
+
+        if line[0] == "[":
+            header, index, comment = parse_header(line)
+            in_section = True
+            yield header, index, SECTION, comment, lineno
+            continue
+        if not in_section:
+            continue
+
+        k, sep, v = line.partition("=")
+        if sep:
+            k = k.strip()
+            if k:
+                yield header, index, k, v.strip(), lineno
+        else:
+            yield header, index, None, line, lineno
+
+def read_sections(source: Source, collect: Optional[Dict[str, str]] = None,
+                  **kw) -> Iterator[Tuple[Optional[str], Optional[int], Dict[str, Any], int]]:
+    """
+    Group tokenize() events into (header, index, raw, lineno) per section, where
+    raw maps key -> value (last one wins). collect maps lower-cased keys that may
+    repeat (e.g. ss2's "EVs =" lines) to a raw key holding a list of every value.
+    """
+    return timings.wrap(_read_sections(source, collect, **kw), "tokenize")
+
+def _read_sections(source: Source, collect: Optional[Dict[str, str]] = None, strip_comments: bool = False,
+                   errors: str = "ignore") -> Iterator[Tuple[Optional[str], Optional[int], Dict[str, Any], int]]:
+    cur: Optional[Dict[str, Any]] = None
+    sec: Tuple[Optional[str], Optional[int], int] = (None, None, 0)
+    for header, index, key, value, lineno in _tokenize(source, strip_comments, errors):
+        if key == SECTION:
+            if cur is not None:
+                yield sec[0], sec[1], cur, sec[2]
+            cur = {}
+            sec = (header, index, lineno)
+            continue
+        if key is None:
+            continue
+        dest = collect.get(key.lower()) if collect else None
+        if dest:
+            cur.setdefault(dest, []).append(value)
+        else:
+            cur[key] = value
+    if cur is not None:
+        yield sec[0], sec[1], cur, sec[2]
+
+def fold_keys(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """raw with lower-cased keys, built once per section for case-insensitive lookups (first spelling wins)."""
+    out: Dict[str, Any] = {}
+    for k, v in raw.items():
+        out.setdefault(k.lower(), v)
+    return out
+
+# ---------- throughput ----------
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]]
+    if not paths:
+        print("Usage: python scripts/pbs.py <file.txt> [...]", file=sys.stderr)
+        sys.exit(2)
+
+    total_lines = total_events = 0
+    total_t = 0.0
+    for p in paths:
+        t0 = time.perf_counter()
+        events = sum(1 for _ in tokenize(p))
+        dt = time.perf_counter() - t0
+        with p.open("rb") as f:
+            n_lines = sum(1 for _ in f)
+        total_lines += n_lines; total_events += events; total_t += dt
+        print(f"{str(p):<45}{n_lines:>9} lines{events:>9} events{n_lines / dt if dt else 0:>12,.0f} lines/s")
+    print(f"{'TOTAL':<45}{total_lines:>9} lines{total_events:>9} events"
+          f"{total_lines / total_t if total_t else 0:>12,.0f} lines/s")
+
+if __name__ == "__main__":
+    main()
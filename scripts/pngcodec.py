@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Minimal pure-Python PNG reading and writing over zlib (no Pillow needed).
+
+read_png() decodes any non-interlaced PNG (greyscale, RGB, palette, with or
+without alpha, 1-16 bits per sample; tRNS honoured) to 8-bit RGBA rows;
+write_png() encodes 8-bit RGBA rows, choosing each row's filter with the
+usual minimum-sum-of-absolute-differences heuristic. Meant for small images
+such as icons: every pixel goes through Python.
+
+Usage (round trip, prints the decoded size):
+  python scripts/pngcodec.py <in.png> [<out.png>]
+"""
+import struct, sys, zlib
+from pathlib import Path
+from typing import List, Union
+
+from outputs import write_bytes_atomic
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}  # colour type -> samples per pixel
+
+class Image:
+    """width x height pixels as rows of RGBA bytes (4 * width each)."""
+    __slots__ = ("width", "height", "rows")
+
+    def __init__(self, width: int, height: int, rows: List[bytearray] = None):
+        self.width, self.height = width, height
+        self.rows = rows if rows is not None else [bytearray(4 * width) for _ in range(height)]
+
+    def paste(self, other: "Image", x: int, y: int) -> None:
+        """Copy other into this image with its top-left corner at (x, y)."""
+        for r, row in enumerate(other.rows):
+            self.rows[y + r][4 * x:4 * (x + other.width)] = row
+
+# ---------- reading ----------
+
+def _chunks(data: bytes):
+    pos = len(SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack_from(">I4s", data, pos)
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IEND":
+            return
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> List[bytearray]:
+    """Undo the per-row filters of a decompressed image (bpp: bytes per complete pixel, at least 1)."""
+    rows, prev, pos = [], bytearray(stride), 0
+    for _ in range(height):
+        ftype, line = raw[pos], bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if ftype == 1:    # Sub
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif ftype == 2:  # Up
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xFF
+        elif ftype == 3:  # Average
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif ftype == 4:  # Paeth
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                upleft = prev[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(left, prev[i], upleft)) & 0xFF
+        elif ftype != 0:
+            raise ValueError(f"bad PNG filter type {ftype}")
+        rows.append(line)
+        prev = line
+    return rows
+
+def _samples(line: bytearray, depth: int, count: int) -> List[int]:
+    """count samples of depth bits from a scanline (16-bit samples keep their high byte)."""
+    if depth == 8:
+        return list(line[:count])
+    if depth == 16:
+        return list(line[0:2 * count:2])
+    per_byte, mask = 8 // depth, (1 << depth) - 1
+    return [(line[i // per_byte] >> (8 - depth * (i % per_byte + 1))) & mask for i in range(count)]
+
+def read_png(source: Union[str, Path, bytes]) -> Image:
+    """Decode a PNG file (or its bytes) to 8-bit RGBA."""
+    data = source if isinstance(source, bytes) else Path(source).read_bytes()
+    if data[:8] != SIGNATURE:
+        raise ValueError("not a PNG file")
+    header, palette, trns, idat = None, b"", None, []
+    for kind, body in _chunks(data):
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = body
+        elif kind == b"tRNS":
+            trns = body
+        elif kind == b"IDAT":
+            idat.append(body)
+    if header is None:
+        raise ValueError("PNG without IHDR")
+    width, height, depth, ctype, _comp, _filt, interlace = header
+    if ctype not in CHANNELS:
+        raise ValueError(f"bad PNG colour type {ctype}")
+    if interlace:
+        raise ValueError("interlaced PNGs are not supported")
+
+    channels = CHANNELS[ctype]
+    stride = (width * channels * depth + 7) // 8
+    bpp = max(1, channels * depth // 8)
+    rows = _unfilter(zlib.decompress(b"".join(idat)), height, stride, bpp)
+
+    scale = 255 // ((1 << depth) - 1) if depth < 8 else 1  # 1/2/4-bit grey to 0..255
+    key = None  # tRNS colour key for greyscale / RGB, at the image's own depth
+    if trns is not None and ctype == 0:
+        key = (struct.unpack(">H", trns[:2])[0],)
+    elif trns is not None and ctype == 2:
+        key = struct.unpack(">HHH", trns[:6])
+    raw_key = key and tuple(k >> 8 if depth == 16 else k for k in key)
+
+    out = Image(width, height)
+    for y, line in enumerate(rows):
+        s = _samples(line, depth, width * channels)
+        px = out.rows[y]
+        for x in range(width):
+            if ctype == 3:
+                i = s[x]
+                r, g, b = palette[3 * i:3 * i + 3]
+                a = trns[i] if trns is not None and i < len(trns) else 255
+            elif ctype == 0:
+                v = s[x] * scale
+                r = g = b = v
+                a = 0 if raw_key and (s[x],) == raw_key else 255
+            elif ctype == 4:
+                r = g = b = s[2 * x]
+                a = s[2 * x + 1]
+            elif ctype == 2:
+                r, g, b = s[3 * x:3 * x + 3]
+                a = 0 if raw_key and (r, g, b) == raw_key else 255
+            else:
+                r, g, b, a = s[4 * x:4 * x + 4]
+            px[4 * x:4 * x + 4] = bytes((r, g, b, a))
+    return out
+
+# ---------- writing ----------
+
+def _filtered(line: bytearray, prev: bytearray, bpp: int = 4) -> bytes:
+    """The filtered form of a row (type byte first) with the smallest sum of absolute differences."""
+    n = len(line)
+    left = bytes(bpp) + line[:n - bpp]
+    upleft = bytes(bpp) + prev[:n - bpp]
+    candidates = (
+        bytes(line),
+        bytes((line[i] - left[i]) & 0xFF for i in range(n)),
+        bytes((line[i] - prev[i]) & 0xFF for i in range(n)),
+        bytes((line[i] - ((left[i] + prev[i]) >> 1)) & 0xFF for i in range(n)),
+        bytes((line[i] - _paeth(left[i], prev[i], upleft[i])) & 0xFF for i in range(n)),
+    )
+    cost = [sum(v if v < 128 else 256 - v for v in c) for c in candidates]
+    best = cost.index(min(cost))
+    return bytes((best,)) + candidates[best]
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+def encode_png(image: Image) -> bytes:
+    """8-bit RGBA PNG bytes of an Image."""
+    prev, raw = bytearray(4 * image.width), []
+    for line in image.rows:
+        raw.append(_filtered(line, prev))
+        prev = line
+    return b"".join((
+        SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", image.width, image.height, 8, 6, 0, 0, 0)),
+        _chunk(b"IDAT", zlib.compress(b"".join(raw), 9)),
+        _chunk(b"IEND", b""),
+    ))
+
+def write_png(dest: Union[str, Path], image: Image) -> None:
+    """Encode an Image and replace dest atomically."""
+    write_bytes_atomic(Path(dest), encode_png(image))
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print(__doc__.strip().splitlines()[-1].strip(), file=sys.stderr)
+        sys.exit(2)
+    img = read_png(sys.argv[1])
+    print(f"{sys.argv[1]}: {img.width}x{img.height}")
+    if len(sys.argv) == 3:
+        write_png(sys.argv[2], img)
+        print(f"Wrote {sys.argv[2]}")
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,32 @@
 # -*- coding: utf-8 -*-
 
 import argparse, json, re, sys
+from array import array
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, Iterator, List, Any, Tuple, Optional, Set
+
+import timings
+from outputs import FORMATS, PROFILES, drop_defaults, dumps, write_bytes_atomic, write_entries, write_json
+from model import Form, Species
+from pbs import fold_keys, read_sections
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 4
 
 # ---------- helpers ----------
 
 STAT_KEYS = {"hp","atk","def","spa","spd","spe"}
 
+# Repeated "EVs = STAT,N" lines (ss2 style) are gathered into one list
+EV_KEYS = {"evs": "__EVS__", "ev": "__EVS__", "evyield": "__EVS__"}
+
+NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?$")
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+SLUG_TRIM_RE = re.compile(r"(^-+|-+$)")
+CAP_RE = re.compile(r"\bcap\b", re.I)
+COSPLAY_RE = re.compile(r"cosplay", re.I)
+NON_ALPHA_RE = re.compile(r"[^a-z]")
+
 def parse_stat_order(order_str: str) -> List[str]:
     raw = [s.strip().lower() for s in order_str.split(",")]
     alias = {"spatk":"spa","spat":"spa","sp.a":"spa",
@@ -42,19 +61,7 @@ def title_from_internal(name: str) -> str:
     return str(name).replace("_"," ").title()
 
 def slug(s: str) -> str:
-    return re.sub(r"(^-+|-+$)", "", re.sub(r"[^a-z0-9]+", "-", str(s).lower()))
-
-def parse_kv_line(line: str):
-    if "=" not in line: return None, None
-    k,v=line.split("=",1); return k.strip(), v.strip()
-
-def parse_section_header(line: str):
-    # Allow [1], [INTERNAL], [INTERNAL,NUMBER]
-    m = re.match(r"\s*\[([A-Za-z0-9_]+)(?:\s*,\s*(\d+))?\]\s*$", line)
-    if m: return m.group(1), (int(m.group(2)) if m.group(2) else None)
-    m2 = re.match(r"\s*\[(\d+)\]\s*$", line)
-    if m2: return None, int(m2.group(1))
-    return None, None
+    return SLUG_TRIM_RE.sub("", SLUG_RE.sub("-", str(s).lower()))
 
 def contains_base(form_name: str, base_disp: str) -> bool:
     return (form_name or "").lower().find((base_disp or "").lower()) >= 0
@@ -64,7 +71,7 @@ def is_cosmetic_form(base_internal: str, form_name: str) -> bool:
     b = (base_internal or "").upper()
     name = form_name or ""
     if b == "UNOWN": return True
-    if b == "PIKACHU" and (re.search(r"\bcap\b", name, re.I) or re.search(r"cosplay", name, re.I)):
+    if b == "PIKACHU" and (CAP_RE.search(name) or COSPLAY_RE.search(name)):
         return True
     return False
 
@@ -115,7 +122,7 @@ def parse_evs_list(entries: List[str]) -> Dict[str,int]:
         stat = STAT_NAME_ALIASES.get(stat_raw, None)
         if not stat:
             # try common shorthands like "sp. atk"
-            stat2 = re.sub(r"[^a-z]", "", stat_raw)
+            stat2 = NON_ALPHA_RE.sub("", stat_raw)
             stat = STAT_NAME_ALIASES.get(stat2)
         try:
             val = int(parts[1])
@@ -125,8 +132,8 @@ def parse_evs_list(entries: List[str]) -> Dict[str,int]:
             out[stat] = out.get(stat, 0) + val
     return out
 
-def parse_moves_csv(v: str) -> List[Dict[str,Any]]:
-    # "1,TACKLE,5,HOWL,10,EMBER" -> [{level:1, move:"TACKLE"}, ...]
+def parse_moves_pairs(v: str) -> List[Tuple[int, str]]:
+    # "1,TACKLE,5,HOWL,10,EMBER" -> [(1, "TACKLE"), ...]
     toks = [t.strip() for t in (v or "").split(",") if t.strip()]
     out = []
     i = 0
@@ -137,11 +144,15 @@ def parse_moves_csv(v: str) -> List[Dict[str,Any]]:
         except:
             # Sometimes odd data; treat non-int levels as 0
             level = 0
-        out.append({"level": level, "move": move})
+        out.append((level, move))
         i += 2
     return out
 
-def parse_evos_csv(v: str) -> List[Dict[str,Any]]:
+def parse_moves_csv(v: str) -> List[Dict[str,Any]]:
+    # "1,TACKLE,5,HOWL,10,EMBER" -> [{level:1, move:"TACKLE"}, ...]
+    return [{"level": level, "move": move} for level, move in parse_moves_pairs(v)]
+
+def parse_evos_triples(v: str) -> List[Tuple[str, str, str]]:
     # "TARGET,Method,Param, TARGET2,Method2,Param2, ..."
     toks = [t.strip() for t in (v or "").split(",") if t.strip()]
     out = []
@@ -150,38 +161,34 @@ def parse_evos_csv(v: str) -> List[Dict[str,Any]]:
         to = toks[i] if i < len(toks) else ""
         method = toks[i+1] if i+1 < len(toks) else ""
         param = toks[i+2] if i+2 < len(toks) else ""
-        out.append({"to": to, "method": method, "param": param})
+        out.append((to, method, param))
         i += 3
     return out
 
+def parse_evos_csv(v: str) -> List[Dict[str,Any]]:
+    return [{"to": to, "method": method, "param": param} for to, method, param in parse_evos_triples(v)]
+
 def parse_wild_items(d: Dict[str,str]) -> Dict[str,str]:
     out = {}
     for k in ("WildItemCommon","WildItemUncommon","WildItemRare"):
         if k in d and str(d[k]).strip():
             out[k] = str(d[k]).strip()
     return out
-def get_ci(d: Dict[str, str], key: str) -> Optional[str]:
-    """Case-insensitive getter for raw PBS dicts."""
-    kl = key.lower()
-    for k, v in d.items():
-        if k.lower() == kl:
-            return v
-    return None
-
-def extract_types(raw: Dict[str, str]) -> List[str]:
+def extract_types(ci: Dict[str, str]) -> List[str]:
     """
     Prefer explicit Type1/Type2 if present; otherwise parse Types/Type CSV.
+    ci is the section with lower-cased keys (pbs.fold_keys).
     Returns a deduped list of 1–2 types.
     """
-    t1 = get_ci(raw, "Type1")
-    t2 = get_ci(raw, "Type2")
+    t1 = ci.get("type1")
+    t2 = ci.get("type2")
     if t1 or t2:
         out = []
         if t1: out.append(t1.strip())
         if t2 and t2.strip() and (not out or t2.strip() != out[0]): out.append(t2.strip())
         return [t for t in out if t]
     # Fallback: "Types=A,B" or "Type=A,B"
-    csv = get_ci(raw, "Types") or get_ci(raw, "Type")
+    csv = ci.get("types") or ci.get("type")
     ts = to_list(csv)
     if ts:
         a = [ts[0]]
@@ -193,60 +200,24 @@ def extract_types(raw: Dict[str, str]) -> List[str]:
 
 # ---------- file parsers ----------
 
-def parse_pokemon_pbs(path: Path, stat_order: List[str]) -> Dict[str, Dict[str, Any]]:
-    entries: List[Dict[str, Any]] = []
-    cur: Optional[Dict[str, Any]] = None
-    cur_raw: Optional[Dict[str, Any]] = None
-    header_idx: Optional[int] = None
-
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        num = 1
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#"): continue
-            if line.startswith("["):
-                if cur:
-                    # ── finalize previous section ─────────────────────────────
-                    cur["types"] = extract_types(cur_raw or {})
-                    cur["raw"] = cur_raw
-                    cur["num"] = num
-                    num += 1
-                    entries.append(cur)
-                header, idx = parse_section_header(line)
-                cur = {"_header": header, "_index": idx}
-                cur_raw = {}
-                header_idx = idx
-                continue
-
-            if cur is None: continue
-            k, v = parse_kv_line(line)
-            if not k: continue
-            kl = k.strip().lower()
-            # Aggregate repeated EV lines (ss2 style)
-            if kl in ("evs","ev","evyield"):
-                cur_raw.setdefault("__EVS__", []).append(v)
-            else:
-                cur_raw[k] = v
-
-    if cur:
-        # ── finalize last section ────────────────────────────────────────────
-        cur["types"] = extract_types(cur_raw or {})
-        cur["raw"] = cur_raw
-        cur["num"] = num
-        entries.append(cur)
-
-    # … the rest of parse_pokemon_pbs stays the same …
-
-
-    result: Dict[str, Dict[str, Any]] = {}
-    for e in entries:
-        r = e.get("raw", {})
-        internal = r.get("InternalName") or e.get("_header")
+def _int_or_raw(r: Dict[str, Any], key: str):
+    v = r.get(key, "0")
+    return int(v) if str(v).isdigit() else r.get(key)
+
+def _float_or_raw(r: Dict[str, Any], key: str):
+    v = r.get(key, "0") or ""
+    return float(v or 0) if NUMBER_RE.match(v) else r.get(key)
+
+def parse_pokemon_pbs(path: Path, stat_order: List[str]) -> Dict[str, Species]:
+    result: Dict[str, Species] = {}
+    num = 0
+    for header, _idx, r, _line in read_sections(path, collect=EV_KEYS, strip_comments=True):
+        num += 1
+        # [1]-style headers carry no internal name; InternalName= supplies it
+        internal = r.get("InternalName") or (None if (header or "").isdigit() else header)
         if not internal:  # no key to index by
             continue
-        name = r.get("Name") or title_from_internal(internal)
 
-        # normalized
         # effort points: EffortPoints CSV or repeated EVs lines
         ep: Dict[str,int]
         if r.get("EffortPoints"):
@@ -256,100 +227,54 @@ def parse_pokemon_pbs(path: Path, stat_order: List[str]) -> Dict[str, Dict[str,
         else:
             ep = {"hp":0,"atk":0,"def":0,"spa":0,"spd":0,"spe":0}
 
-        mon: Dict[str, Any] = {
-            "id": slug(internal),
-            "internalName": internal,
-            "name": name,
-            "types": e.get("types", []),
-            "stats": parse_base_stats(r.get("BaseStats",""), stat_order),
-            "effortPoints": ep,
-            "genderRate": r.get("GenderRate"),
-            "growthRate": r.get("GrowthRate"),
-            "baseEXP": int(r.get("BaseEXP","0")) if str(r.get("BaseEXP","0")).isdigit() else r.get("BaseEXP"),
-            "catchRate": int(r.get("Rareness","0")) if str(r.get("Rareness","0")).isdigit() else r.get("Rareness"),
-            "happiness": int(r.get("Happiness","0")) if str(r.get("Happiness","0")).isdigit() else r.get("Happiness"),
-            "abilities": dedupe_keep_order(to_list(r.get("Abilities"))),
-            "hiddenAbility": (r.get("HiddenAbility") or r.get("HiddenAbilities") or "").strip() or None,
-            "moves": parse_moves_csv(r.get("Moves","")),
-            "tutorMoves": to_list(r.get("TutorMoves")),
-            "eggMoves": to_list(r.get("EggMoves")),
-            "machineMoves": to_list(r.get("MachineMoves") or r.get("TM")),
-
-            "compatibility": to_list(r.get("Compatibility")),
-            "stepsToHatch": int(r.get("StepsToHatch","0")) if str(r.get("StepsToHatch","0")).isdigit() else r.get("StepsToHatch"),
-            "height": float(r.get("Height","0") or 0) if re.match(r"^-?\d+(\.\d+)?$", r.get("Height","0") or "") else r.get("Height"),
-            "weight": float(r.get("Weight","0") or 0) if re.match(r"^-?\d+(\.\d+)?$", r.get("Weight","0") or "") else r.get("Weight"),
-            "color": r.get("Color"),
-            "shape": r.get("Shape"),
-            "habitat": r.get("Habitat"),
-            "kind": r.get("Kind"),
-            "pokedex": r.get("Pokedex") or r.get("Summary") or r.get("Kind"),
-            "generation": r.get("Generation"),
-            "evolutions": parse_evos_csv(r.get("Evolutions","")),
-            "wildItems": parse_wild_items(r),
-
-            # battler/meta (keep as-is if present)
-            "battler": {
-                "playerX": r.get("BattlerPlayerX"),
-                "playerY": r.get("BattlerPlayerY"),
-                "enemyX":  r.get("BattlerEnemyX"),
-                "enemyY":  r.get("BattlerEnemyY"),
-                "shadowX": r.get("BattlerShadowX"),
-                "shadowSize": r.get("BattlerShadowSize"),
-            },
-
+        result[internal] = Species(
+            id=slug(internal),
+            internal_name=internal,
+            name=r.get("Name") or title_from_internal(internal),
+            types=extract_types(fold_keys(r)),
+            stats=parse_base_stats(r.get("BaseStats",""), stat_order),
+            effort_points=ep,
+            gender_rate=r.get("GenderRate"),
+            growth_rate=r.get("GrowthRate"),
+            base_exp=_int_or_raw(r, "BaseEXP"),
+            catch_rate=_int_or_raw(r, "Rareness"),
+            happiness=_int_or_raw(r, "Happiness"),
+            abilities=dedupe_keep_order(to_list(r.get("Abilities"))),
+            hidden_ability=(r.get("HiddenAbility") or r.get("HiddenAbilities") or "").strip() or None,
+            moves=parse_moves_pairs(r.get("Moves","")),
+            tutor_moves=to_list(r.get("TutorMoves")),
+            egg_moves=to_list(r.get("EggMoves")),
+            machine_moves=to_list(r.get("MachineMoves") or r.get("TM")),
+            compatibility=to_list(r.get("Compatibility")),
+            steps_to_hatch=_int_or_raw(r, "StepsToHatch"),
+            height=_float_or_raw(r, "Height"),
+            weight=_float_or_raw(r, "Weight"),
+            color=r.get("Color"),
+            shape=r.get("Shape"),
+            habitat=r.get("Habitat"),
+            kind=r.get("Kind"),
+            pokedex=r.get("Pokedex") or r.get("Summary") or r.get("Kind"),
+            generation=r.get("Generation"),
+            evolutions=parse_evos_triples(r.get("Evolutions","")),
+            wild_items=parse_wild_items(r),
+            # battler/meta (kept as-is if present)
+            battler=(r.get("BattlerPlayerX"), r.get("BattlerPlayerY"), r.get("BattlerEnemyX"),
+                     r.get("BattlerEnemyY"), r.get("BattlerShadowX"), r.get("BattlerShadowSize")),
             # keep full raw for future reference
-            "raw": r,
-
+            raw=r,
             # pokedex number
-            "num": e["num"]
-        }
-
-        # cleanup empties
-        if not mon["hiddenAbility"]: mon.pop("hiddenAbility", None)
-        result[internal] = mon
+            num=num,
+        )
 
     return result
 
-def parse_forms_pbs(path: Path, stat_order: List[str]) -> List[Dict[str, Any]]:
+def parse_forms_pbs(path: Path, stat_order: List[str]) -> List[Form]:
     """Parse pokemon_forms.txt (forms-only data, not merged)."""
     if not path or not path.exists():
         return []
-    forms: List[Dict[str, Any]] = []
-    cur: Optional[Dict[str, Any]] = None
-    cur_raw: Optional[Dict[str, Any]] = None
-
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#"): continue
-
-            if line.startswith("["):
-                if cur:
-                    cur["raw"] = cur_raw
-                    forms.append(cur)
-                base, idx = parse_section_header(line)
-                cur = {"baseInternal": base, "formIndex": idx, "overrides": {}}
-                cur_raw = {}
-                continue
-
-            if cur is None: continue
-            k, v = parse_kv_line(line)
-            if not k: continue
-            kl = k.strip().lower()
-            if kl in ("evs","ev","evyield"):
-                cur_raw.setdefault("__EVS__", []).append(v)
-            else:
-                cur_raw[k] = v
-
-    if cur:
-        cur["raw"] = cur_raw
-        forms.append(cur)
-
-    # finalize normalized overrides
-    out: List[Dict[str, Any]] = []
-    for fobj in forms:
-        r = fobj.get("raw", {})
+
+    out: List[Form] = []
+    for base, idx, r, _line in read_sections(path, collect=EV_KEYS, strip_comments=True):
         ov: Dict[str, Any] = {}
 
         # FormName & general
@@ -397,30 +322,46 @@ def parse_forms_pbs(path: Path, stat_order: List[str]) -> List[Dict[str, Any]]:
         # evolutions override
         if "Evolutions" in r: ov["evolutions"] = parse_evos_csv(r["Evolutions"])
 
-        fobj["overrides"] = ov
-        out.append(fobj)
+        out.append(Form(base_internal=base, form_index=idx, overrides=ov, raw=r))
 
     return out
 
-def merge_forms(base_by_internal: Dict[str, Dict[str, Any]],
-                forms: List[Dict[str, Any]],
-                include_cosmetics: bool) -> List[Dict[str, Any]]:
+def form_internal_name(base_internal: str, idx: Optional[int], form_name: str) -> str:
+    """BULBASAUR + 1 -> BULBASAUR_1 (BULBASAUR_<slug of the form name> for unnumbered forms)."""
+    return f"{base_internal}_{idx}" if idx is not None else f"{base_internal}_{slug(form_name) or 'form'}"
 
+def merge_forms(base_by_internal: Dict[str, Species],
+                forms: List[Form],
+                include_cosmetics: bool,
+                delta: bool = False) -> List[Dict[str, Any]]:
+    """
+    Base species followed by one entry per form.
+
+    With delta=True a form entry is not a full copy of its base species: it
+    holds only its identity (id, internalName, name, isForm, baseInternal,
+    formIndex, formName), the fields pokemon_forms.txt overrode,
+    rawFormOverrides and "delta": true. Resolution rule: the full form is
+    {**entry_with_that_baseInternal, **form_entry} (then drop "delta"); this
+    is exactly what delta=False emits. This is where the records become JSON
+    entries (Species.to_json).
+    """
     out: List[Dict[str, Any]] = []
 
     # base species as entries
+    species: Dict[str, Dict[str, Any]] = {}
     for internal, sp in base_by_internal.items():
-        base = dict(sp)  # shallow copy
+        species[internal] = sp.to_json()
+        base = dict(species[internal])  # shallow copy
         base["isForm"] = False
         out.append(base)
 
     # forms as separate entries
     for f in forms:
-        base = base_by_internal.get(f["baseInternal"])
+        base = species.get(f.base_internal)
         if not base:
             continue
-        ov = f.get("overrides", {})
-        form_name = ov.get("formName") or f"Form {f.get('formIndex', 0)}"
+        ov = f.overrides
+        form_name = ov.get("formName") or f"Form {f.form_index}"
 
         if not include_cosmetics and is_cosmetic_form(base["internalName"], form_name):
             continue
@@ -429,12 +370,11 @@ def merge_forms(base_by_internal: Dict[str, Dict[str, Any]],
         display = form_name if contains_base(form_name, base_disp) else f"{base_disp} ({form_name})"
 
         base_internal = base["internalName"]
-        idx = f.get("formIndex")
-        internal_form = f"{base_internal}_{idx}" if idx is not None else f"{base_internal}_{slug(form_name) or 'form'}"
+        idx = f.form_index
+        internal_form = form_internal_name(base_internal, idx, form_name)
 
-        # start from base, apply overrides (replace if present)
+        # identity + overrides; the full entry is the base with these applied
         merged = {
-            **base,
             "id": slug(internal_form),
             "internalName": internal_form,
             "name": display,
@@ -476,14 +416,517 @@ def merge_forms(base_by_internal: Dict[str, Dict[str, Any]],
         apply("evolutions")
 
         # keep raw chunk for the form too
-        merged["rawFormOverrides"] = f.get("raw", {})
+        merged["rawFormOverrides"] = f.raw
+
+        if delta:
+            merged["delta"] = True
+            out.append(merged)
+        else:
+            out.append({**base, **merged})
 
-        out.append(merged)
+    return out
 
+def resolve_form(entry: Dict[str, Any], by_internal: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply the delta resolution rule documented on merge_forms; full entries pass through."""
+    if not entry.get("delta"):
+        return entry
+    full = {**by_internal.get(entry.get("baseInternal"), {}), **entry}
+    full.pop("delta", None)
+    return full
+
+def web_entry(mon: Dict[str, Any]) -> Dict[str, Any]:
+    """Web profile: drop null battler coordinates and other empty/default fields."""
+    if mon.get("delta"):
+        return mon  # an empty override still has to shadow the base value
+    out = dict(mon)
+    battler = drop_defaults(out.get("battler") or {})
+    if battler: out["battler"] = battler
+    else: out.pop("battler", None)
+    return drop_defaults(out)
+
+# ---------- interned string tables ----------
+
+REFS = ("names", "interned")
+STRING_TABLES = ("moves", "abilities", "types", "items")
+# entry field -> table; lists and single names alike (moves and wildItems are handled on their own)
+INTERNED_FIELDS = (("types", "types"), ("abilities", "abilities"), ("hiddenAbility", "abilities"),
+                   ("tutorMoves", "moves"), ("eggMoves", "moves"), ("machineMoves", "moves"),
+                   ("megaStone", "items"))
+
+def strings_path(dest: Path) -> Path:
+    """pokemon.json -> pokemon.strings.json"""
+    dest = Path(dest)
+    return dest.with_name(f"{dest.stem}.strings.json")
+
+def _references(m: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(table, name) for every interned name an entry refers to."""
+    for key, table in INTERNED_FIELDS:
+        v = m.get(key)
+        for name in (v if isinstance(v, list) else [v]):
+            if isinstance(name, str):
+                yield table, name
+    for mv in m.get("moves") or []:
+        yield "moves", mv["move"]
+    for item in (m.get("wildItems") or {}).values():
+        yield "items", item
+
+def string_tables(entries: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Every name the entries refer to, per table, most used first (the common ones get the shortest indexes)."""
+    counts: Dict[str, Dict[str, int]] = {t: {} for t in STRING_TABLES}
+    for m in entries:
+        for table, name in _references(m):
+            counts[table][name] = counts[table].get(name, 0) + 1
+    return {t: sorted(c, key=lambda name: (-c[name], name)) for t, c in counts.items()}
+
+def intern_entry(m: Dict[str, Any], index: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    """
+    An entry with its names replaced by table indexes (index: table -> name ->
+    position in string_tables). Level-up moves become a flat
+    [level, move, level, move, ...] list.
+    """
+    out = dict(m)
+    for key, table in INTERNED_FIELDS:
+        v = out.get(key)
+        if isinstance(v, list):
+            out[key] = [index[table][n] if isinstance(n, str) else n for n in v]
+        elif isinstance(v, str):
+            out[key] = index[table][v]
+    if "moves" in out:
+        out["moves"] = [x for mv in out["moves"] for x in (mv["level"], index["moves"][mv["move"]])]
+    if "wildItems" in out:
+        out["wildItems"] = {slot: index["items"][item] for slot, item in out["wildItems"].items()}
     return out
 
+def expand_entry(m: Dict[str, Any], tables: Dict[str, List[str]]) -> Dict[str, Any]:
+    """intern_entry undone: table indexes back to names."""
+    out = dict(m)
+    for key, table in INTERNED_FIELDS:
+        v = out.get(key)
+        if isinstance(v, list):
+            out[key] = [tables[table][n] if isinstance(n, int) else n for n in v]
+        elif isinstance(v, int):
+            out[key] = tables[table][v]
+    moves = out.get("moves")
+    if moves and isinstance(moves[0], int):
+        out["moves"] = [{"level": moves[i], "move": tables["moves"][moves[i + 1]]} for i in range(0, len(moves), 2)]
+    if "wildItems" in out:
+        out["wildItems"] = {slot: tables["items"][v] if isinstance(v, int) else v
+                            for slot, v in out["wildItems"].items()}
+    return out
+
+def read_entries(path: Path) -> List[Dict[str, Any]]:
+    """A pokemon.json's entries as written, interned names (next to it in pokemon.strings.json) expanded."""
+    path = Path(path)
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    entries = raw if isinstance(raw, list) else list(raw.values())
+    try:
+        tables = json.loads(strings_path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return entries
+    return [expand_entry(m, tables) for m in entries]
+
+# ---------- sharded output ----------
+
+# What the index keeps per entry; every other field goes to the entry's shard.
+INDEX_FIELDS = ("id","internalName","name","types","stats","abilities","hiddenAbility","num",
+                "isForm","baseInternal","formIndex","formName","delta")
+
+def shard_paths(dest: Path) -> Tuple[Path, Path, Path]:
+    """pokemon.json -> (pokemon.index.json, pokemon.shards.json, pokemon/)"""
+    dest = Path(dest)
+    return (dest.with_name(f"{dest.stem}.index.json"),
+            dest.with_name(f"{dest.stem}.shards.json"),
+            dest.with_name(dest.stem))
+
+def write_shards(dest: Path, combined: List[Dict[str, Any]], shard_size: int,
+                 profile: str = "debug") -> int:
+    """
+    Write a light index plus heavy per-species shards next to dest:
+
+      pokemon.index.json   [{id, internalName, name, types, stats, ... form linkage}]
+      pokemon/NNNN.json    {internalName: {moves, raw, pokedex, evolutions, ...}}
+      pokemon.shards.json  {"shardSize": N, "shards": ["pokemon/0000.json", ...],
+                            "byInternal": {internalName: shard number}}
+
+    A species and all of its forms share a shard; shard_size counts species.
+    The full entry is {**index entry, **shard[internalName]}. Returns the shard count.
+    """
+    index_path, manifest_path, shard_dir = shard_paths(dest)
+
+    # group forms with their base species, in output order
+    species: Dict[str, List[Dict[str, Any]]] = {}
+    for m in combined:
+        species.setdefault(m.get("baseInternal") or m["internalName"], []).append(m)
+    groups = list(species.values())
+
+    shard_files: List[str] = []
+    by_internal: Dict[str, int] = {}
+    for n, start in enumerate(range(0, len(groups), shard_size)):
+        shard: Dict[str, Dict[str, Any]] = {}
+        for group in groups[start:start + shard_size]:
+            for m in group:
+                shard[m["internalName"]] = {k: v for k, v in m.items() if k not in INDEX_FIELDS}
+                by_internal[m["internalName"]] = n
+        name = f"{n:04d}.json"
+        write_json(shard_dir / name, shard, profile=profile)
+        shard_files.append(f"{shard_dir.name}/{name}")
+
+    # drop shards left over from an earlier, larger split
+    keep = {Path(f).name for f in shard_files}
+    for old in shard_dir.glob("*.json"):
+        if old.name not in keep:
+            old.unlink()
+
+    # the index keeps pokemon.json's order
+    index = [{k: m[k] for k in INDEX_FIELDS if k in m} for m in combined]
+    write_json(index_path, index, profile=profile)
+    write_json(manifest_path, {"shardSize": shard_size, "shards": shard_files,
+                               "byInternal": by_internal}, profile=profile)
+    return len(shard_files)
+
+# ---------- reverse indexes ----------
+
+WILD_ITEM_SLOTS = {"WildItemCommon": "common", "WildItemUncommon": "uncommon", "WildItemRare": "rare"}
+
+def reverse_path(dest: Path) -> Path:
+    """pokemon.json -> pokemon.reverse.json"""
+    dest = Path(dest)
+    return dest.with_name(f"{dest.stem}.reverse.json")
+
+def chain_roots(families: Dict[str, Any]) -> Dict[str, str]:
+    """internalName -> root of its evolution chain, following prevo (see evolution_families)."""
+    nodes = families["byInternal"]
+    roots = {}
+    for name in nodes:
+        cur, seen = name, set()
+        while "prevo" in nodes.get(cur, {}) and nodes[cur]["prevo"] not in seen:
+            seen.add(cur)
+            cur = nodes[cur]["prevo"]
+        roots[name] = cur
+    return roots
+
+def reverse_indexes(entries: List[Dict[str, Any]], families: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    "Who has X" lookups over full (resolved) entries, in entry order:
+
+      moves      {MOVE: {"levelup": [[internalName, level], ...], "tutor": [...],
+                         "egg": [...], "machine": [...]}}
+      abilities  {ABILITY: {"regular": [...], "hidden": [...]}}
+      wildItems  {ITEM: {"common": [...], "uncommon": [...], "rare": [...]}}
+
+    Egg moves are those of the chain root, as on the client (eggMovesFromRoot);
+    families is evolution_families(entries), computed here when not given.
+    """
+    roots = chain_roots(families or evolution_families(entries))
+    egg_by_internal = {m["internalName"]: m.get("eggMoves") or [] for m in entries}
+    moves: Dict[str, Dict[str, list]] = {}
+    abilities: Dict[str, Dict[str, list]] = {}
+    items: Dict[str, Dict[str, list]] = {}
+
+    def add(index, key, bucket, value):
+        if key:
+            index.setdefault(key, {}).setdefault(bucket, []).append(value)
+
+    for m in entries:
+        name = m["internalName"]
+        for mv in m.get("moves") or []:
+            add(moves, mv.get("move"), "levelup", [name, mv.get("level")])
+        for bucket, key in (("tutor", "tutorMoves"), ("machine", "machineMoves")):
+            for mv in dedupe_keep_order(m.get(key) or []):
+                add(moves, mv, bucket, name)
+        for mv in dedupe_keep_order(egg_by_internal.get(roots[name]) or []):
+            add(moves, mv, "egg", name)
+        for ab in dedupe_keep_order(m.get("abilities") or []):
+            add(abilities, ab, "regular", name)
+        add(abilities, m.get("hiddenAbility"), "hidden", name)
+        for slot, item in (m.get("wildItems") or {}).items():
+            add(items, item, WILD_ITEM_SLOTS.get(slot, slot), name)
+
+    return {"moves": moves, "abilities": abilities, "wildItems": items}
+
+# ---------- evolution families ----------
+
+def evolutions_path(dest: Path) -> Path:
+    """pokemon.json -> pokemon.evolutions.json"""
+    dest = Path(dest)
+    return dest.with_name(f"{dest.stem}.evolutions.json")
+
+def evolution_edges(entries: List[Dict[str, Any]]) -> List[Tuple[str, str, str, str]]:
+    """
+    (from, to, method, param) for every evolution between two entries, in
+    entry order. Evolutions a form sets itself (pokemon_forms.txt) lead to
+    the same-numbered form of the target when there is one (RATTATA_1 ->
+    RATICATE_1); forms that only inherit their species' evolutions add none.
+    """
+    known = {m["internalName"] for m in entries}
+    edges = []
+    for m in entries:
+        name = m["internalName"]
+        idx = m.get("formIndex")
+        if m.get("isForm") and "Evolutions" not in (m.get("rawFormOverrides") or {}):
+            continue
+        for ev in m.get("evolutions") or []:
+            to = ev.get("to")
+            if m.get("isForm") and idx is not None and form_internal_name(to, idx, "") in known:
+                to = form_internal_name(to, idx, "")
+            if to in known and to != name:
+                edges.append((name, to, ev.get("method"), ev.get("param")))
+    return edges
+
+def layer_stages(starts: List[str], children: Dict[str, List[str]]) -> Tuple[List[List[str]], Set[str]]:
+    """Breadth-first layers from starts (stage 0) over children, and every name reached."""
+    stages, seen, layer = [], set(starts), list(starts)
+    while layer:
+        stages.append(layer)
+        nxt = []
+        for n in layer:
+            for c in children.get(n, ()):
+                if c not in seen:
+                    seen.add(c)
+                    nxt.append(c)
+        layer = nxt
+    return stages, seen
+
+def evolution_families(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The evolution graph of full (resolved) entries, built once:
+
+      families    {familyId: {"stages": [[internalName, ...], ...],
+                              "edges": [[from, to, method, param], ...]}}
+      byInternal  {internalName: {"family": familyId, "stage": n, "prevo": internalName}}
+
+    A family is a connected part of the graph (see evolution_edges) and is
+    named after its first member without a pre-evolution, in entry order.
+    stages layers it breadth-first from those members (stage 0), so a
+    branching line has several names in one stage. prevo is the first parent
+    seen, as the client's attachPrevos picks it, and is left out for stage 0.
+    A form with no evolutions of its own (a mega, a cosmetic form) is placed
+    with its base species: same family, stage and prevo, but not in stages.
+    """
+    edges = evolution_edges(entries)
+    order = {m["internalName"]: i for i, m in enumerate(entries)}
+
+    prevo: Dict[str, str] = {}
+    children: Dict[str, List[str]] = {}
+    group = {name: name for name in order}  # union-find over the edges, smallest entry index on top
+
+    def find(name: str) -> str:
+        while group[name] != name:
+            group[name] = group[group[name]]
+            name = group[name]
+        return name
+
+    for frm, to, _method, _param in edges:
+        prevo.setdefault(to, frm)
+        children.setdefault(frm, []).append(to)
+        a, b = sorted((find(frm), find(to)), key=order.__getitem__)
+        group[b] = a
+
+    members: Dict[str, List[str]] = {}
+    for name in order:
+        members.setdefault(find(name), []).append(name)
+    edges_of: Dict[str, List[list]] = {}
+    for e in edges:
+        edges_of.setdefault(find(e[0]), []).append(list(e))
+
+    families: Dict[str, Dict[str, Any]] = {}
+    nodes: Dict[str, Dict[str, Any]] = {}
+    joins = []  # edgeless forms, placed once their base is
+    for top, names in members.items():
+        if len(names) == 1 and top not in edges_of and entries[order[top]].get("isForm"):
+            joins.append(top)
+            continue
+        starts = [n for n in names if n not in prevo]
+        while True:
+            # a cycle has no natural start: seed it with its first member
+            stages, seen = layer_stages(starts or names[:1], children)
+            rest = [n for n in names if n not in seen]
+            if not rest:
+                break
+            starts.append(rest[0])
+        family = stages[0][0]
+        families[family] = {"stages": stages, "edges": edges_of.get(top, [])}
+        for stage, layer in enumerate(stages):
+            for n in layer:
+                nodes[n] = {"family": family, "stage": stage}
+                if n in prevo:
+                    nodes[n]["prevo"] = prevo[n]
+
+    for name in joins:
+        base = entries[order[name]].get("baseInternal")
+        if base in nodes:
+            nodes[name] = dict(nodes[base])
+        else:  # base excluded or missing: a family of its own
+            families[name] = {"stages": [[name]], "edges": []}
+            nodes[name] = {"family": name, "stage": 0}
+
+    return {"families": families, "byInternal": {n: nodes[n] for n in order}}
+
+# ---------- binary stats table ----------
+
+# (column, dtype) in file order: 16-bit columns first keeps every column aligned
+STATS_COLUMNS = (("hp", "int16"), ("atk", "int16"), ("def", "int16"), ("spa", "int16"),
+                 ("spd", "int16"), ("spe", "int16"), ("bst", "int16"), ("num", "uint16"),
+                 ("type1", "uint8"), ("type2", "uint8"), ("catchRate", "uint8"))
+DTYPES = {"int16": ("h", -32768, 32767), "uint16": ("H", 0, 65535), "uint8": ("B", 0, 255)}
+NO_TYPE = 255  # type1/type2 value for "no such type"
+
+def stats_paths(dest: Path) -> Tuple[Path, Path]:
+    """pokemon.json -> (pokemon.stats.json header, pokemon.stats.bin columns)"""
+    dest = Path(dest)
+    return dest.with_name(f"{dest.stem}.stats.json"), dest.with_name(f"{dest.stem}.stats.bin")
+
+def load_type_index(path: Path) -> Dict[str, int]:
+    """Type id -> index, from a types.json or (parsed) types.txt."""
+    path = Path(path)
+    if path.suffix != ".json":
+        from types_to_json import parse_types_txt
+        return {t: int(v.index) for t, v in parse_types_txt(path).items()}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {t: int(v.get("index", 0)) for t, v in data.items()}
+
+def stats_table(entries: List[Dict[str, Any]], type_index: Dict[str, int]) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Columnar little-endian table of full (resolved) entries, one row each in
+    entry order: column c holds rows values of its dtype starting at
+    header["columns"][i]["offset"]. type1/type2 are types.json indexes
+    (NO_TYPE when missing), header["types"][index] maps them back to ids.
+    A value outside its column's dtype is clamped into it, with a warning.
+    """
+    cols = {name: array(DTYPES[dt][0]) for name, dt in STATS_COLUMNS}
+    for m in entries:
+        st = m.get("stats") or {}
+        types = [type_index.get(t, NO_TYPE) for t in (m.get("types") or [])[:2]]
+        types += [NO_TYPE] * (2 - len(types))
+        catch = m.get("catchRate")
+        row = {k: int(st.get(k, 0) or 0) for k in ("hp", "atk", "def", "spa", "spd", "spe")}
+        row.update(bst=sum(row.values()), num=int(m.get("num") or 0), type1=types[0], type2=types[1],
+                   catchRate=catch if isinstance(catch, int) else 0)
+        for name, dt in STATS_COLUMNS:
+            _code, lo, hi = DTYPES[dt]
+            if not lo <= row[name] <= hi:
+                # one odd fan-game entry must not fail the whole build: pokemon.json keeps the real value
+                clamped = min(max(row[name], lo), hi)
+                print(f"WARN: {m['internalName']}: {name}={row[name]} does not fit {dt}, "
+                      f"stored as {clamped} in the stats table", file=sys.stderr)
+                row[name] = clamped
+            cols[name].append(row[name])
+
+    header_cols, chunks, offset = [], [], 0
+    for name, dt in STATS_COLUMNS:
+        col = cols[name]
+        if sys.byteorder == "big":
+            col.byteswap()
+        chunks.append(col.tobytes())
+        header_cols.append({"name": name, "type": dt, "offset": offset})
+        offset += len(chunks[-1])
+
+    by_index: List[Optional[str]] = [None] * (max(type_index.values(), default=-1) + 1)
+    for t, i in type_index.items():
+        by_index[i] = t
+    header = {
+        "version": 1,
+        "rows": len(entries),
+        "littleEndian": True,
+        "bytes": offset,
+        "columns": header_cols,
+        "types": by_index,
+        "noType": NO_TYPE,
+        "order": [m["internalName"] for m in entries],
+    }
+    return header, b"".join(chunks)
+
+def write_stats_table(dest: Path, entries: List[Dict[str, Any]], types: Path, profile: str = "debug") -> None:
+    header_path, bin_path = stats_paths(dest)
+    with timings.phase("derive"):
+        header, blob = stats_table(entries, load_type_index(types))
+    header["file"] = bin_path.name
+    write_bytes_atomic(bin_path, blob)
+    write_json(header_path, header, profile=profile)
+
 # ---------- main ----------
 
+def build_entries(src: Path, forms: Optional[Path] = None,
+                  stat_order: str = "hp,atk,def,spe,spa,spd",
+                  include_cosmetics: bool = True, delta: bool = False) -> List[Dict[str, Any]]:
+    """Parse pokemon.txt (+ optional pokemon_forms.txt) into the merged entry list."""
+    order = parse_stat_order(stat_order)
+    forms_path = Path(forms) if forms else None
+    with timings.phase("normalize"):
+        base = parse_pokemon_pbs(Path(src), order)
+        form_objs = parse_forms_pbs(forms_path, order) if (forms_path and forms_path.exists()) else []
+    timings.count("species", len(base))
+    timings.count("forms", len(form_objs))
+    with timings.phase("merge"):
+        return merge_forms(base, form_objs, include_cosmetics, delta=delta)
+
+def convert(src: Path, dest: Path, forms: Optional[Path] = None,
+            stat_order: str = "hp,atk,def,spe,spa,spd",
+            include_cosmetics: bool = True, profile: str = "debug",
+            forms_mode: str = "full", shard_size: int = 0,
+            types: Optional[Path] = None, fmt: str = "json", refs: str = "names") -> int:
+    """
+    Parse pokemon.txt (+ optional pokemon_forms.txt) and write dest plus the
+    reverse indexes (pokemon.reverse.json, see reverse_indexes) and the
+    evolution graph (pokemon.evolutions.json, see evolution_families); with
+    shard_size > 0 also write the index/shards described on write_shards,
+    and given types (types.txt or types.json) the binary stats table
+    (pokemon.stats.json + .bin, see stats_table). dest is streamed entry by
+    entry (fmt "ndjson": one per line). With refs "interned" the entries (and
+    shards) refer to moves, abilities, types and items by index into the
+    tables in pokemon.strings.json (see intern_entry). Returns the entry count.
+    """
+    combined = build_entries(src, forms, stat_order, include_cosmetics, delta=(forms_mode == "delta"))
+    timings.count("entries", len(combined))
+    with timings.phase("merge"):
+        by_internal = {m["internalName"]: m for m in combined if not m.get("delta")}
+        full = [resolve_form(m, by_internal) for m in combined]
+    with timings.phase("derive"):
+        families = evolution_families(full)
+        reverse = reverse_indexes(full, families)
+    write_json(reverse_path(dest), reverse, profile=profile)
+    write_json(evolutions_path(dest), families, profile=profile)
+    if types:
+        write_stats_table(dest, full, Path(types), profile=profile)
+    index: Optional[Dict[str, Dict[str, int]]] = None
+    if refs == "interned":
+        with timings.phase("derive"):
+            tables = string_tables(combined)
+        index = {t: {name: i for i, name in enumerate(names)} for t, names in tables.items()}
+        write_json(strings_path(dest), tables, profile=profile)
+    else:
+        strings_path(dest).unlink(missing_ok=True)  # a stale table must not outlive the entries it indexed
+
+    def output(m: Dict[str, Any]) -> Dict[str, Any]:
+        m = web_entry(m) if profile == "web" else m
+        return intern_entry(m, index) if index else m
+
+    if profile == "web" or index:
+        write_entries(dest, timings.wrap(map(output, combined), "normalize"), profile=profile, fmt=fmt)
+    else:
+        write_entries(dest, combined, profile=profile, fmt=fmt)
+    if shard_size > 0:
+        write_shards(dest, [output(m) for m in combined], shard_size, profile=profile)
+    return len(combined)
+
+def forms_size_report(src: Path, forms: Optional[Path] = None,
+                      stat_order: str = "hp,atk,def,spe,spa,spd",
+                      include_cosmetics: bool = True) -> Dict[str, Dict[str, int]]:
+    """Serialized size in bytes of pokemon.json in full vs delta forms mode, per profile."""
+    order = parse_stat_order(stat_order)
+    forms_path = Path(forms) if forms else None
+    base = parse_pokemon_pbs(Path(src), order)
+    form_objs = parse_forms_pbs(forms_path, order) if (forms_path and forms_path.exists()) else []
+
+    report: Dict[str, Dict[str, int]] = {}
+    for mode in ("full", "delta"):
+        combined = merge_forms(base, form_objs, include_cosmetics, delta=(mode == "delta"))
+        report[mode] = {
+            "debug": len(dumps(combined, "debug").encode("utf-8")),
+            "web": len(dumps([web_entry(m) for m in combined], "web").encode("utf-8")),
+        }
+    return report
+
 def main():
     ap = argparse.ArgumentParser(description="Convert PBS pokemon + forms to a single JSON for PBSDex (full data).")
     ap.add_argument("src", help="Path to pokemon.txt")
@@ -495,26 +938,54 @@ def main():
                     help="Include cosmetic forms like Unown and Cosplay Pikachu (default: on).")
     ap.add_argument("--exclude-cosmetics", action="store_true",
                     help="Exclude cosmetic forms.")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified, default fields dropped")
+    ap.add_argument("--format", choices=FORMATS, default="json",
+                    help="json (default); ndjson: one entry per line")
+    ap.add_argument("--forms-mode", choices=("full", "delta"), default="full",
+                    help="full: forms are complete copies (default); delta: forms hold only their overrides")
+    ap.add_argument("--shard-size", type=int, default=0,
+                    help="Also write pokemon.index.json + per-species shards, N species per shard (default: off)")
+    ap.add_argument("--types", default=None,
+                    help="types.txt or types.json; also write the binary stats table pokemon.stats.json/.bin")
+    ap.add_argument("--refs", choices=REFS, default="names",
+                    help="names: moves/abilities/types/items by name (default); "
+                         "interned: by index into pokemon.strings.json, level-up moves as flat [level, move, ...]")
+    ap.add_argument("--size-report", action="store_true",
+                    help="Also print the output size in full vs delta forms mode")
+    timings.add_arguments(ap)
     args = ap.parse_args()
 
     src = Path(args.src)
-    forms_path = Path(args.forms) if args.forms else None
     dest = Path(args.dest)
     if not src.exists():
         print(f"ERROR: Input file not found: {src}", file=sys.stderr)
         sys.exit(1)
 
-    stat_order = parse_stat_order(args.stat_order)
-    base = parse_pokemon_pbs(src, stat_order)
-    form_objs = parse_forms_pbs(forms_path, stat_order) if (forms_path and forms_path.exists()) else []
-
-    include_cosmetics = not args.exclude_cosmetics
-
-    combined = merge_forms(base, form_objs, include_cosmetics)
-
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(json.dumps(combined, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Wrote {len(combined)} entries to {dest}")
+    n = timings.run(args, convert, src, dest, forms=args.forms, stat_order=args.stat_order,
+                    include_cosmetics=not args.exclude_cosmetics, profile=args.profile,
+                    forms_mode=args.forms_mode, shard_size=args.shard_size, types=args.types,
+                    fmt=args.format, refs=args.refs)
+    print(f"Wrote {n} entries to {dest}, {reverse_path(dest).name} and {evolutions_path(dest).name}")
+    if args.refs == "interned":
+        print(f"Wrote {strings_path(dest).name}")
+    if args.types:
+        header_path, bin_path = stats_paths(dest)
+        print(f"Wrote {header_path.name} + {bin_path.name} ({bin_path.stat().st_size:,} bytes)")
+    if args.shard_size > 0:
+        index_path, manifest_path, shard_dir = shard_paths(dest)
+        shards = len(list(shard_dir.glob("*.json")))
+        print(f"Wrote {index_path.name}, {manifest_path.name} and {shards} shard(s) in {shard_dir}")
+
+    if args.size_report:
+        report = forms_size_report(src, forms=args.forms, stat_order=args.stat_order,
+                                   include_cosmetics=not args.exclude_cosmetics)
+        print(f"{'forms mode':<12}{'debug':>12}{'web':>12}")
+        for mode, sizes in report.items():
+            print(f"{mode:<12}{sizes['debug']:>12,}{sizes['web']:>12,}")
+        for prof in PROFILES:
+            full, delta = report["full"][prof], report["delta"][prof]
+            print(f"delta saves {full - delta:,} bytes ({(full - delta) / full:.0%}) with --profile {prof}")
 
 if __name__ == "__main__":
     main()
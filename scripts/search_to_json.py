@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build a game's search.json (the header search box index) from its generated
+pokemon/moves/abilities/types/encounters JSON. The client fetches it on the
+first use of the search box and answers from an index built in the browser
+(same entries, same keys) until it has arrived.
+
+Usage:
+  python scripts/search_to_json.py <game_dir> [<output search.json>] [--profile web]
+
+The JSON shape is:
+{
+  "version": 1,
+  "entries": [
+    {"kind": "mon", "id": "bulbasaur", "label": "Bulbasaur", "sub": "GRASS • POISON",
+     "search": "bulbasaur", "route": "#/mon/bulbasaur", "internal": "BULBASAUR"},
+    ...
+  ],
+  "grams": {"bul": [0, 412, 3], ...}
+}
+
+entries follow the order of buildSearchIndex (mons, moves, abilities, types,
+locations) and "search" is make_search_key(label), a port of makeSearchKey in
+src/scripts/ui/suggest.ts: accents stripped, dashes to spaces, lower case,
+standalone roman numerals and number words (up to 99) turned into digits.
+
+grams maps every 1-, 2- and 3-character substring of a search key to the
+entries containing it, as ascending entry indexes stored as gaps (first index,
+then the difference to the previous one). A query of up to 3 characters is
+answered by its own posting list; a longer one by intersecting the lists of
+its trigrams and then checking the candidates with indexOf.
+"""
+import argparse, json, re, sys, unicodedata
+from urllib.parse import quote
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from outputs import PROFILES, write_json
+from pokemon_to_json import read_entries
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 1
+
+GRAM_MAX = 3
+
+# characters encodeURIComponent leaves alone (routes match the client's hashes)
+URI_SAFE = "-_.!~*'()"
+
+# ---------- normalization (keep in sync with makeSearchKey in ui/suggest.ts) ----------
+
+ACCENT_RE = re.compile("[\u0300-\u036f]")
+DASH_RE = re.compile("[-\u2013\u2014]")
+ROMAN_RE = re.compile(r"\b[mcdlxvi]+\b", re.I | re.A)
+SPACE_RE = re.compile(r"\s+")
+HYPHEN_PAIR_RE = re.compile(r"^([a-z]+)-([a-z]+)$", re.I)
+
+ROMAN = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100, "d": 500, "m": 1000}
+ONES = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90}
+
+def roman_to_int(s: str) -> int:
+    n = prev = 0
+    for ch in reversed(s.lower()):
+        v = ROMAN.get(ch, 0)
+        n += -v if v < prev else v
+        prev = v
+    return n
+
+def words_to_digits(s: str) -> str:
+    tok = SPACE_RE.split(s)
+    out: List[str] = []
+    i = 0
+    while i < len(tok):
+        t = tok[i]
+        if t in ONES:
+            out.append(str(ONES[t]))
+        elif t in TENS:
+            val = TENS[t]
+            nxt = tok[i + 1] if i + 1 < len(tok) else ""
+            if nxt in ONES:
+                val += ONES[nxt]
+                i += 1
+            out.append(str(val))
+        else:
+            m = HYPHEN_PAIR_RE.match(t)
+            if m and m.group(1).lower() in TENS and m.group(2).lower() in ONES:
+                out.append(str(TENS[m.group(1).lower()] + ONES[m.group(2).lower()]))
+            else:
+                out.append(t)
+        i += 1
+    return " ".join(out)
+
+def make_search_key(s: Optional[str]) -> str:
+    if not s:
+        return ""
+    s = ACCENT_RE.sub("", unicodedata.normalize("NFD", s))
+    s = DASH_RE.sub(" ", s).lower()
+    s = ROMAN_RE.sub(lambda m: str(n) if (n := roman_to_int(m.group(0))) else m.group(0).lower(), s)
+    return SPACE_RE.sub(" ", words_to_digits(s)).strip()
+
+# ---------- entries ----------
+
+def _load(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+def _items(data: Any) -> Iterable:
+    return data.items() if isinstance(data, dict) else ()
+
+def entry(kind: str, id_: str, label: str, sub: str = "", **extra) -> Dict[str, Any]:
+    e = {"kind": kind, "id": id_, "label": label, "sub": sub, "search": make_search_key(label),
+         "route": f"#/{kind}/{quote(id_, safe=URI_SAFE)}", **extra}
+    if not sub:
+        del e["sub"]
+    return e
+
+def build_entries(game_dir: Path) -> List[Dict[str, Any]]:
+    """Search entries for one game, in buildSearchIndex order."""
+    out: List[Dict[str, Any]] = []
+
+    mons = read_entries(game_dir / "pokemon.json") if (game_dir / "pokemon.json").exists() else []
+    by_internal = {m.get("internalName"): m for m in mons if not m.get("delta")}
+    for m in mons:
+        if m.get("delta"):  # delta forms keep the base species' fields they don't override
+            m = {**by_internal.get(m.get("baseInternal"), {}), **m}
+        name = m.get("name") or m.get("internalName") or m.get("id")
+        out.append(entry("mon", m.get("id"), name, " • ".join(t for t in m.get("types") or [] if t),
+                         internal=m.get("internalName")))
+
+    for mid, mv in _items(_load(game_dir / "moves.json")):
+        sub = " • ".join(x for x in (mv.get("type"), mv.get("category")) if x)
+        out.append(entry("move", mid, mv.get("name") or mid, sub))
+
+    for aid, a in _items(_load(game_dir / "abilities.json")):
+        out.append(entry("ability", aid, a.get("name") or aid, a.get("description") or ""))
+
+    for tid, t in _items(_load(game_dir / "types.json")):
+        out.append(entry("type", tid, (t or {}).get("name") or tid))
+
+    for lid, loc in _items(_load(game_dir / "encounters.json")):
+        name = ((loc or {}).get("name") or f"#{lid}").strip()
+        out.append(entry("loc", lid, name, ", ".join((loc or {}).get("encounters") or {})))
+    return out
+
+def gram_postings(keys: List[str], n: int = GRAM_MAX) -> Dict[str, List[int]]:
+    """Every 1..n character substring -> gap-encoded ascending indexes of the keys holding it."""
+    postings: Dict[str, List[int]] = {}
+    for i, key in enumerate(keys):
+        grams = {key[j:j + k] for k in range(1, n + 1) for j in range(len(key) - k + 1)}
+        for g in grams:
+            postings.setdefault(g, []).append(i)
+    out = {}
+    for g in sorted(postings):
+        ids, prev, gaps = postings[g], 0, []
+        for i in ids:
+            gaps.append(i - prev)
+            prev = i
+        out[g] = gaps
+    return out
+
+def convert(src: Path, dest: Optional[Path] = None, profile: str = "debug") -> int:
+    """Write <game_dir>/search.json (or dest); returns the number of entries."""
+    src = Path(src)
+    if not src.is_dir():
+        raise FileNotFoundError(f"game folder not found: {src}")
+    entries = build_entries(src)
+    data = {
+        "version": 1,
+        "entries": entries,
+        "grams": gram_postings([e["search"] for e in entries]),
+    }
+    write_json(Path(dest) if dest else src / "search.json", data, trailing_newline=True, profile=profile)
+    return len(entries)
+
+def main():
+    ap = argparse.ArgumentParser(description="Build search.json from a game's generated JSON files.")
+    ap.add_argument("game_dir", help="Game data folder holding pokemon.json, moves.json, ...")
+    ap.add_argument("output", nargs="?", default=None, help="Output path (default: <game_dir>/search.json)")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty, every field kept (default); web: minified, default-valued fields dropped")
+    args = ap.parse_args()
+
+    try:
+        n = convert(Path(args.game_dir), Path(args.output) if args.output else None, profile=args.profile)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {n} search entries to {args.output or Path(args.game_dir) / 'search.json'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build a game's sprites.json: which sprite files exist for every pokemon.json
+entry, per variant folder, with their pixel size.
+
+Usage:
+  python scripts/sprites_to_json.py <images/game dir> <pokemon.json> [<output sprites.json>]
+                                    [--base images/ss2/] [--workers N] [--profile web]
+
+The JSON shape is:
+{
+  "version": 1,
+  "base": "images/ss2/",
+  "variants": ["front", "back", "front shiny", "back shiny", "icons"],
+  "sprites": {
+    "BULBASAUR": {"front": ["BULBASAUR.png", 160, 160], "icons": ["BULBASAUR.png", 128, 64], ...},
+    "UNOWN_5": {}
+  }
+}
+
+Every entry is listed: a variant missing from its object has no file, so the
+client can skip the request instead of waiting for a 404. A sprite's URL is
+base + variant + "/" + file. Files are matched by trying, in order, the same
+names as monNameCandidates in src/scripts/util/assets.ts (internal name, id,
+BASE_<index>, BASE_<form slug>, then the base species), each as .png and .PNG,
+against the exact (case-sensitive) folder listing.
+
+Sizes come from the PNG IHDR chunk (the first 24 bytes of the file), so
+nothing is decoded; the headers are read on a thread pool. Files that are
+not PNGs are left out.
+"""
+import argparse, os, struct, sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from outputs import PROFILES, write_json
+from pokemon_to_json import read_entries, slug
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 1
+
+# Known variant folders in display order; any other folder follows, sorted
+VARIANTS = ("front", "back", "front shiny", "back shiny", "icons")
+EXTS = ("png", "PNG")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IHDR = struct.Struct(">4sII")  # chunk type, width, height (after the 4-byte chunk length)
+
+# ---------- scanning ----------
+
+def png_size(path: str) -> Optional[Tuple[int, int]]:
+    """(width, height) from a PNG's IHDR chunk, or None for anything that isn't a PNG."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(24)
+    except OSError:
+        return None
+    if len(head) < 24 or head[:8] != PNG_SIGNATURE:
+        return None
+    kind, width, height = IHDR.unpack_from(head, 12)
+    return (width, height) if kind == b"IHDR" else None
+
+def variant_dirs(images: Path) -> List[str]:
+    """The sprite folders of a game's image folder, known variants first."""
+    found = sorted(e.name for e in os.scandir(images) if e.is_dir())
+    return [v for v in VARIANTS if v in found] + [v for v in found if v not in VARIANTS]
+
+def scan(images: Path, workers: Optional[int] = None) -> Dict[str, Dict[str, Tuple[int, int]]]:
+    """variant -> file name -> (width, height), for every PNG directly in each variant folder."""
+    out: Dict[str, Dict[str, Tuple[int, int]]] = {v: {} for v in variant_dirs(images)}
+    files = [(v, e.name) for v in out for e in os.scandir(images / v) if e.is_file()]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        sizes = pool.map(png_size, (os.path.join(images, v, name) for v, name in files))
+        for (v, name), size in zip(files, sizes):
+            if size:
+                out[v][name] = size
+    return out
+
+# ---------- matching ----------
+
+def name_candidates(m: Dict[str, Any]) -> List[str]:
+    """File name stems to try for an entry, in monNameCandidates order."""
+    names: List[str] = []
+    def push(s):
+        if s and s not in names:
+            names.append(s)
+
+    internal, id_ = m.get("internalName") or "", m.get("id") or ""
+    for s in (internal, internal.upper(), internal.lower(), id_, id_.upper()):
+        push(s)
+    base = m.get("baseInternal")
+    if m.get("isForm") and base:
+        idx = m.get("formIndex")
+        if isinstance(idx, int):
+            for s in (f"{base}_{idx}", f"{base.upper()}_{idx}", f"{base.lower()}_{idx}"):
+                push(s)
+        sf = slug(m.get("formName") or "")
+        if sf:
+            for s in (f"{base}_{sf}", f"{base.upper()}_{sf.upper()}", f"{base.lower()}_{sf.lower()}"):
+                push(s)
+        # some packs re-use the base sprite for a form
+        for s in (base, base.upper(), base.lower()):
+            push(s)
+    return names
+
+def match(m: Dict[str, Any], found: Dict[str, Dict[str, Tuple[int, int]]]) -> Dict[str, list]:
+    """variant -> [file, width, height] of the first candidate that exists, per variant."""
+    files = [f"{name}.{ext}" for name in name_candidates(m) for ext in EXTS]
+    out = {}
+    for v, sizes in found.items():
+        hit = next((f for f in files if f in sizes), None)
+        if hit:
+            out[v] = [hit, *sizes[hit]]
+    return out
+
+# ---------- main ----------
+
+def convert(src: Path, pokemon: Path, dest: Path, base: Optional[str] = None,
+            profile: str = "debug", workers: Optional[int] = None) -> int:
+    """Write sprites.json for a game's image folder (src) and its pokemon.json; returns the entry count."""
+    src = Path(src)
+    if not src.is_dir():
+        raise FileNotFoundError(f"image folder not found: {src}")
+    found = scan(src, workers)
+    entries = read_entries(Path(pokemon))
+    data = {
+        "version": 1,
+        "base": base if base is not None else f"images/{src.name}/",
+        "variants": list(found),
+        "sprites": {m["internalName"]: match(m, found) for m in entries},
+    }
+    write_json(Path(dest), data, trailing_newline=True, profile=profile)
+    return len(entries)
+
+def main():
+    ap = argparse.ArgumentParser(description="List the sprite files (and their sizes) of every pokemon.json entry.")
+    ap.add_argument("images", help="The game's image folder, e.g. public/images/ss2")
+    ap.add_argument("pokemon", help="The game's generated pokemon.json")
+    ap.add_argument("output", nargs="?", default=None,
+                    help="Output path (default: sprites.json next to pokemon.json)")
+    ap.add_argument("--base", default=None,
+                    help="URL prefix of the image folder, relative to the site root (default: images/<folder name>/)")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Threads reading PNG headers (default: Python's ThreadPoolExecutor default)")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified")
+    args = ap.parse_args()
+
+    dest = Path(args.output) if args.output else Path(args.pokemon).with_name("sprites.json")
+    try:
+        n = convert(Path(args.images), Path(args.pokemon), dest, base=args.base,
+                    profile=args.profile, workers=args.workers)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote sprites for {n} entries to {dest}")
+
+if __name__ == "__main__":
+    main()
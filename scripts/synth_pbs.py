@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write a synthetic (but syntactically valid) PBS game of any size, to see where
+the converters stop scaling before a real fan game gets there.
+
+Usage:
+  python scripts/synth_pbs.py <out_dir> [--species 50000] [--forms 5000] [--moves 20000]
+                              [--items 5000] [--abilities 1000] [--types 18] [--maps 5000]
+                              [--seed 1] [--numbered]
+
+Writes pokemon.txt, pokemon_forms.txt, moves.txt, items.txt, abilities.txt,
+types.txt and encounters.txt into out_dir, covering the variants the parsers
+have to handle:
+
+  pokemon.txt          alternating "EffortPoints = ..." and ss2-style repeated
+                       "EVs = STAT,N" lines; "[NAME]" sections, or with
+                       --numbered "[N]" + InternalName/Type1/Type2/Rareness
+  pokemon_forms.txt    "[BASE,N]" sections overriding stats/types/abilities
+  types.txt            "[N]" sections with InternalName and matchup lists
+  encounters.txt       "[NNN] # Map name" sections, "Land,10"-style blocks
+                       with 4-field rows and name-only blocks with 3-field rows
+
+The same --seed and sizes always give the same files. Run the benchmarks on
+the result with:  python scripts/bench.py --data-dir <parent> --games <name>
+"""
+import argparse, random, sys
+from pathlib import Path
+from typing import List, TextIO
+
+SEP = "#-------------------------------\n"
+SYLLABLES = ("ka", "ro", "mi", "zu", "ne", "ta", "shi", "vo", "ra", "lu", "po", "gen",
+             "dra", "fel", "bo", "chi", "wyn", "qua", "tor", "xel", "ny", "sa", "pum", "kle",
+             "or", "bi", "mo", "ul", "fae", "go", "ith", "ver")
+STATS = ("HP", "ATTACK", "DEFENSE", "SPECIAL_ATTACK", "SPECIAL_DEFENSE", "SPEED")
+BASE_TYPES = ("NORMAL", "FIGHTING", "FLYING", "POISON", "GROUND", "ROCK", "BUG", "GHOST", "STEEL",
+              "FIRE", "WATER", "GRASS", "ELECTRIC", "PSYCHIC", "ICE", "DRAGON", "DARK", "FAIRY")
+CATEGORIES = ("Physical", "Special", "Status")
+TARGETS = ("NearOther", "AllNearFoes", "User", "NearAlly", "AllBattlers")
+MOVE_FLAGS = ("Contact", "CanProtect", "CanMirrorMove", "Sound", "Punching", "Biting")
+BLOCKS_4 = ("Land", "LandMorning", "LandNight", "Cave", "Water")
+BLOCKS_3 = ("OldRod", "GoodRod", "SuperRod", "RockSmash", "HeadbuttLow")
+
+def word(i: int, min_len: int = 2) -> str:
+    """A unique pronounceable word per i (i written in base len(SYLLABLES))."""
+    parts = []
+    while i or len(parts) < min_len:
+        i, r = divmod(i, len(SYLLABLES))
+        parts.append(SYLLABLES[r])
+    return "".join(reversed(parts))
+
+def internal(name: str) -> str:
+    return "".join(c for c in name.upper() if c.isalnum())
+
+def sentence(rng: random.Random, n: int = 12) -> str:
+    words = [word(rng.randrange(2000), 1) for _ in range(n)]
+    return " ".join(words).capitalize() + "."
+
+# ---------- writers ----------
+
+def type_ids(n: int) -> List[str]:
+    return [BASE_TYPES[i] if i < len(BASE_TYPES) else f"TYPE{i}" for i in range(n)]
+
+def write_types(f: TextIO, rng: random.Random, types: List[str]) -> None:
+    f.write("\ufeff")
+    for i, t in enumerate(types):
+        f.write(f"[{i}]\nName={t.capitalize()}\nInternalName={t}\n")
+        for key in ("Weaknesses", "Resistances", "Immunities"):
+            picks = rng.sample(types, rng.randrange(0, min(4, len(types)) + 1) if key != "Immunities"
+                               else rng.choice((0, 0, 0, 1)))
+            if picks:
+                f.write(f"{key}={','.join(picks)}\n")
+        if rng.random() < 0.5:
+            f.write("IsSpecialType=true\n")
+        f.write("#------------------------------------\n")
+
+def write_abilities(f: TextIO, rng: random.Random, abilities: List[str]) -> None:
+    f.write("# Synthetic abilities\n" + SEP)
+    for a in abilities:
+        f.write(f"[{a}]\nName = {a.capitalize()}\nDescription = {sentence(rng)}\n" + SEP)
+
+def write_moves(f: TextIO, rng: random.Random, moves: List[str], types: List[str]) -> None:
+    f.write("\ufeff# Synthetic moves\n" + SEP)
+    for m in moves:
+        cat = rng.choice(CATEGORIES)
+        f.write(f"[{m}]\nName = {m.capitalize()}\nType = {rng.choice(types)}\nCategory = {cat}\n")
+        if cat != "Status":
+            f.write(f"Power = {rng.randrange(10, 151, 5)}\n")
+        f.write(f"Accuracy = {rng.choice((0, 70, 85, 90, 95, 100, 100))}\nTotalPP = {rng.choice((5, 10, 15, 20, 35))}\n"
+                f"Target = {rng.choice(TARGETS)}\nFunctionCode = None\n")
+        flags = rng.sample(MOVE_FLAGS, rng.randrange(0, 4))
+        if flags:
+            f.write(f"Flags = {','.join(flags)}\n")
+        if rng.random() < 0.3:
+            f.write(f"EffectChance = {rng.choice((10, 20, 30, 100))}\n")
+        f.write(f"Description = {sentence(rng)}\n" + SEP)
+
+def write_items(f: TextIO, rng: random.Random, items: List[str]) -> None:
+    f.write("\ufeff# Synthetic items\n" + SEP)
+    for it in items:
+        name = it.capitalize()
+        f.write(f"[{it}]\nName = {name}\nNamePlural = {name}s\nPocket = {rng.randrange(1, 9)}\n"
+                f"Price = {rng.randrange(0, 10000, 50)}\n")
+        if rng.random() < 0.4:
+            f.write(f"FieldUse = {rng.choice(('OnPokemon', 'Direct', 'TR'))}\n")
+        if rng.random() < 0.5:
+            f.write(f"Flags = Fling_{rng.choice((10, 30, 60))}\n")
+        f.write(f"Description = {sentence(rng)}\n" + SEP)
+
+def write_pokemon(f: TextIO, rng: random.Random, species: List[str], types: List[str], moves: List[str],
+                  abilities: List[str], items: List[str], numbered: bool) -> None:
+    f.write("\ufeff# Synthetic species\n" + SEP)
+    for i, sp in enumerate(species):
+        typ = rng.sample(types, rng.choice((1, 2)))
+        stats = [rng.randrange(20, 160) for _ in range(6)]
+        if numbered:
+            f.write(f"[{i + 1}]\nName = {sp.capitalize()}\nInternalName = {sp}\n")
+            f.write("".join(f"Type{n + 1} = {t}\n" for n, t in enumerate(typ)))
+        else:
+            f.write(f"[{sp}]\nName = {sp.capitalize()}\nTypes = {','.join(typ)}\n")
+        f.write(f"BaseStats = {','.join(map(str, stats))}\nGrowthRate = Medium\nBaseExp = {rng.randrange(40, 300)}\n")
+        if i % 2:
+            # ss2 style: one "EVs =" line per stat that yields effort
+            for stat in rng.sample(STATS, rng.choice((1, 1, 2, 3))):
+                f.write(f"EVs = {stat},{rng.randrange(1, 4)}\n")
+        else:
+            ev = [0] * 6
+            ev[rng.randrange(6)] = rng.randrange(1, 4)
+            f.write(f"EffortPoints = {','.join(map(str, ev))}\n")
+        f.write(f"{'Rareness' if numbered else 'CatchRate'} = {rng.randrange(3, 256)}\nHappiness = 70\n")
+        f.write(f"Abilities = {','.join(rng.sample(abilities, min(2, len(abilities))))}\n")
+        if rng.random() < 0.7:
+            f.write(f"HiddenAbility = {rng.choice(abilities)}\n")
+        levels = sorted(rng.randrange(1, 80) for _ in range(rng.randrange(4, 20)))
+        f.write(f"Moves = {','.join(f'{lv},{rng.choice(moves)}' for lv in levels)}\n")
+        f.write(f"TutorMoves = {','.join(rng.sample(moves, min(len(moves), rng.randrange(10, 60))))}\n")
+        f.write(f"EggMoves = {','.join(rng.sample(moves, min(len(moves), rng.randrange(0, 8))))}\n")
+        f.write(f"Height = {rng.randrange(1, 50) / 10}\nWeight = {rng.randrange(1, 5000) / 10}\n"
+                f"Color = Red\nShape = Quadruped\nGeneration = {rng.randrange(1, 10)}\n")
+        if items and rng.random() < 0.2:
+            f.write(f"WildItemCommon = {rng.choice(items)}\n")
+        f.write(f"Pokedex = {sentence(rng, 20)}\n")
+        # chains of three: 0 -> 1 -> 2, 3 -> 4 -> 5, ...
+        if i % 3 != 2 and i + 1 < len(species):
+            f.write(f"Evolutions = {species[i + 1]},Level,{rng.randrange(10, 50)}\n")
+        f.write(SEP)
+
+def write_forms(f: TextIO, rng: random.Random, species: List[str], count: int, types: List[str],
+                abilities: List[str]) -> None:
+    f.write("# Synthetic forms\n" + SEP)
+    bases = sorted(rng.sample(range(len(species)), min(count, len(species))))
+    for b in bases:
+        f.write(f"[{species[b]},{rng.randrange(1, 4)}]\nFormName = {rng.choice(('Mega', 'Alolan', 'Galarian', 'Cosplay'))} "
+                f"{species[b].capitalize()}\n")
+        f.write(f"BaseStats = {','.join(str(rng.randrange(20, 180)) for _ in range(6))}\n")
+        if rng.random() < 0.5:
+            f.write(f"Types = {','.join(rng.sample(types, rng.choice((1, 2))))}\n")
+        if rng.random() < 0.5:
+            f.write(f"Abilities = {rng.choice(abilities)}\n")
+        f.write(SEP)
+
+def write_encounters(f: TextIO, rng: random.Random, maps: int, species: List[str]) -> None:
+    f.write("\ufeff# Synthetic encounters\n" + SEP)
+    width = max(3, len(str(maps)))
+    for m in range(maps):
+        f.write(f"[{m + 1:0{width}d}] # {word(m + 7, 2).capitalize()} Route\n")
+        for _ in range(rng.randrange(1, 4)):
+            if rng.random() < 0.5:
+                f.write(f"{rng.choice(BLOCKS_4)},{rng.choice((10, 21, 25))}\n")
+                for _ in range(rng.randrange(2, 12)):
+                    lo = rng.randrange(2, 70)
+                    f.write(f"    {rng.choice((5, 10, 20))},{rng.choice(species)},{lo},{lo + rng.randrange(0, 5)}\n")
+            else:
+                f.write(f"{rng.choice(BLOCKS_3)}\n")
+                for _ in range(rng.randrange(2, 6)):
+                    f.write(f"\t{rng.choice((20, 30, 50))},{rng.choice(species)},{rng.randrange(2, 70)}\n")
+        f.write(SEP)
+
+# ---------- main ----------
+
+def generate(out: Path, species: int, forms: int, moves: int, items: int, abilities: int,
+             types: int, maps: int, seed: int = 1, numbered: bool = False) -> None:
+    rng = random.Random(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    type_list = type_ids(types)
+    # disjoint id ranges keep species/move/item/ability names unique across files
+    sp_ids = [internal(word(i)) for i in range(species)]
+    mv_ids = [internal(word(i)) + "MOVE" for i in range(moves)]
+    it_ids = [internal(word(i)) + "ITEM" for i in range(items)]
+    ab_ids = [internal(word(i)) + "ABIL" for i in range(abilities)]
+
+    def open_txt(name):
+        return (out / name).open("w", encoding="utf-8", newline="\n")
+
+    with open_txt("types.txt") as f: write_types(f, rng, type_list)
+    with open_txt("abilities.txt") as f: write_abilities(f, rng, ab_ids)
+    with open_txt("moves.txt") as f: write_moves(f, rng, mv_ids, type_list)
+    with open_txt("items.txt") as f: write_items(f, rng, it_ids)
+    with open_txt("pokemon.txt") as f: write_pokemon(f, rng, sp_ids, type_list, mv_ids, ab_ids, it_ids, numbered)
+    with open_txt("pokemon_forms.txt") as f: write_forms(f, rng, sp_ids, forms, type_list, ab_ids)
+    with open_txt("encounters.txt") as f: write_encounters(f, rng, maps, sp_ids)
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate a synthetic PBS game for scale testing.")
+    ap.add_argument("out", help="Output game folder")
+    ap.add_argument("--species", type=int, default=2000, help="Species in pokemon.txt (default: 2000)")
+    ap.add_argument("--forms", type=int, default=None, help="Forms in pokemon_forms.txt (default: species / 10)")
+    ap.add_argument("--moves", type=int, default=1000, help="Moves in moves.txt (default: 1000)")
+    ap.add_argument("--items", type=int, default=1000, help="Items in items.txt (default: 1000)")
+    ap.add_argument("--abilities", type=int, default=300, help="Abilities in abilities.txt (default: 300)")
+    ap.add_argument("--types", type=int, default=18, help="Types in types.txt (default: 18)")
+    ap.add_argument("--maps", type=int, default=500, help="Encounter maps in encounters.txt (default: 500)")
+    ap.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    ap.add_argument("--numbered", action="store_true",
+                    help="Old-style pokemon.txt: [N] headers with InternalName, Type1/Type2 and Rareness")
+    args = ap.parse_args()
+
+    sizes = (args.species, args.moves, args.items, args.abilities, args.types, args.maps)
+    if min(sizes) < 1 or (args.forms is not None and args.forms < 0):
+        print("ERROR: every size must be at least 1", file=sys.stderr)
+        sys.exit(2)
+    forms = args.species // 10 if args.forms is None else args.forms
+    out = Path(args.out)
+    generate(out, args.species, forms, args.moves, args.items, args.abilities, args.types, args.maps,
+             seed=args.seed, numbered=args.numbered)
+    total = sum(p.stat().st_size for p in out.glob("*.txt"))
+    print(f"Wrote {args.species} species, {forms} forms, {args.moves} moves, {args.items} items, "
+          f"{args.abilities} abilities, {args.types} types and {args.maps} maps to {out} ({total / 2**20:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
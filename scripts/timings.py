@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-phase timing for the converters (--timings / --profile-out).
+
+While a Timings is active, code marks what it is doing with
+`with phase("normalize"):` and time is charged to the innermost open phase
+only, so nested phases never double count. The shared helpers mark their own
+phases, so converters only mark their own work:
+
+  read       pbs.py reading the PBS file(s) from disk
+  tokenize   pbs.py splitting lines into sections / key-value events
+  normalize  converter code building entries from raw sections
+  merge      pokemon_to_json.merge_forms
+  dumps      outputs.dumps (json.dumps)
+  derive     extra artifacts built from finished entries (reverse index,
+             stats table, type matrix)
+  write      outputs.write_*_atomic
+
+With no active Timings, phase() and wrap() cost one global lookup.
+"""
+import cProfile, sys, time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+_CURRENT: Optional["Timings"] = None
+
+def current() -> Optional["Timings"]:
+    return _CURRENT
+
+def phase(name: str):
+    """Charge the time spent in the with-block to name (no-op unless timing)."""
+    return _CURRENT.phase(name) if _CURRENT is not None else nullcontext()
+
+def wrap(items: Iterable, name: str) -> Iterable:
+    """items, with the time spent producing each one charged to name (as is, unless timing)."""
+    return _CURRENT.wrap(items, name) if _CURRENT is not None else items
+
+def count(name: str, n: int) -> None:
+    """Record an entity count for the report."""
+    if _CURRENT is not None:
+        _CURRENT.counts[name] = _CURRENT.counts.get(name, 0) + n
+
+class Timings:
+    """Exclusive wall/CPU time per phase; time outside every phase is charged to "other"."""
+
+    def __init__(self):
+        self.wall: Dict[str, float] = {}
+        self.cpu: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._stack: List[str] = []
+        self._mark = (0.0, 0.0)
+        self.total = (0.0, 0.0)
+
+    def _charge(self) -> None:
+        now = (time.perf_counter(), time.process_time())
+        name = self._stack[-1] if self._stack else "other"
+        self.wall[name] = self.wall.get(name, 0.0) + now[0] - self._mark[0]
+        self.cpu[name] = self.cpu.get(name, 0.0) + now[1] - self._mark[1]
+        self._mark = now
+
+    @contextmanager
+    def phase(self, name: str):
+        self._charge()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    def wrap(self, items: Iterable, name: str) -> Iterator:
+        it = iter(items)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+
+    def __enter__(self) -> "Timings":
+        global _CURRENT
+        self._prev = _CURRENT
+        _CURRENT = self
+        self._start = self._mark = (time.perf_counter(), time.process_time())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _CURRENT
+        self._charge()
+        self.total = (self._mark[0] - self._start[0], self._mark[1] - self._start[1])
+        _CURRENT = self._prev
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "wallSeconds": self.total[0],
+            "cpuSeconds": self.total[1],
+            "phases": {k: {"wall": self.wall[k], "cpu": self.cpu.get(k, 0.0)} for k in self.wall},
+            "counts": dict(self.counts),
+        }
+
+    def print_report(self, file=sys.stderr) -> None:
+        wall_total = self.total[0] or 1e-12
+        print(f"{'phase':<12}{'wall':>10}{'cpu':>10}{'share':>8}", file=file)
+        for k in sorted(self.wall, key=lambda k: -self.wall[k]):
+            print(f"{k:<12}{self.wall[k] * 1000:>8.1f}ms{self.cpu.get(k, 0.0) * 1000:>8.1f}ms"
+                  f"{self.wall[k] / wall_total:>8.1%}", file=file)
+        print(f"{'total':<12}{self.total[0] * 1000:>8.1f}ms{self.total[1] * 1000:>8.1f}ms", file=file)
+        if self.counts:
+            print("counts: " + ", ".join(f"{k}={v:,}" for k, v in self.counts.items()), file=file)
+
+# ---------- CLI glue ----------
+
+def add_arguments(ap) -> None:
+    """The common --timings / --profile-out options."""
+    ap.add_argument("--timings", nargs="?", const="-", default=None, metavar="REPORT.json",
+                    help="Print wall/CPU time per phase and entity counts; with a path also write them as JSON")
+    ap.add_argument("--profile-out", default=None, metavar="FILE.prof",
+                    help="Run under cProfile and dump the stats to this file (read with python -m pstats)")
+
+def run(args, fn: Callable[..., Any], *a, **kw) -> Any:
+    """fn(*a, **kw), timed and/or profiled as requested by add_arguments' options."""
+    timings = Timings() if getattr(args, "timings", None) else None
+    prof = cProfile.Profile() if getattr(args, "profile_out", None) else None
+    with timings if timings else nullcontext():
+        if prof:
+            prof.enable()
+        try:
+            result = fn(*a, **kw)
+        finally:
+            if prof:
+                prof.disable()
+    if prof:
+        prof.dump_stats(args.profile_out)
+        print(f"Wrote cProfile stats to {args.profile_out}", file=sys.stderr)
+    if timings:
+        timings.print_report()
+        if args.timings != "-":
+            from outputs import write_json  # outputs itself reports to this module
+            write_json(Path(args.timings), timings.report(), trailing_newline=True)
+            print(f"Wrote timings to {args.timings}", file=sys.stderr)
+    return result
@@ -3,7 +3,8 @@
 Convert PBS-style types.txt to a JSON mapping keyed by InternalName.
 
 Usage:
-  python scripts/types_to_json.py <input_types.txt> <output_types.json>
+  python scripts/types_to_json.py <input_types.txt> <output_types.json> [--profile web] [--format ndjson]
+                                  [--pokemon pokemon.json]
 
 The JSON shape is:
 {
@@ -19,41 +20,48 @@ The JSON shape is:
   },
   ...
 }
+
+Alongside it, types.matrix.json holds the same chart as dense lookups:
+{
+  "types":  ["NORMAL", "FIGHTING", ...],        # ordered by index
+  "matrix": [[1, 1, ...], ...],                 # matrix[attacker][defender]
+  "combos": {"FIRE,ROCK": [1, 2, 0.25, ...]}    # per attacker, for every type
+}                                               # list used in pokemon.json
+The client (util/typing.ts) reads a mon's row from combos and single
+matchups (type pages, coverage, combos without a row) from matrix.
+
+combos comes from --pokemon, i.e. another converter's output: in
+build_data.py this converter runs after pokemon (see AFTER) and is rerun
+whenever the game's pokemon.json changes. Without --pokemon, or before
+pokemon.json exists, combos is empty.
 """
-import json, re, sys
+import argparse, sys
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import timings
+from model import TypeInfo, to_json_map
+from outputs import FORMATS, PROFILES, write_entries, write_json
+from pbs import read_sections
+from pokemon_to_json import read_entries
+
+# Bump whenever this converter's output changes so cached builds are redone.
+CONVERTER_VERSION = 2
 
 LIST_KEYS = {"Weaknesses", "Resistances", "Immunities"}
 BOOL_KEYS = {"IsSpecialType", "IsPseudoType"}
 
-def parse_types_txt(text: str) -> dict:
+def parse_types_txt(text) -> Dict[str, TypeInfo]:
+    """Parse types.txt text (or a Path, streamed) into TypeInfo records (to_json: the mapping shown above)."""
     entries = []
-    current = {}
-    idx = None
-
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
+    for header, idx, raw, _line in read_sections(text):
+        current = {}
+        if header and not header.isdigit():
+            idx = None
+            current["InternalName"] = header
+        current.update(raw)
+        if not current:
             continue
-        m = re.match(r"\[([^\]]+)\]\s*$", line)
-        if m:
-            # flush previous block
-            if current:
-                current["_index"] = idx if idx is not None else len(entries)
-                entries.append(current)
-            current = {}
-            header = m.group(1)
-            if header.isdigit():
-                idx = int(header)
-            else:
-                idx = None
-                current["InternalName"] = header
-            continue
-        if "=" in line:
-            k, v = line.split("=", 1)
-            current[k.strip()] = v.strip()
-
-    if current:
         current["_index"] = idx if idx is not None else len(entries)
         entries.append(current)
 
@@ -72,34 +80,101 @@ def parse_types_txt(text: str) -> dict:
     for e in entries:
         name = e.get("Name", "")
         internal = e.get("InternalName") or name.upper()
-        obj = {
-            "name": name,
-            "internalId": internal,
-            "weaknesses": split_list(e.get("Weaknesses")),
-            "resistances": split_list(e.get("Resistances")),
-            "immunities": split_list(e.get("Immunities")),
-            "isSpecialType": to_bool(e.get("IsSpecialType")),
-            "isPseudoType": to_bool(e.get("IsPseudoType")),
-            "index": e.get("_index", 0),
-        }
-        out[internal] = obj
+        out[internal] = TypeInfo(
+            name=name,
+            internal_id=internal,
+            weaknesses=split_list(e.get("Weaknesses")),
+            resistances=split_list(e.get("Resistances")),
+            immunities=split_list(e.get("Immunities")),
+            is_special_type=to_bool(e.get("IsSpecialType")),
+            is_pseudo_type=to_bool(e.get("IsPseudoType")),
+            index=e.get("_index", 0),
+        )
     return out
 
+# ---------- effectiveness matrix ----------
+
+def single_multiplier(atk: str, info: dict) -> float:
+    """atk vs one defending type; immunity beats resistance beats weakness (as util/typing.ts)."""
+    if atk in info["immunities"]: return 0
+    if atk in info["resistances"]: return 0.5
+    if atk in info["weaknesses"]: return 2
+    return 1
+
+def pokemon_type_lists(path: Path) -> List[List[str]]:
+    """Distinct type lists used by the entries of a pokemon.json (delta forms resolved)."""
+    entries = read_entries(path)
+    by_internal = {e.get("internalName"): e for e in entries if not e.get("delta")}
+    seen = {}
+    for e in entries:
+        types = e.get("types")
+        if types is None and e.get("delta"):
+            types = by_internal.get(e.get("baseInternal"), {}).get("types")
+        if types:
+            seen.setdefault(",".join(types), list(types))
+    return list(seen.values())
+
+def type_matrix(data: dict, combos: Iterable[List[str]] = ()) -> dict:
+    """Dense attacker x defender matrix (ordered by index) + per-combo multiplier rows."""
+    order = sorted(data, key=lambda t: (data[t].get("index", 0), t))
+    matrix = [[single_multiplier(a, data[d]) for d in order] for a in order]
+    pos = {t: i for i, t in enumerate(order)}
+
+    rows = {}
+    for types in combos:
+        row = []
+        for ai in range(len(order)):
+            m = 1
+            for d in types:
+                if d in pos:  # unknown defending types are ignored, as on the client
+                    m *= matrix[ai][pos[d]]
+            row.append(m)
+        rows[",".join(types)] = row
+    return {"types": order, "matrix": matrix, "combos": rows}
+
+def matrix_path(dest: Path) -> Path:
+    dest = Path(dest)
+    return dest.with_name(f"{dest.stem}.matrix.json")
+
+def convert(src: Path, dest: Path, profile: str = "debug", pokemon: Optional[Path] = None,
+            fmt: str = "json") -> int:
+    """
+    Convert types.txt to types.json plus types.matrix.json; combo rows are
+    built for the type lists found in pokemon (a pokemon.json), if it exists.
+    Returns the type count.
+    """
+    with timings.phase("normalize"):
+        data = to_json_map(parse_types_txt(Path(src)))
+    timings.count("types", len(data))
+    write_entries(dest, data.items(), keyed=True, trailing_newline=True, profile=profile, fmt=fmt)
+    with timings.phase("derive"):
+        combos = pokemon_type_lists(pokemon) if pokemon and Path(pokemon).exists() else []
+        matrix = type_matrix(data, combos)
+    timings.count("combos", len(combos))
+    write_json(matrix_path(dest), matrix, trailing_newline=True, profile=profile)
+    return len(data)
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python scripts/types_to_json.py <input_types.txt> <output_types.json>", file=sys.stderr)
-        sys.exit(2)
+    ap = argparse.ArgumentParser(description="Convert PBS types.txt -> types.json (keyed by InternalName).")
+    ap.add_argument("src", help="Path to types.txt")
+    ap.add_argument("dst", help="Path to types.json")
+    ap.add_argument("--profile", choices=PROFILES, default="debug",
+                    help="debug: pretty JSON (default); web: minified")
+    ap.add_argument("--format", choices=FORMATS, default="json",
+                    help="json (default); ndjson: one entry per line, as [key, value]")
+    ap.add_argument("--pokemon", default=None,
+                    help="pokemon.json whose type combinations get precomputed rows in types.matrix.json")
+    timings.add_arguments(ap)
+    args = ap.parse_args()
 
-    src = Path(sys.argv[1])
-    dst = Path(sys.argv[2])
+    src = Path(args.src)
+    dst = Path(args.dst)
     if not src.exists():
         print(f"Input not found: {src}", file=sys.stderr)
         sys.exit(1)
 
-    data = parse_types_txt(src.read_text(encoding="utf-8", errors="ignore"))
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    dst.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    print(f"Wrote {dst} ({len(data)} types)")
+    n = timings.run(args, convert, src, dst, profile=args.profile, pokemon=args.pokemon, fmt=args.format)
+    print(f"Wrote {dst} ({n} types) and {matrix_path(dst)}")
 
 if __name__ == "__main__":
     main()
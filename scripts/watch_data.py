@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Watch every game's PBS files and regenerate only what a change touches.
+
+Runs until interrupted, watching public/data/<game>/*.txt for the games in
+games.json. When a file is saved, only the converters that read it (plus
+those that read their output, e.g. types and search after pokemon) are rerun,
+for that game only, in this process. Every output is replaced atomically, so
+Vite's reload never sees a half-written file.
+
+Changes are picked up with inotify on Linux and by polling file mtimes
+everywhere else (or with --poll). Saves that arrive within --settle seconds
+of each other are handled as one batch.
+
+The build cache and the .gz/.br siblings are left alone: the next
+build_data.py run rebuilds and recompresses what the watcher wrote. A game
+that already has a manifest.json gets it rewritten after every rebuild, so
+the client never follows it to an outdated hashed copy.
+
+Usage:
+  python scripts/watch_data.py [--data-dir public/data] [--games ss2,decay]
+                               [--poll] [--interval 0.25] [--settle 0.05]
+                               [--profile web] [--forms-mode delta] ...
+"""
+import argparse, ctypes, ctypes.util, fnmatch, os, select, struct, sys, time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import build_data, manifest
+from build_data import AFTER, CONVERTERS
+
+# ---------- what a file feeds ----------
+
+def converters_for(filename: str) -> List[str]:
+    """
+    Converters to rerun when a PBS file of this name changes: those reading it
+    (mirrors build_data.job_inputs) and, transitively, those reading their
+    output. In CONVERTERS order.
+    """
+    name = filename.lower()
+    hit: Set[str] = set()
+    if name in ("pokemon.txt", "pokemon_forms.txt", "types.txt"):
+        hit.add("pokemon")
+    if fnmatch.fnmatch(name, "*moves*.txt"):
+        hit.add("moves")
+    if name.endswith(".txt") and name[:-4] in CONVERTERS:
+        hit.add(name[:-4])
+    grew = True
+    while grew:
+        extra = {n for n, deps in AFTER.items() if n not in hit and hit.intersection(deps)}
+        hit |= extra
+        grew = bool(extra)
+    return [n for n in CONVERTERS if n in hit]
+
+# ---------- change sources ----------
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+def snapshot(dirs: Iterable[Path]) -> Snapshot:
+    """(mtime_ns, size) of every *.txt directly in dirs."""
+    out: Snapshot = {}
+    for d in dirs:
+        try:
+            entries = list(os.scandir(d))
+        except FileNotFoundError:
+            continue
+        for e in entries:
+            if e.name.endswith(".txt") and e.is_file():
+                st = e.stat()
+                out[Path(e.path)] = (st.st_mtime_ns, st.st_size)
+    return out
+
+class Poller:
+    """Finds changed, added and removed files by comparing mtime snapshots."""
+
+    def __init__(self, dirs: List[Path], interval: float):
+        self.dirs = dirs
+        self.interval = interval
+        self.state = snapshot(dirs)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = snapshot(self.dirs)
+            changed = {p for p in now.keys() | self.state.keys() if now.get(p) != self.state.get(p)}
+            self.state = now
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            left = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(left)
+
+    def close(self) -> None:
+        pass
+
+IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_DELETE = 0x8, 0x40, 0x80, 0x200
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ len bytes of NUL-padded name)
+
+class Inotify:
+    """Linux inotify on the game folders through libc (no extra packages)."""
+
+    def __init__(self, dirs: List[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+        self.dirs: Dict[int, Path] = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(d), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"cannot watch {d}")
+            self.dirs[wd] = d
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: Set[Path] = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos < len(buf):
+                wd, _mask, _cookie, size = EVENT.unpack_from(buf, pos)
+                name = buf[pos + EVENT.size:pos + EVENT.size + size].rstrip(b"\0").decode("utf-8", "replace")
+                pos += EVENT.size + size
+                if name.endswith(".txt") and wd in self.dirs:
+                    changed.add(self.dirs[wd] / name)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+def open_watcher(dirs: List[Path], poll: bool, interval: float):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return Inotify(dirs)
+        except OSError as e:
+            print(f"WARN: {e}; falling back to polling", file=sys.stderr)
+    return Poller(dirs, interval)
+
+# ---------- rebuilding ----------
+
+def rebuild(changed: Iterable[Path], opts: Dict) -> List[Dict]:
+    """Run the affected converters of every game a batch of changed files belongs to."""
+    by_game: Dict[Path, Set[str]] = {}
+    for p in changed:
+        by_game.setdefault(p.parent, set()).update(converters_for(p.name))
+    jobs = []
+    for game_dir, names in by_game.items():
+        jobs.extend(build_data.plan_jobs(game_dir, [n for n in CONVERTERS if n in names], opts))
+    if not jobs:
+        return []
+    results = build_data.run_jobs(jobs, 1)
+    for game_dir in by_game:
+        if (game_dir / manifest.MANIFEST).exists():
+            manifest.publish(game_dir, opts["profile"])
+    return results
+
+def report(changed: Set[Path], results: List[Dict], elapsed: float) -> None:
+    stamp = time.strftime("%H:%M:%S")
+    files = ", ".join(sorted(f"{p.parent.name}/{p.name}" for p in changed))
+    if not results:
+        print(f"[{stamp}] {files}: nothing to rebuild")
+        return
+    done = ", ".join(f"{r['game']}/{r['converter']}" for r in results if "error" not in r)
+    print(f"[{stamp}] {files} -> {done or 'nothing'} in {elapsed:.2f}s")
+    for r in results:
+        if "error" in r:
+            print(f"[{stamp}] FAILED {r['game']}/{r['converter']}: {r['error']}", file=sys.stderr)
+
+# ---------- main ----------
+
+def main():
+    ap = argparse.ArgumentParser(description="Regenerate a game's JSON whenever one of its PBS files changes.")
+    ap.add_argument("--data-dir", default="public/data",
+                    help="Folder holding games.json and one sub-folder per game (default: public/data)")
+    ap.add_argument("--games", default=None,
+                    help="Comma-separated game ids to watch (default: every game in games.json)")
+    ap.add_argument("--poll", action="store_true", help="Poll mtimes even where inotify is available")
+    ap.add_argument("--interval", type=float, default=0.25, help="Polling interval in seconds (default: 0.25)")
+    ap.add_argument("--settle", type=float, default=0.05,
+                    help="Wait this long after a change for related saves (default: 0.05)")
+    build_data.add_options(ap)
+    args = ap.parse_args()
+
+    data_dir = Path(args.data_dir)
+    if not (data_dir / "games.json").exists():
+        print(f"ERROR: games.json not found in {data_dir}", file=sys.stderr)
+        sys.exit(1)
+    games = build_data.load_games(data_dir)
+    if args.games:
+        wanted = [g.strip() for g in args.games.split(",") if g.strip()]
+        unknown = [g for g in wanted if g not in games]
+        if unknown:
+            print(f"ERROR: unknown game id(s): {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+        games = [g for g in games if g in wanted]
+    dirs = [data_dir / g for g in games if (data_dir / g).is_dir()]
+    try:
+        opts = build_data.build_options(args)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    watcher = open_watcher(dirs, args.poll, args.interval)
+    mode = "polling" if isinstance(watcher, Poller) else "inotify"
+    print(f"Watching {len(dirs)} game folder(s) under {data_dir} ({mode}); Ctrl+C to stop")
+    try:
+        while True:
+            changed = watcher.wait(None)
+            if not changed:  # only non-PBS files (e.g. our own outputs) changed
+                continue
+            while True:  # editors often write a file in several steps
+                more = watcher.wait(args.settle)
+                if not more:
+                    break
+                changed |= more
+            t0 = time.perf_counter()
+            results = rebuild(changed, opts)
+            report(changed, results, time.perf_counter() - t0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import { setupNavStack, renderCurrent, navigateToMon, navigateToList, parseRoute
 import { bindAbilityTooltips, bindTypeTooltips } from './ui/tooltip';
 import { buildSearchIndex, wireSearchSuggest } from './ui/suggest';
 import { renderTable } from './ui/table';
+import { installIconAtlas } from './util/assets';
 
 export async function start() {
     initTheme();
@@ -23,6 +24,8 @@ export async function start() {
         return;
     }
 
+    installIconAtlas()
+
     bindAbilityTooltips()
     bindTypeTooltips()
 
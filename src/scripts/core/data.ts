@@ -1,11 +1,18 @@
 import { normKey, num, slugify, toArray } from "../util/fmt";
-import { AbilityMap, EncounterLocation, IntlPack, Item, Mon, MoveIndex, Stats, SuggestItem, TypeInfo } from "./types";
+import { AbilityMap, DataManifest, EncounterLocation, EvolutionGraph, IconAtlas, IntlPack, Item, Mon, MoveIndex, ReverseIndex, SearchData, SpriteManifest, Stats, StatsColumn, StatsTable, StringTables, SuggestItem, TypeChart, TypeInfo } from "./types";
 
 // GLOBAL VARIBALES
 export let ALL_POKEMON: Mon[] = [];
 export let byInternal = new Map<string, Mon>()
 export let LOCS: Record<string, EncounterLocation> = {};
 export let typeData: Record<string, TypeInfo> = {};
+export let TYPE_CHART: TypeChart | null = null;
+export let SEARCH_DATA: SearchData | null = null;
+export let REVERSE: ReverseIndex | null = null;
+export let EVO_GRAPH: EvolutionGraph | null = null;
+export let SPRITES: SpriteManifest | null = null;
+export let ICON_ATLAS: IconAtlas | null = null;
+export let STATS_TABLE: StatsTable | null = null;
 export let ITEMS: Record<string, Item> = {};
 export let movesIndex: MoveIndex = {};
 export let ABIL: AbilityMap = {};
@@ -23,6 +30,37 @@ export let MON_BY_ID: Record<string, Mon> = {};
 let GAME_ID = 'main';
 const BASE = (import.meta as any).env?.BASE_URL || '/';
 const dataPath = (file: string) => `${BASE}data/${GAME_ID}/${file}`;
+let MANIFEST: DataManifest['files'] | null = null;
+let manifestLoad: Promise<void> = Promise.resolve();
+
+// optional: the only file revalidated on every visit; everything it lists is content-hashed.
+// Not awaited on its own: loadAll starts it with the data fetches, which wait for it in fetchData.
+function loadManifest(): Promise<void> {
+    MANIFEST = null;
+    return manifestLoad = (async () => {
+        try {
+            const res = await fetch(dataPath('manifest.json'), { cache: "no-cache" });
+            if (!res.ok) return;
+            const raw = await res.json();
+            if (raw?.files) MANIFEST = raw.files;
+        } catch {}
+    })();
+}
+
+// URL of a game data file: its hashed copy when the manifest lists it (once it has loaded)
+export function dataFileUrl(file: string): string {
+    return dataPath(MANIFEST?.[file]?.file || file);
+}
+
+// Hashed copies never change, so they use the normal HTTP cache; without a manifest every
+// file is revalidated as before. A file the manifest doesn't list wasn't built: no request.
+async function fetchData(file: string): Promise<Response> {
+    await manifestLoad;
+    if (!MANIFEST) return fetch(dataPath(file), { cache: "no-cache" });
+    const hit = MANIFEST[file];
+    return hit ? fetch(dataPath(hit.file)) : new Response(null, { status: 404 });
+}
+
 export function setGameId(id: string){
     GAME_ID = id;
 }
@@ -78,8 +116,7 @@ export function getAbilityInfo(id: string): { name?: string; description?: strin
 
 // LOADERS
 async function loadEncounters(): Promise<void> {
-    const url = dataPath('encounters.json');
-    const res = await fetch(url, { cache: "no-cache" });
+    const res = await fetchData('encounters.json');
     if (!res.ok) return;
     const data = await res.json();
     // Expect an object keyed by id; if an array is ever produced, re-key it.
@@ -93,8 +130,7 @@ async function loadEncounters(): Promise<void> {
 }
 
 async function loadItems(): Promise<void> {
-    const url = dataPath('items.json');
-    const res = await fetch(url, { cache: "no-cache" });
+    const res = await fetchData('items.json');
     if (!res.ok) return;
     const data = await res.json();
     // supports object keyed by internal; also supports array fallback
@@ -111,34 +147,176 @@ async function loadItems(): Promise<void> {
 }
 
 async function loadMoves() {
-    const dataUrl = dataPath('moves.json');
-    const res = await fetch(dataUrl, { cache: "no-cache" });
-    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataUrl}`);
+    const res = await fetchData('moves.json');
+    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataFileUrl('moves.json')}`);
     movesIndex = await res.json();
 }
 
 async function loadAbilities() {
-    const url = dataPath('abilities.json');
-    const res = await fetch(url, { cache: "no-cache" });
-    if (!res.ok) throw new Error(`HTTP ${res.status} for ${url}`);
+    const res = await fetchData('abilities.json');
+    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataFileUrl('abilities.json')}`);
     ABIL = await res.json();
 }
 
 async function loadTypes() {
-    const dataUrl = dataPath('types.json');
-    const res = await fetch(dataUrl, { cache: "no-cache" });
-    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataUrl}`);
+    const res = await fetchData('types.json');
+    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataFileUrl('types.json')}`);
     typeData = await res.json();
 }
 
+async function loadTypeChart() {
+    // optional: older data folders have no matrix, typing.ts then derives multipliers
+    TYPE_CHART = null;
+    const res = await fetchData('types.matrix.json');
+    if (!res.ok) return;
+    try {
+        const raw = await res.json();
+        if (!Array.isArray(raw?.types)) return;
+        TYPE_CHART = { ...raw, pos: new Map(raw.types.map((t: string, i: number) => [t, i])) };
+    } catch {}
+}
+
+let searchLoad: Promise<void> | null = null;
+
+// optional, and only needed once someone searches: ui/suggest.ts asks for it on the first
+// focus/input of #q and answers from the index it builds in the browser until it arrives
+export function loadSearch(): Promise<void> {
+    return searchLoad ??= (async () => {
+        const res = await fetchData('search.json');
+        if (!res.ok) return;
+        try {
+            const raw = await res.json();
+            if (Array.isArray(raw?.entries) && raw?.grams) SEARCH_DATA = raw;
+        } catch {}
+    })();
+}
+
+let reverseLoad: Promise<void> | null = null;
+
+// optional, and only the move/ability pages need it: fetched on the first lookup, which
+// (like any lookup without the file) scans ALL_POKEMON until it has arrived
+function loadReverse(): Promise<void> {
+    return reverseLoad ??= (async () => {
+        const res = await fetchData('pokemon.reverse.json');
+        if (!res.ok) return;
+        try {
+            const raw = await res.json();
+            if (raw?.moves && raw?.abilities) REVERSE = raw;
+        } catch {}
+    })();
+}
+
+async function loadEvolutionGraph() {
+    // optional: without pokemon.evolutions.json evolution lines are rebuilt from every mon's evolutions
+    EVO_GRAPH = null;
+    const res = await fetchData('pokemon.evolutions.json');
+    if (!res.ok) return;
+    try {
+        const raw = await res.json();
+        if (raw?.families && raw?.byInternal) EVO_GRAPH = raw;
+    } catch {}
+}
+
+async function loadSprites() {
+    // optional: without sprites.json every sprite is found by trying file names until one loads
+    SPRITES = null;
+    const res = await fetchData('sprites.json');
+    if (!res.ok) return;
+    try {
+        const raw = await res.json();
+        if (raw?.sprites && typeof raw.base === 'string') SPRITES = raw;
+    } catch {}
+}
+
+let iconAtlasLoad: Promise<void> | null = null;
+
+// optional: without icons.atlas.json every type / category icon is its own request.
+// Every game shares it (public/images), so it is fetched once, not on each game switch.
+function loadIconAtlas(): Promise<void> {
+    return iconAtlasLoad ??= (async () => {
+        const res = await fetch(`${BASE}images/icons.atlas.json`, { cache: "no-cache" });
+        if (!res.ok) return;
+        try {
+            const raw = await res.json();
+            if (!raw?.types && !raw?.categories) return;
+            for (const sheet of [raw.types, raw.categories]) if (sheet) sheet.image = `${BASE}images/${sheet.image}`;
+            ICON_ATLAS = raw;
+        } catch {}
+    })();
+}
+
+async function loadStatsTable() {
+    // optional: without pokemon.stats.json/.bin the dex table sorts Mon objects directly
+    STATS_TABLE = null;
+    const res = await fetchData('pokemon.stats.json');
+    if (!res.ok) return;
+    try {
+        const head = await res.json();
+        const bin = await fetchData(head.file || 'pokemon.stats.bin');
+        if (!bin.ok || !head.littleEndian) return;
+        const buf = await bin.arrayBuffer();
+        if (buf.byteLength !== head.bytes) return;
+        // typed arrays use the platform byte order; every browser we target is little-endian
+        const kinds: Record<string, any> = { int16: Int16Array, uint16: Uint16Array, uint8: Uint8Array };
+        const columns: Record<string, StatsColumn> = {};
+        for (const c of head.columns) columns[c.name] = new kinds[c.type](buf, c.offset, head.rows);
+        STATS_TABLE = {
+            rows: head.rows, columns, types: head.types, noType: head.noType,
+            row: new Map((head.order as string[]).map((n, i) => [n, i])),
+        };
+    } catch {}
+}
+
+// entry field -> string table, for pokemon.json written with --refs interned
+const INTERNED_FIELDS: [string, keyof StringTables][] = [
+    ['types', 'types'], ['abilities', 'abilities'], ['hiddenAbility', 'abilities'],
+    ['tutorMoves', 'moves'], ['eggMoves', 'moves'], ['machineMoves', 'moves'], ['megaStone', 'items'],
+];
+
+// table indexes back to names; level-up moves come as flat [level, move, level, move, ...]
+function expandRefs(e: any, s: StringTables): any {
+    const out = { ...e };
+    const name = (t: string[], v: any) => typeof v === 'number' ? t[v] : v;
+    for (const [key, table] of INTERNED_FIELDS) {
+        const v = e[key];
+        if (Array.isArray(v)) out[key] = v.map(x => name(s[table], x));
+        else if (v != null) out[key] = name(s[table], v);
+    }
+    if (Array.isArray(e.moves) && typeof e.moves[0] === 'number') {
+        const moves: { level: number; move: string }[] = [];
+        for (let i = 0; i + 1 < e.moves.length; i += 2) moves.push({ level: e.moves[i], move: s.moves[e.moves[i + 1]] });
+        out.moves = moves;
+    }
+    if (e.wildItems) {
+        out.wildItems = {};
+        for (const [slot, v] of Object.entries(e.wildItems)) out.wildItems[slot] = name(s.items, v);
+    }
+    return out;
+}
+
 async function loadPokemon() {
-    const dataUrl = dataPath('pokemon.json');
-    const res = await fetch(dataUrl, { cache: "no-cache" });
-    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataUrl}`);
+    // pokemon.strings.json only exists next to an interned pokemon.json
+    const [res, strRes] = await Promise.all([
+        fetchData('pokemon.json'),
+        fetchData('pokemon.strings.json'),
+    ]);
+    if (!res.ok) throw new Error(`HTTP ${res.status} for ${dataFileUrl('pokemon.json')}`);
     const raw = await res.json();
+    const strings: StringTables | null = strRes.ok ? await strRes.json().catch(() => null) : null;
 
     // file can be an array or an object map — normalize to array
-    const arr: any[] = Array.isArray(raw) ? raw : Object.values(raw || {});
+    let entries: any[] = Array.isArray(raw) ? raw : Object.values(raw || {});
+    if (strings) entries = entries.map(e => expandRefs(e, strings));
+
+    // delta-encoded forms (pokemon_to_json.py --forms-mode delta) only carry their
+    // overrides: the full form is { ...base species entry, ...form entry }
+    const baseEntries = new Map<string, any>();
+    for (const e of entries) if (e && !e.delta) baseEntries.set(e.internalName, e);
+    const arr: any[] = entries.map((e: any) => {
+        if (!e?.delta) return e;
+        const { delta, ...form } = e;
+        return { ...(baseEntries.get(e.baseInternal) || {}), ...form };
+    });
 
     // massage into our Mon shape, keeping fields if present
     const list: Mon[] = arr.map((e: any, idx: number) => {
@@ -198,7 +376,7 @@ async function loadPokemon() {
     // compute and attach unique pre-evolutions
     attachPrevos(list);
 
-    console.log("Loaded pokemon:", { url: dataUrl, count: list.length, sample: list[0] });
+    console.log("Loaded pokemon:", { url: dataFileUrl('pokemon.json'), count: list.length, sample: list[0] });
     ALL_POKEMON = list;
 
     MON_BY_INTERNAL = {};
@@ -226,8 +404,7 @@ function attachPrevos(pokemon: Mon[]) {
 }
 
 async function loadIntl() {
-    const url = `${BASE}data/${GAME_ID}/intl.json`;
-    const res = await fetch(url, { cache: "no-cache" });
+    const res = await fetchData('intl.json');
     if (!res.ok) return;
     INTL = await res.json();
 
@@ -253,15 +430,29 @@ async function loadEvos() {
 
 export async function loadAll() {
     await Promise.all([
+        loadManifest(),
         loadIntl(),
         loadAbilities?.(),  // if you already have this
         loadTypes?.(),      // if you already have this
+        loadTypeChart(),
         loadMoves(),
         loadItems(),
         loadEncounters(),
         loadPokemon(),
+        loadEvolutionGraph(),
+        loadSprites(),
+        loadIconAtlas(),
+        loadStatsTable(),
         loadEvos(),
     ]);
+
+    // the precomputed graph also links forms (RATTATA_1 -> RATICATE_1, megas to their line)
+    if (EVO_GRAPH) {
+        for (const m of ALL_POKEMON) {
+            const node = EVO_GRAPH.byInternal[m.internalName];
+            if (node) m.prevo = node.prevo;
+        }
+    }
 }
 
 // HELPERS
@@ -288,7 +479,36 @@ export function eggMovesFromRoot(mon: Mon): string[] {
     return Array.isArray(root.eggMoves) ? root.eggMoves : [];
 }
 
+// Resolve internal names from the reverse index, once each, sorted by name
+function monsByInternal(names: Iterable<string>): Mon[] {
+    const out: Mon[] = [];
+    for (const n of new Set(names)) {
+        const m = MON_BY_INTERNAL[n];
+        if (m) out.push(m);
+    }
+    return out.sort((a,b)=> a.name.localeCompare(b.name));
+}
+
+export function pokemonWithAbility(abilityId: string, pokemon: Mon[] = ALL_POKEMON): Mon[] {
+    loadReverse();
+    if (REVERSE) {
+        const hit = REVERSE.abilities[abilityId];
+        return monsByInternal([...(hit?.regular || []), ...(hit?.hidden || [])]);
+    }
+    return pokemon
+        .filter(p => (p.abilities?.includes(abilityId)) || p.hiddenAbility === abilityId)
+        .sort((a, b) => a.name.localeCompare(b.name));
+}
+
 export function pokemonLearnersOf(moveId: string): Mon[] {
+    loadReverse();
+    if (REVERSE) {
+        const hit = REVERSE.moves[moveId];
+        return monsByInternal([
+            ...(hit?.levelup || []).map(([n]) => n),
+            ...(hit?.tutor || []), ...(hit?.machine || []), ...(hit?.egg || []),
+        ]);
+    }
     const out: Mon[] = [];
     const seen = new Set<string>();
     for (const p of ALL_POKEMON) {
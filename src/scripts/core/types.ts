@@ -63,13 +63,16 @@ export type SuggestItem = {
     iconHTML?: string;    // optional left icon HTML
     score?: number;       // ranking score
     search: string;
+    internal?: string;    // mon internal name, for icons of prebuilt entries
 };
 
-export type EncounterRow = [number, string, number, number]; // [chance, mon, min, max]
+// [chance, mon, min, max, share]; share = chance / the type's total chance (0..1), absent in older data
+export type EncounterRow = [number, string, number, number, number?];
 export type EncounterLocation = {
     id: string;            // "003"
     name: string;          // "Forested Cavern"
     encounters: Record<string, EncounterRow[]>; // e.g. { Land: [...], Water: [...] }
+    rates?: Record<string, number>;             // encounter type -> rate, e.g. { Land: 21, Water: 4 }
 };
 
 export type TypeInfo = {
@@ -78,6 +81,72 @@ export type TypeInfo = {
     isSpecialType: boolean; isPseudoType: boolean; index: number;
 };
 
+// types.matrix.json (types_to_json.py): multipliers as plain array lookups
+export type TypeChart = {
+    types: string[];                  // ordered by TypeInfo.index
+    matrix: number[][];               // matrix[attacker][defender]
+    combos: Record<string, number[]>; // "FIRE,ROCK" -> multiplier per attacker
+    pos: Map<string, number>;         // type id -> position in `types` (built on load)
+};
+
+// pokemon.reverse.json, written by scripts/pokemon_to_json.py (values are internal names)
+export type ReverseIndex = {
+    moves: Record<string, { levelup?: [string, number][]; tutor?: string[]; egg?: string[]; machine?: string[] }>;
+    abilities: Record<string, { regular?: string[]; hidden?: string[] }>;
+    wildItems: Record<string, { common?: string[]; uncommon?: string[]; rare?: string[] }>;
+};
+
+// sprites.json, written by scripts/sprites_to_json.py: every entry's sprite files by variant folder
+// ("front", "back", "front shiny", "back shiny", "icons"); a missing variant has no file
+export type SpriteManifest = {
+    version: number;
+    base: string;                                                        // "images/ss2/"
+    variants: string[];
+    sprites: Record<string, Record<string, [string, number, number]>>;   // internalName -> variant -> [file, w, h]
+};
+
+// manifest.json, written by scripts/manifest.py: logical file name -> content-hashed copy
+export type DataManifest = { version: number; files: Record<string, { file: string; bytes: number }> };
+
+// images/icons.atlas.json, written by scripts/icons_to_atlas.py for every game: one PNG per icon family
+export type IconAtlasSheet = {
+    image: string;                                   // "types.atlas.png"; a full URL once loaded
+    width: number;
+    height: number;
+    icons: Record<string, [number, number, number, number]>;   // ID (upper-cased) -> [x, y, w, h]
+};
+export type IconAtlas = { version: number; types?: IconAtlasSheet; categories?: IconAtlasSheet };
+
+// pokemon.strings.json, written by scripts/pokemon_to_json.py --refs interned:
+// pokemon.json then refers to these names by index
+export type StringTables = { moves: string[]; abilities: string[]; types: string[]; items: string[] };
+
+// pokemon.evolutions.json, written by scripts/pokemon_to_json.py
+export type EvolutionGraph = {
+    families: Record<string, {
+        stages: string[][];                                // stage 0 first
+        edges: [string, string, string?, string?][];       // [from, to, method, param]
+    }>;
+    byInternal: Record<string, { family: string; stage: number; prevo?: string }>;
+};
+
+// pokemon.stats.json + pokemon.stats.bin, written by scripts/pokemon_to_json.py --types
+export type StatsColumn = Int16Array | Uint16Array | Uint8Array;
+export type StatsTable = {
+    rows: number;
+    columns: Record<string, StatsColumn>;  // hp, atk, def, spa, spd, spe, bst, num, type1, type2, catchRate
+    types: (string | null)[];              // type1/type2 value -> type id
+    noType: number;
+    row: Map<string, number>;              // internalName -> row (built on load)
+};
+
+// search.json, written by scripts/search_to_json.py
+export type SearchData = {
+    version: number;
+    entries: (SuggestItem & { route: string })[];
+    grams: Record<string, number[]>;  // 1-3 char substring -> gap-encoded entry indexes
+};
+
 export type Item = {
     id: string;
     internalName: string;
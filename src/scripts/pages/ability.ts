@@ -1,4 +1,4 @@
-import { getAbilityInfo, resolveAbilityKey } from "../core/data";
+import { getAbilityInfo, pokemonWithAbility, resolveAbilityKey } from "../core/data";
 import { Mon } from "../core/types";
 import { escapeHtml } from "../util/fmt";
 import { applyDexTableSizing, buildTableHTML } from "../ui/table";
@@ -18,9 +18,7 @@ export function renderAbilityDetail(pokemon: Mon[], id: string) {
     setHeaderBack();
 
     // Filter mons that have this ability (regular or hidden)
-    const list = pokemon
-        .filter(p => (p.abilities?.includes(aKey)) || p.hiddenAbility === aKey)
-        .sort((a, b) => a.name.localeCompare(b.name));
+    const list = pokemonWithAbility(aKey, pokemon);
 
     // Page
     grid.innerHTML = `
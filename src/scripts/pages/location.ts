@@ -47,7 +47,7 @@ export function renderLocationDetail(locId: string) {
     // For each encounter type, build a small table
     const sections = Object.entries(loc.encounters)
         .sort((a,b)=> a[0].localeCompare(b[0]))
-        .map(([etype, rows]) => buildLocationMonSection(etype, rows))
+        .map(([etype, rows]) => buildLocationMonSection(etype, rows, loc.rates?.[etype]))
         .join("");
 
     grid.innerHTML = `
@@ -61,7 +61,7 @@ export function renderLocationDetail(locId: string) {
     scrollToTopNow?.();
 }
 
-export function buildLocationMonSection(etype: string, rows: EncounterRow[]): string {
+export function buildLocationMonSection(etype: string, rows: EncounterRow[], rate?: number): string {
     const { list } = summarizeEncounterType(rows);
     const body = list.map(({ intName, chancePct, minLvl, maxLvl }) => {
         const mon = MON_BY_INTERNAL[intName];
@@ -78,7 +78,8 @@ export function buildLocationMonSection(etype: string, rows: EncounterRow[]): st
 
     return `
     <section class="panel" style="margin-top:12px;">
-      <h2 style="margin:10px 12px 6px; font-size:14px; opacity:.8;">${escapeHtml(etype)}</h2>
+      <h2 style="margin:10px 12px 6px; font-size:14px; opacity:.8;">${escapeHtml(etype)}${
+        rate != null ? ` <span style="font-weight:normal; opacity:.7;">· rate ${rate}</span>` : ""}</h2>
       <table class="location-table">
         <thead>
           <tr><th></th><th>Pokémon</th><th>Levels</th><th>Chance</th></tr>
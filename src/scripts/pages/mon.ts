@@ -1,7 +1,7 @@
-import { eggMovesFromRoot, MON_BY_INTERNAL, moveDisplayName, moveInfo } from "../core/data";
+import { eggMovesFromRoot, EVO_GRAPH, MON_BY_INTERNAL, moveDisplayName, moveInfo } from "../core/data";
 import { EvoEdge, Mon, Stats } from "../core/types";
 import { escapeHtml } from "../util/fmt";
-import { abilityLinkHTML, categoryIconTag, frontCandidates, miniIcon64, moveLinkHTML, typeLinkIconTag, typingIconsLinkedHTML } from "../util/assets";
+import { abilityLinkHTML, categoryIconTag, frontCandidates, miniIcon64, moveLinkHTML, spriteSizeAttrs, typeLinkIconTag, typingIconsLinkedHTML } from "../util/assets";
 import { formatEvoMethod } from "../util/fmt";
 import { buildMonLocationsHTML } from "./location";
 import { buildMovesTableNoLv } from "./move";
@@ -95,7 +95,7 @@ export function buildDetailHTML(p: Mon) {
     <img class="mon-front"
          src="${srcs[0]}"
          data-srcs="${srcs.join('|')}"
-         data-idx="0"
+         data-idx="0"${spriteSizeAttrs(p, "front")}
          alt="${p.name}"
          loading="lazy"
          decoding="async">
@@ -188,6 +188,17 @@ export function buildEvolutionStages(current: Mon): {
     stages: string[][];
     edgeLabel: Map<string, string>; // childInternal -> method text
 } {
+    // precomputed family (pokemon.evolutions.json): no scan of the dataset needed
+    const node = EVO_GRAPH?.byInternal[current.internalName];
+    const family = node && EVO_GRAPH!.families[node.family];
+    if (family) {
+        const edgeLabel = new Map<string, string>();
+        for (const [, to, method, param] of family.edges) {
+            if (!edgeLabel.has(to)) edgeLabel.set(to, formatEvoMethod(method || "", param));
+        }
+        return { base: family.stages[0][0], stages: family.stages, edgeLabel };
+    }
+
     // 1) ascend to base via prevo
     let base = current.internalName;
     const guard = new Set<string>();
@@ -1,4 +1,4 @@
-import { ALL_POKEMON, movesIndex, ABIL, typeData, LOCS } from "../core/data";
+import { ALL_POKEMON, movesIndex, ABIL, typeData, LOCS, SEARCH_DATA, loadSearch } from "../core/data";
 import { navigateToMon } from "../core/router";
 import { SuggestItem } from "../core/types";
 import { miniIconHTML, moveSmallIcon, typeIconTag } from "../util/assets";
@@ -6,6 +6,10 @@ import { escapeHtml } from "../util/fmt";
 
 export let SEARCH_INDEX: SuggestItem[] = [];
 
+// gram postings from the prebuilt search.json (null when the index was built here)
+let SEARCH_GRAMS: Record<string, number[]> | null = null;
+const decodedGrams = new Map<string, number[]>();
+
 export const escapeHTML = escapeHtml;
 
 export function highlight(label:string, q:string){
@@ -24,6 +28,15 @@ export function scoreMatch(label:string, q:string){
 }
 
 export function buildSearchIndex(){
+    decodedGrams.clear();
+    if (SEARCH_DATA){
+        // prebuilt by scripts/search_to_json.py: keys are already normalized, icons come later
+        SEARCH_INDEX = SEARCH_DATA.entries;
+        SEARCH_GRAMS = SEARCH_DATA.grams;
+        return;
+    }
+    SEARCH_GRAMS = null;
+
     const out: SuggestItem[] = [];
 
     // Pokémon
@@ -68,7 +81,7 @@ export function buildSearchIndex(){
             id: tid,
             label: typeData[tid]?.name || tid,
             iconHTML: typeIconTag(tid).replace('class="type-icon"', 'class="type-icon" style="width:18px;height:18px"'),
-            search: typeData[tid]?.name || tid,
+            search: makeSearchKey(typeData[tid]?.name || tid),
         });
     }
 
@@ -88,6 +101,57 @@ export function buildSearchIndex(){
     SEARCH_INDEX = out;
 }
 
+// Swap in the prebuilt index once search.json has loaded (first focus/input of #q)
+function useSearchData(){
+    loadSearch().then(() => {
+        if (!SEARCH_DATA || SEARCH_GRAMS) return;
+        buildSearchIndex();
+        const input = document.querySelector<HTMLInputElement>('#q');
+        if (input && document.activeElement === input && input.value.trim()) renderSuggestions(input.value);
+    });
+}
+
+function gramPostings(g: string): number[] {
+    let ids = decodedGrams.get(g);
+    if (!ids){
+        // stored as gaps: first index, then the difference to the previous one
+        ids = [];
+        let cur = 0;
+        for (const d of SEARCH_GRAMS?.[g] || []) ids.push(cur += d);
+        decodedGrams.set(g, ids);
+    }
+    return ids;
+}
+
+// Entries that may contain nq: its own postings up to 3 chars, else the intersection of its trigrams
+function searchCandidates(nq: string): SuggestItem[] {
+    if (!SEARCH_GRAMS) return SEARCH_INDEX;
+    const grams = new Set<string>();
+    if (nq.length <= 3) grams.add(nq);
+    else for (let i = 0; i + 3 <= nq.length; i++) grams.add(nq.slice(i, i + 3));
+
+    let ids: number[] | null = null;
+    for (const g of Array.from(grams).sort((a, b) => gramPostings(a).length - gramPostings(b).length)){
+        const next = gramPostings(g);
+        if (ids === null) ids = next;
+        else {
+            const keep = new Set(next);
+            ids = ids.filter(i => keep.has(i));
+        }
+        if (!ids.length) break;
+    }
+    return (ids || []).map(i => SEARCH_INDEX[i]);
+}
+
+function suggestIconHTML(s: SuggestItem): string {
+    if (s.iconHTML !== undefined) return s.iconHTML;
+    if (s.kind === 'mon')  return miniIconHTML(s.internal || s.id);
+    if (s.kind === 'move') return moveSmallIcon(s.id);
+    if (s.kind === 'type') return typeIconTag(s.id).replace('class="type-icon"', 'class="type-icon" style="width:18px;height:18px"');
+    if (s.kind === 'loc')  return `<span class="suggest-pin" aria-hidden="true">📍</span>`;
+    return '';
+}
+
 export function ensureSuggestBox(){
     let box = document.getElementById('search-suggest');
     if (!box){
@@ -133,7 +197,7 @@ export function renderSuggestions(q: string){
 
     // score & pick top N (score against normalized label)
     const scored: SuggestItem[] = [];
-    for (const it of SEARCH_INDEX){
+    for (const it of searchCandidates(nq)){
         const hay = (it as any).search || makeSearchKey(it.label);   // ← normalized
         const s   = scoreMatch(hay, nq);                              // ← use normalized haystack
         if (s >= 0) scored.push({ ...it, score: s } as any);
@@ -151,7 +215,7 @@ export function renderSuggestions(q: string){
 
     ul.innerHTML = top.map((s:any, idx:number) => `
     <li class="suggest-item" role="option" data-kind="${s.kind}" data-id="${escapeHTML(s.id)}" data-idx="${idx}">
-      ${s.iconHTML || ''}
+      ${suggestIconHTML(s)}
       <div class="suggest-main">
         <div class="suggest-label">${highlight(s.label, q)}</div>
         ${s.sub ? `<div class="suggest-sub">${escapeHTML(s.sub)}</div>` : ``}
@@ -246,6 +310,10 @@ export function wireSearchSuggest(){
         positionSuggestBox();
     }, 120);
 
+    // fetch search.json only when the box is first used
+    input.addEventListener('focus', useSearchData, { once: true });
+    input.addEventListener('input', useSearchData, { once: true });
+
     // show suggestions as you type
     input.addEventListener('input', () => {
         debouncedRender(input.value);
@@ -1,4 +1,4 @@
-import { ABIL, LOCS, MON_BY_INTERNAL, abilityName, movesIndex } from "../core/data";
+import { ABIL, LOCS, MON_BY_INTERNAL, STATS_TABLE, abilityName, movesIndex } from "../core/data";
 import { navBack } from "../core/router";
 import { Mon } from "../core/types";
 import { bst, buildDetailHTML } from "../pages/mon";
@@ -106,6 +106,31 @@ export function cmp(a: Mon, b: Mon, key: SortKey, dir: SortDir): number {
     return dir === "asc" ? n : -n;
 }
 
+// Numeric keys answered from the binary stats table (pokemon.stats.bin) when it is loaded
+const TABLE_COLUMNS: Partial<Record<SortKey, string>> = {
+    num: "num", hp: "hp", atk: "atk", def: "def", spa: "spa", spd: "spd", spe: "spe", bst: "bst",
+};
+
+// Same result as pokemon.sort(cmp) (stable, in place) but compares typed-array values;
+// null when the table is missing or does not cover every mon in the list
+export function sortByStatsTable(pokemon: Mon[], key: SortKey, dir: SortDir): Mon[] | null {
+    const name = TABLE_COLUMNS[key];
+    const col = name ? STATS_TABLE?.columns[name] : undefined;
+    if (!col || !STATS_TABLE) return null;
+    const rows = new Int32Array(pokemon.length);
+    for (let i = 0; i < pokemon.length; i++) {
+        const r = STATS_TABLE.row.get(pokemon[i].internalName);
+        if (r === undefined) return null;
+        rows[i] = r;
+    }
+    const sign = dir === "asc" ? 1 : -1;
+    const order = Array.from(pokemon.keys())
+        .sort((a, b) => sign * (col[rows[a]] - col[rows[b]]) || a - b);
+    const sorted = order.map(i => pokemon[i]);
+    for (let i = 0; i < sorted.length; i++) pokemon[i] = sorted[i];
+    return pokemon;
+}
+
 export function buildTableHTML(list: Mon[]) {
     const arrow = (key: SortKey) =>
         sortState.key === key ? `<span class="sort-arrow">${sortState.dir === "asc" ? "▲" : "▼"}</span>` : "";
@@ -188,8 +213,8 @@ export function renderTable(pokemon: Mon[]) {
     if (!grid || !count) return;
 
 
-    const list = pokemon
-        .sort((a, b) => cmp(a, b, sortState.key, sortState.dir));
+    const list = sortByStatsTable(pokemon, sortState.key, sortState.dir)
+        || pokemon.sort((a, b) => cmp(a, b, sortState.key, sortState.dir));
 
     count.textContent = `${list.length} result${list.length === 1 ? "" : "s"}`;
     grid.innerHTML = buildTableHTML(list);
@@ -1,4 +1,4 @@
-import { _asMon, ABIL, abilityName, moveDisplayName, movesIndex, typeData, getGameId } from "../core/data";
+import { _asMon, ABIL, abilityName, moveDisplayName, movesIndex, typeData, getGameId, SPRITES, ICON_ATLAS } from "../core/data";
 import { Mon } from "../core/types";
 import { typeCandidates } from "./typing";
 import { escapeAttr, slugify } from "./fmt";
@@ -54,8 +54,12 @@ export function moveSmallIcon(moveId: string){
 }
 
 export function typeIconTag(typeId: string) {
-    const srcs = typeCandidates(typeId);
     const title = typeData[typeId]?.name || typeId;
+    if (ICON_ATLAS?.types?.icons[typeId.toUpperCase()]) {
+        return `<img class="type-icon" src="${NO_SPRITE}" data-atlas="${escapeAttr(typeId.toUpperCase())}"
+               alt="${typeId}" title="${title}" decoding="async">`;
+    }
+    const srcs = typeCandidates(typeId);
     return `<img class="type-icon"
                src="${srcs[0]}" data-srcs="${srcs.join("|")}" data-idx="0"
                alt="${typeId}" title="${title}" loading="lazy" decoding="async">`;
@@ -83,13 +87,41 @@ export function categoryIconCandidates(catRaw: string | undefined): string[] {
 }
 export function categoryIconTag(catRaw: string | undefined) {
     if (!catRaw) return "";
-    const srcs = categoryIconCandidates(catRaw);
     const alt = String(catRaw);
+    if (ICON_ATLAS?.categories?.icons[alt.toUpperCase()]) {
+        return `<img class="cat-icon" src="${NO_SPRITE}" data-atlas="${escapeAttr(alt.toUpperCase())}"
+               alt="${alt}" title="${alt}" decoding="async">`;
+    }
+    const srcs = categoryIconCandidates(catRaw);
     return `<img class="cat-icon"
                src="${srcs[0]}" data-srcs="${srcs.join("|")}" data-idx="0"
                alt="${alt}" title="${alt}" loading="lazy" decoding="async">`;
 }
 
+// ── Icon atlases (icons.atlas.json) ─────────────────────────────────────
+// Atlas icons are transparent <img>s with data-atlas="ID"; one rule per icon
+// paints its part of the sheet as the background. Offsets and sizes are in
+// percent, so the same rule fits every CSS size (.type-icon is 18–56px).
+export function installIconAtlas() {
+    document.getElementById("icon-atlas")?.remove();
+    if (!ICON_ATLAS) return;
+    const rules: string[] = [];
+    for (const [family, cls] of [["types", "type-icon"], ["categories", "cat-icon"]] as const) {
+        const sheet = ICON_ATLAS[family];
+        if (!sheet) continue;
+        for (const [id, [x, y, w, h]] of Object.entries(sheet.icons)) {
+            const px = sheet.width > w ? x / (sheet.width - w) * 100 : 0;
+            const py = sheet.height > h ? y / (sheet.height - h) * 100 : 0;
+            rules.push(`img.${cls}[data-atlas="${CSS.escape(id)}"]{background:url("${sheet.image}") `
+                + `${px}% ${py}% / ${sheet.width / w * 100}% ${sheet.height / h * 100}% no-repeat}`);
+        }
+    }
+    const style = document.createElement("style");
+    style.id = "icon-atlas";
+    style.textContent = rules.join("\n");
+    document.head.appendChild(style);
+}
+
 // escapeAttr moved to util/fmt
 
 export function abilityLinkHTML(id?: string | null, opts?: { hidden?: boolean }) {
@@ -117,28 +149,40 @@ export function formatAbilities(abilities: string[], hidden?: string): string {
 export const locHref = (id: string) => `#/loc/${encodeURIComponent(id)}`;
 export const monHref = (m: Mon) => `#/mon/${encodeURIComponent(m.id)}`;
 
+// 1×1 transparent GIF: what an <img> shows when sprites.json says there is no file (no request made),
+// and the src of atlas icons, which are drawn as backgrounds
+const NO_SPRITE = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7";
+
+// Exact URL from sprites.json when it lists the mon; otherwise every file name worth trying
+function spriteCandidates(p: Mon, variant: string): string[] {
+    const known = SPRITES?.sprites[p.internalName];
+    if (known) {
+        const hit = known[variant];
+        return [hit ? `${BASE}${SPRITES!.base}${variant}/${encodeURIComponent(hit[0])}` : NO_SPRITE];
+    }
+    return buildCandidates(`${BASE}images/${getGameId()}/${variant}/`, monNameCandidates(p));
+}
+
+// ` width="W" height="H"` from sprites.json, so the browser can reserve the space before loading
+export function spriteSizeAttrs(p: Mon, variant: string): string {
+    const hit = SPRITES?.sprites[p.internalName]?.[variant];
+    return hit ? ` width="${hit[1]}" height="${hit[2]}"` : "";
+}
+
 export function frontCandidates(p: Mon): string[] {
-    const base = `${BASE}images/${getGameId()}/front/`;
-    const names = monNameCandidates(p);
-    return buildCandidates(base, names);
+    return spriteCandidates(p, "front");
 }
 
 export function backCandidates(p: Mon): string[] {
-    const base = `${BASE}images/${getGameId()}/back/`;
-    const names = monNameCandidates(p);
-    return buildCandidates(base, names);
+    return spriteCandidates(p, "back");
 }
 
 export function frontShinyCandidates(p: Mon): string[] {
-    const base = `${BASE}images/${getGameId()}/front shiny/`;
-    const names = monNameCandidates(p);
-    return buildCandidates(base, names);
+    return spriteCandidates(p, "front shiny");
 }
 
 export function backShinyCandidates(p: Mon): string[] {
-    const base = `${BASE}images/${getGameId()}/back shiny/`;
-    const names = monNameCandidates(p);
-    return buildCandidates(base, names);
+    return spriteCandidates(p, "back shiny");
 }
 
 export function iconUrl(internalName: string): string {
@@ -148,9 +192,7 @@ export function iconUrl(internalName: string): string {
 }
 
 export function iconCandidates(p: Mon): string[] {
-    const base = `${BASE}images/${getGameId()}/icons/`;
-    const names = monNameCandidates(p);
-    return buildCandidates(base, names);
+    return spriteCandidates(p, "icons");
 }
 
 export function typeLinkIconTag(t: string) {
@@ -34,24 +34,27 @@ export function summarizeEncounterType(rows: EncounterRow[]): {
     list: { intName: string; chancePct: number; minLvl: number; maxLvl: number }[];
     total: number;
 } {
-    const acc = new Map<string, { chance: number; min: number; max: number }>();
+    // share: chance / total, precomputed by encounters_to_json.py; older data only has raw chances
+    const acc = new Map<string, { chance: number; share: number; min: number; max: number }>();
     let total = 0;
 
-    for (const [chance, mon, lo, hi] of rows) {
+    for (const [chance, mon, lo, hi, share] of rows) {
         total += chance;
         const cur = acc.get(mon);
         if (cur) {
             cur.chance += chance;
+            cur.share += share ?? 0;
             cur.min = Math.min(cur.min, lo);
             cur.max = Math.max(cur.max, hi);
         } else {
-            acc.set(mon, { chance, min: lo, max: hi });
+            acc.set(mon, { chance, share: share ?? 0, min: lo, max: hi });
         }
     }
 
+    const normalized = rows.length > 0 && rows[0][4] !== undefined;
     const list = Array.from(acc, ([intName, v]) => ({
         intName,
-        chancePct: total ? Math.round((v.chance * 100) / total) : 0,
+        chancePct: normalized ? Math.round(v.share * 100) : total ? Math.round((v.chance * 100) / total) : 0,
         minLvl: v.min,
         maxLvl: v.max,
     }));
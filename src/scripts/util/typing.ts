@@ -1,4 +1,4 @@
-import { allTypes, typeData } from "../core/data";
+import { allTypes, TYPE_CHART, typeData } from "../core/data";
 
 // ---- combined defensive matchup for 1–2 types ----
 export function combineDefense(types: string[]) {
@@ -33,6 +33,11 @@ export function combineDefense(types: string[]) {
 
 // Get multiplier for a single attacking vs single defending type
 function mult(atk: string, def: string): number {
+    // dense attacker x defender lookup (types.matrix.json), same rules as below
+    if (TYPE_CHART) {
+        const ai = TYPE_CHART.pos.get(atk), di = TYPE_CHART.pos.get(def);
+        if (ai !== undefined && di !== undefined) return TYPE_CHART.matrix[ai][di];
+    }
     const immunities = typeData[def].immunities;
     for (const x of immunities) {
         if (x == atk) {
@@ -57,6 +62,12 @@ function mult(atk: string, def: string): number {
 // Overall multiplier for an attacking type against a mon's type array
 export function attackMultiplier(atk: string, defs: string[]): number {
     if (!Array.isArray(defs) || defs.length === 0) return 1;
+    // precomputed row for this exact type list (types.matrix.json)
+    if (TYPE_CHART) {
+        const ai = TYPE_CHART.pos.get(atk);
+        const row = TYPE_CHART.combos[defs.join(",")];
+        if (ai !== undefined && row) return row[ai];
+    }
     let m = 1;
     for (const d of defs) {
         if (!typeData[d]) continue;
@@ -110,16 +121,3 @@ export function typeCandidates(tRaw: string): string[] {
     }
     return urls;
 }
-
-export function typingIconsHTML(types: string[]): string {
-    const ts = (types || []).slice(0, 2).filter(Boolean);
-    if (ts.length === 0) return "";
-    const imgs = ts.map(t => {
-        const srcs = typeCandidates(t);
-        const alt = t;
-        return `<img class="type-icon"
-                 src="${srcs[0]}" data-srcs="${srcs.join("|")}" data-idx="0"
-                 alt="${alt}" title="${alt}" loading="lazy" decoding="async">`;
-    }).join("");
-    return `<span class="type-icons">${imgs}</span>`;
-}
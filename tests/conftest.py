@@ -0,0 +1,9 @@
+# The scripts are flat modules that import each other by name (run as
+# "python scripts/x.py"), and rename_case.py sits at the repo root.
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for p in (ROOT, ROOT / "scripts"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
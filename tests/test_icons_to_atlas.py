@@ -0,0 +1,41 @@
+import json
+
+import icons_to_atlas
+from pngcodec import Image, read_png, write_png
+
+def solid(width, height, value):
+    return Image(width, height, [bytearray((value, value, value, 255) * width) for _ in range(height)])
+
+def test_pack():
+    atlas, rects = icons_to_atlas.pack([("A", solid(2, 2, 0xFF)), ("B", solid(3, 1, 0x80))])
+    assert rects == {"A": [0, 0, 2, 2], "B": [2 + icons_to_atlas.GUTTER, 0, 3, 1]}
+    assert (atlas.width, atlas.height) == (7, 2)
+    assert bytes(atlas.rows[0]) == b"\xff" * 8 + bytes(8) + b"\x80\x80\x80\xff" * 3
+    assert bytes(atlas.rows[1]) == b"\xff" * 8 + bytes(20)
+
+def test_convert(tmp_path):
+    for family, name, value in (("types", "FIRE.png", 10), ("types", "water.png", 20),
+                                ("categories", "Physical.png", 30), ("categories", "notes.txt", 0)):
+        (tmp_path / family).mkdir(exist_ok=True)
+        if name.endswith(".png"):
+            write_png(tmp_path / family / name, solid(4, 3, value))
+        else:
+            (tmp_path / family / name).write_text("not an icon")
+    dest = tmp_path / "icons.atlas.json"
+    assert icons_to_atlas.convert(tmp_path, dest) == 3
+
+    data = json.loads(dest.read_text(encoding="utf-8"))
+    assert data["types"]["icons"] == {"FIRE": [0, 0, 4, 3], "WATER": [6, 0, 4, 3]}
+    assert data["categories"]["icons"] == {"PHYSICAL": [0, 0, 4, 3]}
+    sheet = read_png(tmp_path / data["types"]["image"])
+    assert (sheet.width, sheet.height) == (data["types"]["width"], data["types"]["height"]) == (10, 3)
+    assert sheet.rows[0][4 * 6:4 * 7] == bytes((20, 20, 20, 255))
+
+def test_convert_without_a_family(tmp_path):
+    (tmp_path / "categories").mkdir()
+    write_png(tmp_path / "categories" / "STATUS.png", solid(1, 1, 0))
+    (tmp_path / "types.atlas.png").write_bytes(b"stale")
+    dest = tmp_path / "icons.atlas.json"
+    icons_to_atlas.convert(tmp_path, dest)
+    assert "types" not in json.loads(dest.read_text(encoding="utf-8"))
+    assert not (tmp_path / "types.atlas.png").exists()
@@ -0,0 +1,55 @@
+from pbs import SECTION, lines, parse_header, read_sections, tokenize
+
+TEXT = """\ufeff# header comment
+stray = before any section
+[BULBASAUR] # Seed
+Name = Bulbasaur
+Power = 40 # trailing
+  # indented comment
+
+loose line
+= no key
+[UNOWN, 2]
+FormName = C
+[003]
+"""
+
+def test_tokenize_events():
+    assert list(tokenize(TEXT)) == [
+        ("BULBASAUR", None, SECTION, "Seed", 3),
+        ("BULBASAUR", None, "Name", "Bulbasaur", 4),
+        ("BULBASAUR", None, "Power", "40 # trailing", 5),
+        ("BULBASAUR", None, None, "loose line", 8),
+        ("UNOWN", 2, SECTION, None, 10),
+        ("UNOWN", 2, "FormName", "C", 11),
+        ("003", 3, SECTION, None, 12),
+    ]
+
+def test_tokenize_strip_comments():
+    events = list(tokenize(TEXT, strip_comments=True))
+    assert ("BULBASAUR", None, "Power", "40", 5) in events
+    assert events[0] == ("BULBASAUR", None, SECTION, None, 3)
+
+def test_tokenize_sources_agree(tmp_path):
+    path = tmp_path / "pokemon.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    expected = list(tokenize(TEXT))
+    assert list(tokenize(path)) == expected
+    assert list(tokenize(TEXT.splitlines(keepends=True))) == expected
+
+def test_lines_strip_bom_once():
+    assert next(lines("\ufeffa\n")) == "a\n"
+    assert next(lines(iter(["\ufeffa\n"]))) == "a\n"
+    assert list(lines("a\n\ufeffb\n")) == ["a\n", "\ufeffb\n"]
+
+def test_parse_header():
+    assert parse_header("[NAME,3] # note") == ("NAME", 3, "note")
+    assert parse_header("[042]") == ("042", 42, None)
+    assert parse_header("not a header") == (None, None, None)
+
+def test_read_sections_collect():
+    text = "[A]\nEVs = HP,1\nName = x\nEVs = ATTACK,2\nName = y\n"
+    (header, index, raw, lineno), = read_sections(text, collect={"evs": "__EVS__"})
+    assert (header, index, lineno) == ("A", None, 1)
+    assert raw["Name"] == "y"
+    assert raw["__EVS__"] == ["HP,1", "ATTACK,2"]
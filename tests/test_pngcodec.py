@@ -0,0 +1,55 @@
+import random
+import struct
+import zlib
+
+import pytest
+
+from pngcodec import SIGNATURE, Image, _chunk, encode_png, read_png, write_png
+
+def png(width, height, depth, ctype, scanlines, interlace=0, **chunks):
+    """A PNG with unfiltered scanlines and the given extra chunks (PLTE=..., tRNS=...)."""
+    body = [_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, depth, ctype, 0, 0, interlace))]
+    body += [_chunk(kind.encode("ascii"), data) for kind, data in chunks.items()]
+    body.append(_chunk(b"IDAT", zlib.compress(b"".join(b"\0" + line for line in scanlines))))
+    return SIGNATURE + b"".join(body) + _chunk(b"IEND", b"")
+
+def pixels(image):
+    return [bytes(row) for row in image.rows]
+
+def test_round_trip(tmp_path):
+    rng = random.Random(3)
+    image = Image(7, 5, [bytearray(rng.randrange(256) for _ in range(4 * 7)) for _ in range(5)])
+    assert pixels(read_png(encode_png(image))) == pixels(image)
+    write_png(tmp_path / "out.png", image)
+    decoded = read_png(tmp_path / "out.png")
+    assert (decoded.width, decoded.height) == (7, 5)
+    assert pixels(decoded) == pixels(image)
+
+def test_round_trip_picks_filters():
+    # smooth gradients make Sub/Up/Average/Paeth win over None on some rows
+    image = Image(16, 16, [bytearray(v for x in range(16) for v in (x * 16, y * 16, x + y, 255)) for y in range(16)])
+    data = encode_png(image)
+    raw = zlib.decompress(data[data.index(b"IDAT") + 4:data.index(b"IEND") - 8])
+    assert {raw[i * (1 + 4 * 16)] for i in range(16)} - {0}
+    assert pixels(read_png(data)) == pixels(image)
+
+def test_read_palette_with_transparency():
+    # 2-bit palette indexes 0..3, index 0 fully transparent
+    plte = bytes((0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255))
+    image = read_png(png(4, 1, 2, 3, [bytes((0b00011011,))], PLTE=plte, tRNS=b"\x00"))
+    assert pixels(image) == [bytes((0, 0, 0, 0, 255, 0, 0, 255, 0, 255, 0, 255, 0, 0, 255, 255))]
+
+def test_read_grey_16bit_colour_key():
+    # 16-bit greyscale keeps the high byte; tRNS marks one grey level transparent
+    image = read_png(png(2, 1, 16, 0, [bytes((0x12, 0x34, 0xAB, 0xCD))], tRNS=b"\x12\x34"))
+    assert pixels(image) == [bytes((0x12, 0x12, 0x12, 0, 0xAB, 0xAB, 0xAB, 255))]
+
+def test_read_grey_1bit_scales_to_8bit():
+    image = read_png(png(3, 1, 1, 0, [bytes((0b10100000,))]))
+    assert pixels(image) == [bytes((255, 255, 255, 255, 0, 0, 0, 255, 255, 255, 255, 255))]
+
+def test_read_rejects():
+    with pytest.raises(ValueError):
+        read_png(b"GIF89a" + bytes(20))
+    with pytest.raises(ValueError):
+        read_png(png(1, 1, 8, 6, [bytes(4)], interlace=1))
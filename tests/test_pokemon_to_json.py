@@ -0,0 +1,144 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+import pokemon_to_json
+import synth_pbs
+from pokemon_to_json import (build_entries, evolution_families, expand_entry, intern_entry, resolve_form,
+                             string_tables)
+
+@pytest.fixture(scope="module")
+def game(tmp_path_factory) -> Path:
+    """A small synthetic game (synth_pbs.py): 60 species in evolution lines, 20 forms."""
+    out = tmp_path_factory.mktemp("game")
+    synth_pbs.generate(out, species=60, forms=20, moves=40, items=10, abilities=10, types=8, maps=3)
+    return out
+
+def entries(game: Path, delta: bool = False):
+    return build_entries(game / "pokemon.txt", game / "pokemon_forms.txt", delta=delta)
+
+# ---------- forms ----------
+
+def test_delta_forms_resolve_to_full(game):
+    full, delta = entries(game), entries(game, delta=True)
+    assert any(e.get("delta") for e in delta)
+    by_internal = {e["internalName"]: e for e in delta if not e.get("isForm")}
+    assert [resolve_form(e, by_internal) for e in delta] == full
+
+def test_delta_forms_hold_only_overrides(game):
+    full = {e["internalName"]: e for e in entries(game)}
+    for e in entries(game, delta=True):
+        if not e.get("isForm"):
+            assert e == full[e["internalName"]]
+            continue
+        base = full[e["baseInternal"]]
+        assert e["delta"] is True
+        assert "evolutions" not in e or "Evolutions" in e["rawFormOverrides"]
+        assert set(e) < set(full[e["internalName"]]) | {"delta"}
+        assert len(e) < len(base)
+
+@pytest.mark.parametrize("refs", pokemon_to_json.REFS)
+@pytest.mark.parametrize("forms_mode", ["full", "delta"])
+def test_convert_round_trip(game, tmp_path, forms_mode, refs):
+    dest = tmp_path / "pokemon.json"
+    pokemon_to_json.convert(game / "pokemon.txt", dest, forms=game / "pokemon_forms.txt",
+                            types=game / "types.txt", forms_mode=forms_mode, refs=refs)
+    assert pokemon_to_json.strings_path(dest).exists() == (refs == "interned")
+    assert pokemon_to_json.read_entries(dest) == entries(game, delta=forms_mode == "delta")
+
+# ---------- evolution families ----------
+
+def mon(name, *evos, **extra):
+    return {"internalName": name, "evolutions": [{"to": t, "method": m, "param": p} for t, m, p in evos], **extra}
+
+def form(base, idx, *evos):
+    raw = {"Evolutions": "..."} if evos else {}
+    return mon(f"{base}_{idx}", *evos, isForm=True, baseInternal=base, formIndex=idx, rawFormOverrides=raw)
+
+def test_evolution_families():
+    graph = evolution_families([
+        mon("CHARMANDER", ("CHARMELEON", "Level", "16")),
+        mon("CHARMELEON", ("CHARIZARD", "Level", "36")),
+        mon("CHARIZARD"),
+        form("CHARIZARD", 1),                                     # a mega: placed with its base
+        mon("EEVEE", ("VAPOREON", "Item", "WATERSTONE"), ("JOLTEON", "Item", "THUNDERSTONE")),
+        mon("VAPOREON"),
+        mon("JOLTEON"),
+        mon("RATTATA", ("RATICATE", "Level", "20")),
+        mon("RATICATE"),
+        form("RATTATA", 1, ("RATICATE", "LevelNight", "20")),   # leads to the same-numbered form
+        form("RATICATE", 1),
+        mon("DITTO"),
+    ])
+    families, nodes = graph["families"], graph["byInternal"]
+
+    assert families["CHARMANDER"] == {
+        "stages": [["CHARMANDER"], ["CHARMELEON"], ["CHARIZARD"]],
+        "edges": [["CHARMANDER", "CHARMELEON", "Level", "16"], ["CHARMELEON", "CHARIZARD", "Level", "36"]],
+    }
+    assert nodes["CHARIZARD_1"] == nodes["CHARIZARD"] == {"family": "CHARMANDER", "stage": 2, "prevo": "CHARMELEON"}
+    assert families["EEVEE"]["stages"] == [["EEVEE"], ["VAPOREON", "JOLTEON"]]
+    assert nodes["JOLTEON"] == {"family": "EEVEE", "stage": 1, "prevo": "EEVEE"}
+    assert families["RATTATA_1"]["stages"] == [["RATTATA_1"], ["RATICATE_1"]]
+    assert nodes["RATICATE_1"]["prevo"] == "RATTATA_1"
+    assert families["DITTO"] == {"stages": [["DITTO"]], "edges": []}
+    assert nodes["DITTO"] == {"family": "DITTO", "stage": 0}
+    assert list(nodes)[:3] == ["CHARMANDER", "CHARMELEON", "CHARIZARD"]  # entry order
+
+def test_evolution_families_cycle():
+    graph = evolution_families([mon("A", ("B", "Level", "5")), mon("B", ("A", "Item", "X"))])
+    assert graph["families"]["A"]["stages"] == [["A"], ["B"]]
+    assert graph["byInternal"]["A"] == {"family": "A", "stage": 0, "prevo": "B"}
+
+def test_evolution_families_cover_every_entry(game):
+    full = entries(game)
+    graph = evolution_families(full)
+    assert list(graph["byInternal"]) == [e["internalName"] for e in full]
+    staged = [n for fam in graph["families"].values() for layer in fam["stages"] for n in layer]
+    assert len(staged) == len(set(staged))
+    for name, node in graph["byInternal"].items():
+        assert node["family"] in graph["families"]
+
+# ---------- string tables ----------
+
+def test_intern_expand_round_trip(game):
+    full = entries(game, delta=True)
+    tables = string_tables(full)
+    index = {t: {name: i for i, name in enumerate(names)} for t, names in tables.items()}
+    interned = [intern_entry(e, index) for e in full]
+    assert interned != full
+    assert [expand_entry(e, tables) for e in interned] == full
+
+def test_string_tables_most_used_first():
+    tables = string_tables([
+        {"types": ["FIRE", "FLYING"], "abilities": ["BLAZE"], "moves": [{"level": 1, "move": "EMBER"}]},
+        {"types": ["FIRE"], "abilities": ["BLAZE"], "hiddenAbility": "SOLARPOWER", "wildItems": {"common": "CHARCOAL"}},
+    ])
+    assert tables == {"moves": ["EMBER"], "abilities": ["BLAZE", "SOLARPOWER"],
+                      "types": ["FIRE", "FLYING"], "items": ["CHARCOAL"]}
+
+def test_intern_entry_shape():
+    tables = {"moves": ["EMBER", "GROWL"], "abilities": ["BLAZE"], "types": ["FIRE"], "items": ["CHARCOAL"]}
+    index = {t: {name: i for i, name in enumerate(names)} for t, names in tables.items()}
+    entry = {"name": "Charmander", "types": ["FIRE"], "hiddenAbility": "BLAZE",
+             "moves": [{"level": 1, "move": "GROWL"}, {"level": 4, "move": "EMBER"}],
+             "wildItems": {"rare": "CHARCOAL"}}
+    interned = intern_entry(entry, index)
+    assert interned == {"name": "Charmander", "types": [0], "hiddenAbility": 0, "moves": [1, 1, 4, 0],
+                        "wildItems": {"rare": 0}}
+    assert expand_entry(interned, tables) == entry
+
+# ---------- stats table ----------
+
+def test_stats_table_clamps_out_of_range(capsys):
+    stats = {"hp": 40000, "atk": -40000, "def": 1, "spa": 1, "spd": 1, "spe": 1}
+    header, blob = pokemon_to_json.stats_table(
+        [{"internalName": "ODD", "stats": stats, "types": ["FIRE"], "num": 70000, "catchRate": 300}], {"FIRE": 0})
+    assert header["rows"] == 1
+    cols = {c["name"]: c for c in header["columns"]}
+    value = lambda name, code: struct.unpack_from("<" + code, blob, cols[name]["offset"])[0]
+    assert (value("hp", "h"), value("atk", "h"), value("num", "H"), value("catchRate", "B")) == (32767, -32768, 65535, 255)
+    assert value("bst", "h") == 4  # summed before clamping
+    err = capsys.readouterr().err
+    assert "ODD: hp=40000 does not fit int16" in err and "catchRate=300" in err
@@ -0,0 +1,71 @@
+import os
+
+import rename_case
+from rename_case import JOURNAL, TMP_SUFFIX, listings, plan, read_journal, recovery, run, write_journal
+
+def touch(folder, *names):
+    folder.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (folder / name).write_text(name)
+
+def test_target_name():
+    assert rename_case.target_name("bulbasaur.PNG") == "BULBASAUR.png"
+    assert rename_case.target_name("mr.mime.Png") == "MR.MIME.png"
+    assert rename_case.target_name(".hidden") == ".HIDDEN"
+    assert rename_case.target_name("name.") == "NAME."
+
+def test_plan(tmp_path):
+    touch(tmp_path, "bulbasaur.PNG", "IVYSAUR.png", "a.png", "A.PNG", JOURNAL + ".tmp", "x.1234" + TMP_SUFFIX)
+    (tmp_path / "Venu.png").mkdir()
+    touch(tmp_path, "venu.png")
+    touch(tmp_path / "sub", "oddish.png")
+
+    steps, clashes = plan(listings(tmp_path, recurse=False))
+    assert [(d, old, new) for d, old, _tmp, new in steps] == [(str(tmp_path), "bulbasaur.PNG", "BULBASAUR.png")]
+    assert steps[0][2].startswith("bulbasaur.") and steps[0][2].endswith(TMP_SUFFIX)
+    assert sorted(clashes) == [(str(tmp_path), ["A.PNG", "a.png"]), (str(tmp_path), ["Venu.png", "venu.png"])]
+
+    steps, _ = plan(listings(tmp_path, recurse=True))
+    assert sorted(new for *_rest, new in steps) == ["BULBASAUR.png", "ODDISH.png"]
+
+def test_run_renames(tmp_path):
+    touch(tmp_path, "bulbasaur.png")
+    touch(tmp_path / "sub", "oddish.PNG")
+    steps, _ = plan(listings(tmp_path, recurse=True))
+    assert run([(d, [old, tmp, new]) for d, old, tmp, new in steps], tmp_path, workers=2) == 0
+    assert os.listdir(tmp_path / "sub") == ["ODDISH.png"]
+    assert (tmp_path / "BULBASAUR.png").read_text() == "bulbasaur.png"
+
+def test_journal_round_trip(tmp_path):
+    touch(tmp_path / "sub", "oddish.png")
+    steps, _ = plan(listings(tmp_path, recurse=True))
+    write_journal(tmp_path / JOURNAL, steps)
+    assert read_journal(tmp_path / JOURNAL) == steps
+    assert read_journal(tmp_path / "missing.json") is None
+    assert "oddish" in (tmp_path / JOURNAL).read_text(encoding="utf-8")
+    assert str(tmp_path) not in (tmp_path / JOURNAL).read_text(encoding="utf-8")
+
+def interrupted(tmp_path):
+    """Three planned renames: one not started, one between its two steps, one done."""
+    touch(tmp_path, "a.png", "b.png", "c.png")
+    steps, _ = plan(listings(tmp_path, recurse=False))
+    d, _old, tmp_b, _new = steps[1]
+    os.rename(os.path.join(d, "b.png"), os.path.join(d, tmp_b))
+    os.rename(os.path.join(d, "c.png"), os.path.join(d, "C.png"))
+    return steps
+
+def test_recovery_resume(tmp_path):
+    steps = interrupted(tmp_path)
+    (d, _, tmp_a, _), (_, _, tmp_b, _), _ = steps
+    assert recovery(steps, rollback=False) == [(d, ["a.png", tmp_a, "A.png"]), (d, [tmp_b, "B.png"])]
+    run(recovery(steps, rollback=False), tmp_path, workers=1)
+    assert sorted(os.listdir(tmp_path)) == ["A.png", "B.png", "C.png"]
+    assert recovery(steps, rollback=False) == []
+
+def test_recovery_rollback(tmp_path):
+    steps = interrupted(tmp_path)
+    (d, _, _, _), (_, _, tmp_b, _), (_, _, tmp_c, _) = steps
+    assert recovery(steps, rollback=True) == [(d, [tmp_b, "b.png"]), (d, ["C.png", tmp_c, "c.png"])]
+    run(recovery(steps, rollback=True), tmp_path, workers=1)
+    assert sorted(os.listdir(tmp_path)) == ["a.png", "b.png", "c.png"]
+    assert recovery(steps, rollback=True) == []